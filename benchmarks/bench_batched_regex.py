@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Optional
+
+from benchmarks.dataset_generator import DatasetSpec, HaloDatasetGenerator
+from modules.domain.entities.extension import Extension
+from modules.infrastructure.repositories.file_storage_repository import FileStorageRepository
+from modules.infrastructure.services.encoding.base64_decoder import Base64Decoder
+from modules.infrastructure.services.replace.default_replace_engine import DefaultReplaceEngine
+from modules.infrastructure.types.replace_types import BatchReplaceResult, ReplaceRule, ReplaceScope
+
+DEFAULT_PATTERNS = [
+    (r'http://old\.example\.com', 'https://new.example.com'),
+    (r'old\.example\.(com|org)', r'new.example.\1'),
+    (r'a.b', 'X'),
+    (r'\d{4}-\d{2}', 'YYYY-MM'),
+    (r'(?i)halo', 'Halo'),
+]
+
+
+def _normalize(result: BatchReplaceResult) -> tuple:
+    return [
+        (r.extension_name, [(c.field, c.old, c.new, c.rule_index) for c in r.changes], r.updated_data)
+        for r in result.results
+    ], result.total_changes
+
+
+def _best_of(engine: DefaultReplaceEngine, extensions: list[Extension], rules: list[ReplaceRule], repeat: int):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = engine.apply(extensions, rules, ReplaceScope())
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='逐字段替换与批量正则替换的耗时对比')
+    parser.add_argument('-n', '--items', type=int, default=2000, help='合成数据的扩展数量')
+    parser.add_argument('--body-size', type=int, default=2000, help='合成数据正文平均长度')
+    parser.add_argument('--seed', type=int, default=20240501, help='合成数据随机种子')
+    parser.add_argument('--repeat', type=int, default=3, help='每个模式重复次数(取最小值)')
+    parser.add_argument('-p', '--pattern', action='append', nargs=2, metavar=('SEARCH', 'REPLACE'),
+                        help='自定义正则及替换模板, 可多次指定')
+    args = parser.parse_args(argv)
+
+    spec = DatasetSpec(item_count=args.items, body_size=args.body_size, seed=args.seed)
+    with tempfile.TemporaryDirectory(prefix='halo-bench-') as work_dir:
+        dataset_path = os.path.join(work_dir, 'extensions.data')
+        HaloDatasetGenerator(spec).write(dataset_path)
+        extensions = Base64Decoder().decode(FileStorageRepository().load(dataset_path))
+
+    mismatches = 0
+    print(f'{"pattern":<32}{"changes":>9}{"per-leaf":>11}{"batched":>11}{"speedup":>9}')
+    for search, replace in args.pattern or DEFAULT_PATTERNS:
+        rules = [ReplaceRule(search=search, replace=replace, is_regex=True)]
+        expected, per_leaf = _best_of(DefaultReplaceEngine(batched=False), extensions, rules, args.repeat)
+        actual, batched = _best_of(DefaultReplaceEngine(batched=True), extensions, rules, args.repeat)
+        same = _normalize(expected) == _normalize(actual)
+        mismatches += not same
+        print(f'{search:<32}{expected.total_changes:>9}{per_leaf:>10.4f}s{batched:>10.4f}s'
+              f'{per_leaf / batched if batched else 0:>8.2f}x{"" if same else "  结果不一致"}')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
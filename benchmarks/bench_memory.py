@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import Callable, Optional
+
+from benchmarks.dataset_generator import DatasetSpec, HaloDatasetGenerator
+from modules.domain.entities.extension import Extension, ExtensionItem
+from modules.domain.entities.extension_data import DATA_FIELDS, METADATA_FIELDS
+from modules.infrastructure.repositories.file_storage_repository import FileStorageRepository
+from modules.infrastructure.services.encoding.base64_decoder import Base64Decoder
+from modules.infrastructure.services.indexing.field_index import ExtensionFieldIndex
+
+
+_LegacyMetadata = make_dataclass('LegacyMetadata', list(METADATA_FIELDS.values()))
+_LegacyExtensionData = make_dataclass('LegacyExtensionData', list(DATA_FIELDS.values()))
+_LegacyExtension = make_dataclass('LegacyExtension', [(f.name, f.type) for f in fields(Extension)])
+
+
+def _to_legacy(extension: Extension):
+    data = extension.data
+    metadata = data.metadata
+    legacy_metadata = _LegacyMetadata(*(getattr(metadata, attr) for attr in METADATA_FIELDS.values())) if metadata else None
+    legacy_data = _LegacyExtensionData(data.api_version, data.kind, legacy_metadata, data.spec, data.data)
+    return _LegacyExtension(extension.name, extension.version, legacy_data, extension.raw_data, extension.modified)
+
+
+def _retained(build: Callable[[], object]) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, after - before
+
+
+def _decode_legacy(items: list[ExtensionItem]) -> list:
+    extensions = Base64Decoder(intern_strings=False).decode(items)
+    legacy = [_to_legacy(ext) for ext in extensions]
+    del extensions
+    return legacy
+
+
+def _load_resident(path: str, lean: bool) -> list[Extension]:
+    items = FileStorageRepository().load(path, with_offsets=lean)
+    return Base64Decoder().decode(items, lean=lean, source=path)
+
+
+def _build_index(extensions: list[Extension], columnar: bool) -> ExtensionFieldIndex:
+    index = ExtensionFieldIndex(columnar=columnar)
+    for ext in extensions:
+        index.add(ext)
+    return index
+
+
+def _best(action: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _mib(size: int) -> str:
+    return f'{size / (1024 * 1024):>9.2f} MiB'
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='实体内存占用与类型索引对比（tracemalloc）')
+    parser.add_argument('-n', '--items', type=int, default=20000, help='合成数据的扩展数量')
+    parser.add_argument('--body-size', type=int, default=200, help='合成数据正文平均长度')
+    parser.add_argument('--seed', type=int, default=20240501, help='合成数据随机种子')
+    parser.add_argument('--repeat', type=int, default=5, help='计时重复次数(取最小值)')
+    args = parser.parse_args(argv)
+
+    spec = DatasetSpec(item_count=args.items, body_size=args.body_size, seed=args.seed)
+    with tempfile.TemporaryDirectory(prefix='halo-bench-') as work_dir:
+        dataset_path = os.path.join(work_dir, 'extensions.data')
+        HaloDatasetGenerator(spec).write(dataset_path)
+        items = FileStorageRepository().load(dataset_path)
+        full, full_bytes = _retained(lambda: _load_resident(dataset_path, lean=False))
+        del full
+        lean, lean_bytes = _retained(lambda: _load_resident(dataset_path, lean=True))
+        del lean
+
+    legacy, legacy_bytes = _retained(lambda: _decode_legacy(items))
+    del legacy
+    unslotted_interned, interned_only_bytes = _retained(
+        lambda: [_to_legacy(ext) for ext in Base64Decoder().decode(items)]
+    )
+    del unslotted_interned
+    extensions, compact_bytes = _retained(lambda: Base64Decoder().decode(items))
+
+    print(f'{args.items} 条扩展解码后常驻内存 (不含原始 Base64 字符串):')
+    print(f'  {"dataclass + 无驻留":<28}{_mib(legacy_bytes)}')
+    print(f'  {"dataclass + 字符串驻留":<26}{_mib(interned_only_bytes)}')
+    print(f'  {"文档模型 + 字符串驻留":<22}{_mib(compact_bytes)}'
+          f'{(1 - compact_bytes / legacy_bytes) * 100 if legacy_bytes else 0:>8.1f}% 节省')
+
+    print('加载并解码后常驻内存 (含原始数据):')
+    print(f'  {"保留原始 Base64":<24}{_mib(full_bytes)}')
+    print(f'  {"精简加载 (摘要+偏移)":<22}{_mib(lean_bytes)}'
+          f'{(1 - lean_bytes / full_bytes) * 100 if full_bytes else 0:>8.1f}% 节省')
+
+    set_index, set_bytes = _retained(lambda: _build_index(extensions, columnar=False))
+    column_index, column_bytes = _retained(lambda: _build_index(extensions, columnar=True))
+    kind = extensions[0].get_kind()
+    print('类型/apiVersion 索引:')
+    print(f'  {"":<12}{"内存":>13}{"kind_counts":>14}{"按类型筛选":>12}')
+    for label, index, size in (('集合倒排', set_index, set_bytes), ('分类列', column_index, column_bytes)):
+        counts = _best(index.kind_counts, args.repeat)
+        select = _best(lambda: index.select(kind=kind), args.repeat)
+        print(f'  {label:<10}{_mib(size)}{counts * 1000:>12.3f}ms{select * 1000:>10.3f}ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+DEFAULT_KIND_MIX = {
+    'Post': 0.25,
+    'Snapshot': 0.3,
+    'ConfigMap': 0.05,
+    'Attachment': 0.2,
+    'Comment': 0.15,
+    'User': 0.05,
+}
+
+API_VERSIONS = {
+    'Post': 'content.halo.run/v1alpha1',
+    'Snapshot': 'content.halo.run/v1alpha1',
+    'Comment': 'content.halo.run/v1alpha1',
+    'ConfigMap': 'v1alpha1',
+    'Attachment': 'storage.halo.run/v1alpha1',
+    'User': 'v1alpha1',
+}
+
+WORDS = (
+    'halo', 'lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit',
+    'sed', 'do', 'eiusmod', 'tempor', 'incididunt', 'labore', 'magna', 'aliqua',
+    '博客', '文章', '主题', '插件', '附件', '评论', '数据', '替换', '迁移', '站点',
+)
+
+
+@dataclass
+class DatasetSpec:
+    item_count: int = 1000
+    kind_mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_KIND_MIX))
+    body_size: int = 2000
+    nesting_depth: int = 2
+    link_ratio: float = 0.3
+    link_host: str = 'http://old.example.com'
+    seed: int = 20240501
+
+
+class HaloDatasetGenerator:
+    def __init__(self, spec: DatasetSpec):
+        self._spec = spec
+        self._rng = random.Random(spec.seed)
+        self._kinds = list(spec.kind_mix.keys())
+        self._weights = list(spec.kind_mix.values())
+
+    def generate(self) -> list[dict]:
+        return list(self.iter_items())
+
+    def iter_items(self) -> Iterator[dict]:
+        for index in range(self._spec.item_count):
+            kind = self._rng.choices(self._kinds, self._weights)[0]
+            yield self._make_item(index, kind)
+
+    def write(self, filepath: str) -> int:
+        items = self.generate()
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False, indent=2)
+        return len(items)
+
+    def _make_item(self, index: int, kind: str) -> dict:
+        name = f'{kind.lower()}-{index:08d}'
+        document = {
+            'apiVersion': API_VERSIONS.get(kind, 'v1alpha1'),
+            'kind': kind,
+            'metadata': self._make_metadata(name, index, kind),
+        }
+        builder = getattr(self, f'_make_{kind.lower()}', None)
+        document.update(builder(name) if builder else {'spec': self._make_nested(self._spec.nesting_depth)})
+        encoded = base64.b64encode(json.dumps(document, ensure_ascii=False).encode('utf-8')).decode()
+        return {
+            'name': f'/registry/{self._plural(kind)}/{name}',
+            'data': encoded,
+            'version': self._rng.randint(1, 50),
+        }
+
+    def _make_metadata(self, name: str, index: int, kind: str) -> dict:
+        day = 1 + index % 28
+        month = 1 + (index // 28) % 12
+        metadata: dict[str, Any] = {
+            'name': name,
+            'labels': {
+                'content.halo.run/owner': self._rng.choice(('admin', 'editor', 'guest')),
+                'content.halo.run/published': self._rng.choice(('true', 'false')),
+            },
+            'annotations': {'content.halo.run/kind': kind},
+            'version': self._rng.randint(1, 20),
+            'creationTimestamp': f'2024-{month:02d}-{day:02d}T{index % 24:02d}:00:00.000000Z',
+        }
+        if self._rng.random() < self._spec.link_ratio:
+            metadata['annotations']['content.halo.run/cover'] = self._link('covers')
+        return metadata
+
+    def _make_post(self, name: str) -> dict:
+        return {'spec': {
+            'title': self._sentence(6),
+            'slug': name,
+            'template': '',
+            'cover': self._link('covers') if self._rng.random() < self._spec.link_ratio else '',
+            'deleted': False,
+            'publish': True,
+            'publishTime': '2024-05-01T00:00:00Z',
+            'pinned': False,
+            'allowComment': True,
+            'visible': 'PUBLIC',
+            'priority': 0,
+            'excerpt': {'autoGenerate': True, 'raw': self._sentence(20)},
+            'categories': [f'category-{self._rng.randint(1, 20)}'],
+            'tags': [f'tag-{self._rng.randint(1, 50)}' for _ in range(self._rng.randint(0, 4))],
+            'htmlMetas': [],
+            'owner': 'admin',
+            'headSnapshot': f'snapshot-{name}',
+            'extra': self._make_nested(self._spec.nesting_depth),
+        }}
+
+    def _make_snapshot(self, name: str) -> dict:
+        body = self._body()
+        return {'spec': {
+            'subjectRef': {'group': 'content.halo.run', 'version': 'v1alpha1', 'kind': 'Post', 'name': name},
+            'rawType': 'markdown',
+            'rawPatch': body,
+            'contentPatch': f'<p>{body}</p>',
+            'lastModifyTime': '2024-05-01T00:00:00Z',
+            'owner': 'admin',
+            'contributors': ['admin'],
+        }}
+
+    def _make_configmap(self, name: str) -> dict:
+        settings = {'logo': self._link('logos'), 'title': self._sentence(3), 'nested': self._make_nested(1)}
+        return {'data': {
+            'basic': json.dumps(settings, ensure_ascii=False),
+            'comment': json.dumps({'enable': True, 'requireReviewForNew': False}),
+        }}
+
+    def _make_attachment(self, name: str) -> dict:
+        return {'spec': {
+            'displayName': f'{name}.png',
+            'policyName': 'default-policy',
+            'groupName': '',
+            'ownerName': 'admin',
+            'mediaType': 'image/png',
+            'size': self._rng.randint(1_000, 5_000_000),
+            'tags': [],
+        }, 'status': {'permalink': self._link('upload')}}
+
+    def _make_comment(self, name: str) -> dict:
+        raw = self._sentence(self._rng.randint(5, 60))
+        return {'spec': {
+            'raw': raw,
+            'content': f'<p>{raw}</p>',
+            'owner': {'kind': 'Email', 'name': 'guest@example.com', 'displayName': self._sentence(2)},
+            'subjectRef': {'group': 'content.halo.run', 'version': 'v1alpha1', 'kind': 'Post', 'name': name},
+            'approved': True,
+            'hidden': False,
+            'priority': 0,
+            'top': False,
+            'allowNotification': True,
+        }}
+
+    def _make_user(self, name: str) -> dict:
+        return {'spec': {
+            'displayName': self._sentence(2),
+            'email': f'{name}@example.com',
+            'avatar': self._link('avatars'),
+            'bio': self._sentence(15),
+            'disabled': False,
+            'loginHistoryLimit': 5,
+        }}
+
+    def _make_nested(self, depth: int) -> dict:
+        node: dict[str, Any] = {'label': self._sentence(2), 'weight': self._rng.randint(0, 100)}
+        if self._rng.random() < self._spec.link_ratio:
+            node['href'] = self._link('nested')
+        if depth > 0:
+            node['children'] = [self._make_nested(depth - 1) for _ in range(2)]
+        return node
+
+    def _body(self) -> str:
+        target = max(1, int(self._rng.gauss(self._spec.body_size, self._spec.body_size / 4)))
+        parts: list[str] = []
+        size = 0
+        while size < target:
+            if self._rng.random() < self._spec.link_ratio / 4:
+                chunk = f'![image]({self._link("upload")})'
+            else:
+                chunk = self._sentence(12)
+            parts.append(chunk)
+            size += len(chunk) + 1
+        return '\n'.join(parts)
+
+    def _sentence(self, word_count: int) -> str:
+        return ' '.join(self._rng.choice(WORDS) for _ in range(word_count))
+
+    def _link(self, folder: str) -> str:
+        return f'{self._spec.link_host}/{folder}/{self._rng.randrange(16 ** 8):08x}.png'
+
+    def _plural(self, kind: str) -> str:
+        return f'{kind.lower()}s'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='生成用于基准测试的合成 extensions.data 文件')
+    parser.add_argument('-o', '--output', required=True, help='输出文件路径')
+    parser.add_argument('-n', '--items', type=int, default=1000, help='扩展数量')
+    parser.add_argument('--body-size', type=int, default=2000, help='正文平均长度(字符)')
+    parser.add_argument('--nesting', type=int, default=2, help='spec 嵌套深度')
+    parser.add_argument('--link-ratio', type=float, default=0.3, help='包含待替换链接的比例')
+    parser.add_argument('--seed', type=int, default=20240501, help='随机种子')
+    args = parser.parse_args()
+
+    spec = DatasetSpec(
+        item_count=args.items,
+        body_size=args.body_size,
+        nesting_depth=args.nesting,
+        link_ratio=args.link_ratio,
+        seed=args.seed,
+    )
+    count = HaloDatasetGenerator(spec).write(args.output)
+    print(f'已生成 {count} 条扩展: {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Callable, Optional
+
+from benchmarks.dataset_generator import DatasetSpec, HaloDatasetGenerator
+from modules.application.use_cases.batch_replace_use_case import BatchReplaceInput, BatchReplaceUseCase
+from modules.core.events.event_bus import SimpleEventBus
+from modules.infrastructure.repositories.file_storage_repository import FileStorageRepository
+from modules.infrastructure.repositories.in_memory_extension_repository import InMemoryExtensionRepository
+from modules.infrastructure.services.encoding.base64_decoder import Base64Decoder
+from modules.infrastructure.services.encoding.base64_encoder import Base64Encoder
+from modules.infrastructure.services.replace.default_replace_engine import DefaultReplaceEngine
+from modules.infrastructure.types.replace_types import ReplaceRule, ReplaceScope
+
+STAGES = ('storage_load', 'decode', 'replace', 'encode', 'save')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_RULES = [ReplaceRule(search=r'http://old\.example\.com', replace='https://new.example.com', is_regex=True)]
+
+
+class PipelineBenchmark:
+    def __init__(self, dataset_path: str, output_dir: str, rules: Optional[list[ReplaceRule]] = None):
+        self._dataset_path = dataset_path
+        self._output_path = os.path.join(output_dir, 'benchmark_output.data')
+        self._rules = rules or DEFAULT_RULES
+
+    def run(self, repeat: int = 3, measure_memory: bool = True) -> dict[str, dict]:
+        timings: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        for _ in range(repeat):
+            for stage, seconds in self._run_once(self._time_stage).items():
+                timings[stage].append(seconds)
+
+        stages = {
+            stage: {'seconds': min(values), 'mean_seconds': sum(values) / len(values)}
+            for stage, values in timings.items()
+        }
+        if measure_memory:
+            for stage, peak in self._run_once(self._trace_stage).items():
+                stages[stage]['peak_bytes'] = peak
+        return stages
+
+    def _run_once(self, measure: Callable[[Callable[[], object]], tuple[object, float]]) -> dict[str, float]:
+        storage = FileStorageRepository()
+        decoder = Base64Decoder()
+        encoder = Base64Encoder()
+        repo = InMemoryExtensionRepository()
+        use_case = BatchReplaceUseCase(repo, DefaultReplaceEngine(), decoder, encoder, SimpleEventBus())
+        results: dict[str, float] = {}
+
+        items, results['storage_load'] = measure(lambda: storage.load(self._dataset_path))
+        _, results['decode'] = measure(lambda: repo.save(decoder.decode(items)))
+        del items
+        replace_input = BatchReplaceInput(rules=self._rules, scope=ReplaceScope())
+        replace_result, results['replace'] = measure(lambda: use_case.execute(replace_input))
+        if not replace_result.success:
+            raise RuntimeError(f'replace stage failed: {replace_result.error}')
+        encoded, results['encode'] = measure(lambda: encoder.encode(repo.find_all()))
+        _, results['save'] = measure(lambda: storage.save(encoded, self._output_path))
+        return results
+
+    def _time_stage(self, fn: Callable[[], object]) -> tuple[object, float]:
+        start = time.perf_counter()
+        value = fn()
+        return value, time.perf_counter() - start
+
+    def _trace_stage(self, fn: Callable[[], object]) -> tuple[object, float]:
+        tracemalloc.start()
+        try:
+            start_bytes, _ = tracemalloc.get_traced_memory()
+            value = fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return value, peak - start_bytes
+
+
+def compare_with_baseline(
+    current: dict,
+    baseline: dict,
+    time_threshold: float,
+    memory_threshold: float,
+    min_seconds: float = 0.005
+) -> list[str]:
+    regressions = []
+    for stage, values in current['stages'].items():
+        base = baseline.get('stages', {}).get(stage)
+        if not base:
+            continue
+        seconds, base_seconds = values['seconds'], base['seconds']
+        if seconds - base_seconds > min_seconds and seconds > base_seconds * (1 + time_threshold):
+            regressions.append(f'{stage}: 耗时 {base_seconds:.4f}s -> {seconds:.4f}s')
+        peak, base_peak = values.get('peak_bytes'), base.get('peak_bytes')
+        if peak and base_peak and peak > base_peak * (1 + memory_threshold):
+            regressions.append(f'{stage}: 峰值内存 {base_peak} -> {peak} bytes')
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='load → replace → export 流水线基准测试')
+    parser.add_argument('--dataset', help='已有的 extensions.data 文件，省略时按参数生成合成数据')
+    parser.add_argument('-n', '--items', type=int, default=2000, help='合成数据的扩展数量')
+    parser.add_argument('--body-size', type=int, default=2000, help='合成数据正文平均长度')
+    parser.add_argument('--nesting', type=int, default=2, help='合成数据 spec 嵌套深度')
+    parser.add_argument('--seed', type=int, default=20240501, help='合成数据随机种子')
+    parser.add_argument('--repeat', type=int, default=3, help='每个阶段重复次数(取最小值)')
+    parser.add_argument('--no-memory', action='store_true', help='跳过 tracemalloc 内存测量')
+    parser.add_argument('-o', '--output', help='结果 JSON 输出路径')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='基线结果 JSON 路径')
+    parser.add_argument('--update-baseline', action='store_true', help='将本次结果写为新的基线')
+    parser.add_argument('--time-threshold', type=float, default=0.25, help='耗时回归阈值(比例)')
+    parser.add_argument('--memory-threshold', type=float, default=0.25, help='内存回归阈值(比例)')
+    args = parser.parse_args(argv)
+
+    spec = DatasetSpec(item_count=args.items, body_size=args.body_size, nesting_depth=args.nesting, seed=args.seed)
+    with tempfile.TemporaryDirectory(prefix='halo-bench-') as work_dir:
+        dataset_path = args.dataset
+        if not dataset_path:
+            dataset_path = os.path.join(work_dir, 'extensions.data')
+            HaloDatasetGenerator(spec).write(dataset_path)
+
+        stages = PipelineBenchmark(dataset_path, work_dir).run(args.repeat, not args.no_memory)
+        result = {
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'dataset': args.dataset or asdict(spec),
+                'dataset_bytes': os.path.getsize(dataset_path),
+                'repeat': args.repeat,
+            },
+            'stages': stages,
+            'total_seconds': sum(stage['seconds'] for stage in stages.values()),
+        }
+
+    for stage, values in stages.items():
+        peak = values.get('peak_bytes')
+        peak_str = f'{peak / 1024 / 1024:9.2f} MiB' if peak is not None else ''
+        print(f'{stage:<14}{values["seconds"]:10.4f}s {peak_str}')
+    print(f'{"total":<14}{result["total_seconds"]:10.4f}s')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f'基线已更新: {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('未找到基线文件, 跳过回归比较')
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('meta', {}).get('dataset') != result['meta']['dataset']:
+        print('基线使用的数据集与本次不同, 跳过回归比较')
+        return 0
+    regressions = compare_with_baseline(result, baseline, args.time_threshold, args.memory_threshold)
+    if regressions:
+        print('检测到性能回归:')
+        for line in regressions:
+            print(f'  - {line}')
+        return 1
+    print('未检测到性能回归')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +1 @@
-from di.container import configure_container, get_use_cases
+from di.container import configure_container, get_use_cases, PROFILE_DIR_ENV, TRIGRAM_INDEX_ENV, COLUMNAR_INDEX_ENV, LEAN_LOAD_ENV, REPOSITORY_BACKEND_ENV, SQLITE_PATH_ENV, REPLACE_CACHE_ENV, MEMORY_BACKEND, SQLITE_BACKEND
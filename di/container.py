@@ -1,33 +1,91 @@
 from __future__ import annotations
 
+from typing import Optional
+
+from modules.application.base.use_case import UseCase
+from modules.application.decorators.profiling_decorator import ProfilingDecorator
+from modules.application.services.load_planner import LoadPlanner
 from modules.application.use_cases.batch_replace_use_case import BatchReplaceUseCase
 from modules.application.use_cases.delete_extension_use_case import DeleteExtensionUseCase
 from modules.application.use_cases.export_extensions_use_case import ExportExtensionsUseCase
 from modules.application.use_cases.load_extensions_use_case import LoadExtensionsUseCase
+from modules.application.use_cases.redo_replace_use_case import RedoReplaceUseCase
 from modules.application.use_cases.reset_extensions_use_case import ResetExtensionsUseCase
+from modules.application.use_cases.stream_replace_use_case import StreamReplaceUseCase
+from modules.application.use_cases.undo_replace_use_case import UndoReplaceUseCase
 from modules.application.use_cases.update_extension_use_case import UpdateExtensionUseCase
 from modules.core.di.container import DIContainer, Provider
-from modules.core.events.event_bus import SimpleEventBus
+from modules.core.events.event_bus import AsyncEventBus, SimpleEventBus
 from modules.core.logging.logger import ConsoleLogger
+from modules.core.metrics.metrics_registry import MetricsRegistry
+from modules.core.profiling.stage_profiler import StageProfiler
+from modules.core.tasks.progress_reporter import PROGRESS_EVENT
+from modules.domain.services.change_journal import ChangeJournal
 from modules.infrastructure.repositories.file_storage_repository import FileStorageRepository
 from modules.infrastructure.repositories.in_memory_extension_repository import InMemoryExtensionRepository
+from modules.infrastructure.repositories.sqlite_extension_repository import SqliteExtensionRepository
 from modules.infrastructure.services.encoding.base64_decoder import Base64Decoder
 from modules.infrastructure.services.encoding.base64_encoder import Base64Encoder
+from modules.infrastructure.services.indexing.field_index import ExtensionFieldIndex
+from modules.infrastructure.services.indexing.trigram_index import TrigramIndex
 from modules.infrastructure.services.replace.default_replace_engine import DefaultReplaceEngine
+from modules.infrastructure.services.replace.replace_result_cache import ReplaceResultCache
+
 
+PROFILE_DIR_ENV = 'HALO_PROFILE_DIR'
+TRIGRAM_INDEX_ENV = 'HALO_TRIGRAM_INDEX'
+COLUMNAR_INDEX_ENV = 'HALO_COLUMNAR_INDEX'
+LEAN_LOAD_ENV = 'HALO_LEAN_LOAD'
+REPOSITORY_BACKEND_ENV = 'HALO_REPOSITORY'
+SQLITE_PATH_ENV = 'HALO_SQLITE_PATH'
+REPLACE_CACHE_ENV = 'HALO_REPLACE_CACHE'
+MEMORY_BUDGET_ENV = 'HALO_MEMORY_BUDGET'
+MEMORY_BACKEND = 'memory'
+SQLITE_BACKEND = 'sqlite'
+COALESCED_EVENTS = (PROGRESS_EVENT,)
 
-def configure_container() -> DIContainer:
+
+def configure_container(
+    profile_dir: Optional[str] = None,
+    trigram_index: bool = False,
+    columnar_index: bool = False,
+    backend: str = MEMORY_BACKEND,
+    sqlite_path: Optional[str] = None,
+    async_events: bool = False,
+    replace_cache: bool = False
+) -> DIContainer:
     c = DIContainer()
 
-    c.register(Provider(provide='IEventBus', use_value=SimpleEventBus()))
+    c.register(Provider(provide='IEventBus', use_value=(
+        AsyncEventBus(coalesce=COALESCED_EVENTS, threaded=False) if async_events else SimpleEventBus()
+    )))
     c.register(Provider(provide='ILogger', use_value=ConsoleLogger()))
+    c.register(Provider(provide='IMetricsRegistry', use_value=MetricsRegistry()))
+    metrics = c.resolve('IMetricsRegistry')
 
-    ext_repo = InMemoryExtensionRepository()
+    profiler = StageProfiler(profile_dir) if profile_dir else None
+    if profiler:
+        c.register(Provider(provide='StageProfiler', use_value=profiler))
+
+    if backend == SQLITE_BACKEND:
+        ext_repo = SqliteExtensionRepository(sqlite_path)
+    elif backend == MEMORY_BACKEND:
+        ext_repo = InMemoryExtensionRepository(
+            TrigramIndex() if trigram_index else None,
+            ExtensionFieldIndex(columnar=columnar_index)
+        )
+    else:
+        raise ValueError(f'未知的存储后端: {backend}')
     c.register(Provider(provide='IExtensionRepository', use_value=ext_repo))
-    c.register(Provider(provide='IStorageRepository', use_value=FileStorageRepository()))
-    c.register(Provider(provide='Base64Decoder', use_value=Base64Decoder()))
-    c.register(Provider(provide='Base64Encoder', use_value=Base64Encoder()))
-    c.register(Provider(provide='IReplaceEngine', use_value=DefaultReplaceEngine()))
+    c.register(Provider(provide='IStorageRepository', use_value=FileStorageRepository(metrics)))
+    c.register(Provider(provide='Base64Decoder', use_value=Base64Decoder(metrics)))
+    c.register(Provider(provide='Base64Encoder', use_value=Base64Encoder(metrics)))
+    result_cache = ReplaceResultCache() if replace_cache else None
+    if result_cache is not None:
+        c.register(Provider(provide='ReplaceResultCache', use_value=result_cache))
+    c.register(Provider(provide='IReplaceEngine', use_value=DefaultReplaceEngine(metrics, cache=result_cache)))
+    c.register(Provider(provide='ChangeJournal', use_value=ChangeJournal()))
+    c.register(Provider(provide='LoadPlanner', use_value=LoadPlanner()))
 
     event_bus = c.resolve('IEventBus')
     extension_repo = c.resolve('IExtensionRepository')
@@ -35,37 +93,62 @@ def configure_container() -> DIContainer:
     decoder = c.resolve('Base64Decoder')
     encoder = c.resolve('Base64Encoder')
     replace_engine = c.resolve('IReplaceEngine')
+    journal = c.resolve('ChangeJournal')
+    planner = c.resolve('LoadPlanner')
 
-    c.register(Provider(provide='LoadExtensionsUseCase', use_value=LoadExtensionsUseCase(
-        storage_repo, extension_repo, decoder, event_bus
-    )))
-    c.register(Provider(provide='ExportExtensionsUseCase', use_value=ExportExtensionsUseCase(
-        extension_repo, storage_repo, encoder, event_bus
+    c.register(Provider(provide='LoadExtensionsUseCase', use_value=_profiled(LoadExtensionsUseCase(
+        storage_repo, extension_repo, decoder, event_bus, metrics, journal, planner, result_cache
+    ), profiler, 'load')))
+    c.register(Provider(provide='ExportExtensionsUseCase', use_value=_profiled(ExportExtensionsUseCase(
+        extension_repo, storage_repo, encoder, event_bus, metrics
+    ), profiler, 'export')))
+    c.register(Provider(provide='BatchReplaceUseCase', use_value=_profiled(BatchReplaceUseCase(
+        extension_repo, replace_engine, decoder, encoder, event_bus, metrics, journal
+    ), profiler, 'batch_replace')))
+    c.register(Provider(provide='StreamReplaceUseCase', use_value=_profiled(StreamReplaceUseCase(
+        storage_repo, DefaultReplaceEngine(metrics), decoder, encoder, event_bus, metrics
+    ), profiler, 'stream_replace')))
+    c.register(Provider(provide='UndoReplaceUseCase', use_value=UndoReplaceUseCase(
+        extension_repo, journal, event_bus, metrics
     )))
-    c.register(Provider(provide='BatchReplaceUseCase', use_value=BatchReplaceUseCase(
-        extension_repo, replace_engine, decoder, encoder, event_bus
+    c.register(Provider(provide='RedoReplaceUseCase', use_value=RedoReplaceUseCase(
+        extension_repo, journal, event_bus, metrics
     )))
     c.register(Provider(provide='ResetExtensionsUseCase', use_value=ResetExtensionsUseCase(
-        extension_repo, event_bus
+        extension_repo, event_bus, metrics, journal, result_cache
     )))
     c.register(Provider(provide='UpdateExtensionUseCase', use_value=UpdateExtensionUseCase(
-        extension_repo, event_bus
+        extension_repo, event_bus, metrics
     )))
     c.register(Provider(provide='DeleteExtensionUseCase', use_value=DeleteExtensionUseCase(
-        extension_repo, event_bus
+        extension_repo, event_bus, metrics
     )))
 
     return c
 
 
+def _profiled(use_case: UseCase, profiler: Optional[StageProfiler], stage: str) -> UseCase:
+    if not profiler:
+        return use_case
+    decorator = ProfilingDecorator(profiler, stage)
+    decorator.set_use_case(use_case)
+    return decorator
+
+
 def get_use_cases(container: DIContainer) -> dict:
     return {
         'load': container.resolve('LoadExtensionsUseCase'),
         'export': container.resolve('ExportExtensionsUseCase'),
         'batch_replace': container.resolve('BatchReplaceUseCase'),
+        'stream_replace': container.resolve('StreamReplaceUseCase'),
+        'undo': container.resolve('UndoReplaceUseCase'),
+        'redo': container.resolve('RedoReplaceUseCase'),
         'reset': container.resolve('ResetExtensionsUseCase'),
         'update': container.resolve('UpdateExtensionUseCase'),
         'delete': container.resolve('DeleteExtensionUseCase'),
         'extension_repo': container.resolve('IExtensionRepository'),
         'event_bus': container.resolve('IEventBus'),
+        'metrics': container.resolve('IMetricsRegistry'),
+        'journal': container.resolve('ChangeJournal'),
+        'load_planner': container.resolve('LoadPlanner'),
     }
@@ -1,4 +1,4 @@
-from modules.core import DIContainer, Provider, container, IEventBus, SimpleEventBus, event_bus, ILogger, ConsoleLogger, setup_logging
-from modules.domain import Extension, ExtensionItem, ExtensionData, Metadata, IExtensionRepository, IStorageRepository, SearchResult, ExtensionSearchService, Pagination, SearchQuery, FilterCriteria
-from modules.infrastructure import InMemoryExtensionRepository, FileStorageRepository, FileFormatError, Base64Decoder, base64_decoder, Base64Encoder, base64_encoder, DefaultReplaceEngine, default_replace_engine, ReplaceRule, ReplaceScope, PreviewChange, ReplaceResult, BatchReplaceResult, IReplaceEngine
-from modules.application import UseCase, BaseUseCase, UseCaseDecorator, BaseResult, CountResult, BatchResult, ExtensionNotFoundError, NoExtensionsError, ErrorHandlerDecorator, EventDecorator, LoggingDecorator, LoadExtensionsUseCase, LoadExtensionsInput, ExportExtensionsUseCase, ExportExtensionsInput, BatchReplaceUseCase, BatchReplaceInput, ResetExtensionsUseCase, UpdateExtensionUseCase, UpdateExtensionInput, DeleteExtensionUseCase, DeleteExtensionInput
+from modules.core import DIContainer, Provider, container, IEventBus, SimpleEventBus, AsyncEventBus, event_bus, ILogger, ConsoleLogger, setup_logging, StageProfiler, StageProfile, IMetricsRegistry, MetricsRegistry, NullMetricsRegistry, MetricsSnapshot, CancellationToken, OperationCancelledError, ProgressReporter, PROGRESS_EVENT, TaskControl, MemoryProbe, memory_probe, MemoryGuard, MemoryBudgetExceededError, parse_size, format_size
+from modules.domain import Extension, ExtensionItem, ExtensionData, Metadata, IExtensionRepository, IStorageRepository, SearchResult, CursorPage, ExtensionSearchService, ChangeJournal, JournalEntry, ExtensionPatch, FieldPatch, Pagination, SearchQuery, FilterCriteria, SearchTerm, LabelSelector, LabelRequirement, TimeRange, RawDataRef
+from modules.infrastructure import InMemoryExtensionRepository, SqliteExtensionRepository, FileStorageRepository, FileFormatError, ItemFileWriter, QueryResultCache, CheckpointStore, Checkpoint, StageProgress, CheckpointError, fingerprint_file, fingerprint_rules, Base64Decoder, base64_decoder, Base64Encoder, base64_encoder, DefaultReplaceEngine, default_replace_engine, ReplaceResultCache, TrigramIndex, ExtensionFieldIndex, CategoricalColumn, JsonlChangeReportWriter, ReplaceRule, ReplaceScope, PreviewChange, ReplaceResult, BatchReplaceResult, IReplaceEngine
+from modules.application import UseCase, BaseUseCase, UseCaseDecorator, UseCaseTask, LoadPlanner, LoadPlan, load_planner, MEMORY_STRATEGY, LEAN_STRATEGY, DISK_STRATEGY, BaseResult, CountResult, LoadResult, BatchResult, ExtensionNotFoundError, NoExtensionsError, ErrorHandlerDecorator, EventDecorator, LoggingDecorator, ProfilingDecorator, LoadExtensionsUseCase, LoadExtensionsInput, ExportExtensionsUseCase, ExportExtensionsInput, BatchReplaceUseCase, BatchReplaceInput, StreamReplaceUseCase, StreamReplaceInput, ResetExtensionsUseCase, UpdateExtensionUseCase, UpdateExtensionInput, DeleteExtensionUseCase, DeleteExtensionInput, UndoReplaceUseCase, RedoReplaceUseCase
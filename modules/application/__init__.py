@@ -1,11 +1,16 @@
-from modules.application.base import UseCase, BaseUseCase, UseCaseDecorator
-from modules.application.shared import BaseResult, CountResult, BatchResult, ExtensionNotFoundError, NoExtensionsError, FileFormatError
-from modules.application.decorators import ErrorHandlerDecorator, EventDecorator, LoggingDecorator
+from modules.application.base import UseCase, BaseUseCase, UseCaseDecorator, UseCaseTask
+from modules.application.shared import BaseResult, CountResult, LoadResult, BatchResult, ExtensionNotFoundError, NoExtensionsError, FileFormatError
+from modules.application.services import (
+    LoadPlanner, LoadPlan, load_planner, MEMORY_STRATEGY, LEAN_STRATEGY, DISK_STRATEGY
+)
+from modules.application.decorators import ErrorHandlerDecorator, EventDecorator, LoggingDecorator, ProfilingDecorator
 from modules.application.use_cases import (
     LoadExtensionsUseCase, LoadExtensionsInput,
     ExportExtensionsUseCase, ExportExtensionsInput,
     BatchReplaceUseCase, BatchReplaceInput,
+    StreamReplaceUseCase, StreamReplaceInput,
     ResetExtensionsUseCase,
     UpdateExtensionUseCase, UpdateExtensionInput,
-    DeleteExtensionUseCase, DeleteExtensionInput
+    DeleteExtensionUseCase, DeleteExtensionInput,
+    UndoReplaceUseCase, RedoReplaceUseCase
 )
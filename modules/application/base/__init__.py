@@ -1,2 +1,3 @@
 from modules.application.base.use_case import UseCase, BaseUseCase
 from modules.application.base.use_case_decorator import UseCaseDecorator
+from modules.application.base.use_case_task import UseCaseTask
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TypeVar
+
+from modules.application.base.use_case_task import UseCaseTask
+from modules.core.tasks.cancellation_token import CancellationToken
 
 Input = TypeVar('Input')
 Output = TypeVar('Output')
@@ -9,9 +12,17 @@ Output = TypeVar('Output')
 
 class UseCase(ABC, Generic[Input, Output]):
     @abstractmethod
-    def execute(self, input_data: Input) -> Output:
+    def execute(self, input_data: Input, token: Optional[CancellationToken] = None) -> Output:
         pass
 
+    def execute_async(self, input_data: Input, token: Optional[CancellationToken] = None) -> UseCaseTask[Output]:
+        token = token or CancellationToken()
+        return UseCaseTask.start(
+            lambda: self.execute(input_data, token),
+            token,
+            name=f'{type(self).__name__}.execute_async'
+        )
+
 
 class BaseUseCase(UseCase[Input, Output]):
     pass
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TypeVar
+from typing import Optional, TypeVar
 
 from modules.application.base.use_case import UseCase
+from modules.core.tasks.cancellation_token import CancellationToken
 
 Input = TypeVar('Input')
 Output = TypeVar('Output')
@@ -16,11 +17,14 @@ class UseCaseDecorator(UseCase[Input, Output], ABC):
     def set_use_case(self, use_case: UseCase[Input, Output]) -> None:
         self._use_case = use_case
 
-    def execute(self, input_data: Input) -> Output:
+    def execute(self, input_data: Input, token: Optional[CancellationToken] = None) -> Output:
         if not self._use_case:
             raise ValueError('UseCase not set in decorator')
-        return self._execute_internal(input_data)
+        return self._execute_internal(input_data, token)
+
+    def _execute_wrapped(self, input_data: Input, token: Optional[CancellationToken]) -> Output:
+        return self._use_case.execute(input_data, token)
 
     @abstractmethod
-    def _execute_internal(self, input_data: Input) -> Output:
+    def _execute_internal(self, input_data: Input, token: Optional[CancellationToken] = None) -> Output:
         pass
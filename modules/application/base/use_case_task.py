@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Generic, Optional, TypeVar
+
+from modules.core.tasks.cancellation_token import CancellationToken
+
+Output = TypeVar('Output')
+
+
+class UseCaseTask(Generic[Output]):
+    def __init__(self, future: Future, token: CancellationToken):
+        self._future = future
+        self._token = token
+
+    @classmethod
+    def start(cls, fn: Callable[[], Output], token: CancellationToken, name: Optional[str] = None) -> 'UseCaseTask[Output]':
+        future: Future = Future()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=name, daemon=True).start()
+        return cls(future, token)
+
+    @property
+    def token(self) -> CancellationToken:
+        return self._token
+
+    @property
+    def cancelled(self) -> bool:
+        return self._token.cancelled
+
+    def cancel(self) -> None:
+        self._token.cancel()
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Output:
+        return self._future.result(timeout)
+
+    def add_done_callback(self, fn: Callable[['UseCaseTask[Output]'], None]) -> None:
+        self._future.add_done_callback(lambda _: fn(self))
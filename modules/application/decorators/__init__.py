@@ -1,3 +1,4 @@
 from modules.application.decorators.error_handler_decorator import ErrorHandlerDecorator
 from modules.application.decorators.event_decorator import EventDecorator
 from modules.application.decorators.logging_decorator import LoggingDecorator
+from modules.application.decorators.profiling_decorator import ProfilingDecorator
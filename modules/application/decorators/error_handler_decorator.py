@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from modules.application.base.use_case_decorator import UseCaseDecorator
 from modules.application.shared.results import BaseResult
-from typing import TypeVar, Callable
+from modules.core.tasks.cancellation_token import CancellationToken
+from typing import Callable, Optional, TypeVar
 
 Input = TypeVar('Input')
 Output = TypeVar('Output')
@@ -14,11 +15,11 @@ class ErrorHandlerDecorator(UseCaseDecorator[Input, Output]):
         self._default_error_message = default_error_message
         self._get_error_result = get_error_result
 
-    def _execute_internal(self, input_data: Input) -> Output:
+    def _execute_internal(self, input_data: Input, token: Optional[CancellationToken] = None) -> Output:
         try:
             if not self._use_case:
                 raise ValueError('UseCase not set')
-            return self._use_case.execute(input_data)
+            return self._execute_wrapped(input_data, token)
         except Exception as e:
             error_message = str(e) if isinstance(e, Exception) else self._default_error_message
             error_result = self._get_error_result(e)
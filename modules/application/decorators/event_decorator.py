@@ -4,6 +4,7 @@ from typing import Callable, Optional, TypeVar
 
 from modules.application.base.use_case_decorator import UseCaseDecorator
 from modules.core.events.event_bus import IEventBus
+from modules.core.tasks.cancellation_token import CancellationToken
 
 Input = TypeVar('Input')
 Output = TypeVar('Output')
@@ -25,11 +26,11 @@ class EventDecorator(UseCaseDecorator[Input, Output]):
         self._get_success_payload = get_success_payload
         self._get_error_payload = get_error_payload
 
-    def _execute_internal(self, input_data: Input) -> Output:
+    def _execute_internal(self, input_data: Input, token: Optional[CancellationToken] = None) -> Output:
         try:
             if not self._use_case:
                 raise ValueError('UseCase not set')
-            result = self._use_case.execute(input_data)
+            result = self._execute_wrapped(input_data, token)
 
             if self._success_event and self._get_success_payload:
                 payload = self._get_success_payload(result, input_data)
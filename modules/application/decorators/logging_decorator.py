@@ -4,6 +4,7 @@ from typing import Callable, Optional, TypeVar
 
 from modules.application.base.use_case_decorator import UseCaseDecorator
 from modules.core.logging.logger import ILogger, ConsoleLogger
+from modules.core.tasks.cancellation_token import CancellationToken
 
 Input = TypeVar('Input')
 Output = TypeVar('Output')
@@ -16,10 +17,10 @@ class LoggingDecorator(UseCaseDecorator[Input, Output]):
         self._operation = operation
         self._get_metadata = get_metadata
 
-    def _execute_internal(self, input_data: Input) -> Output:
+    def _execute_internal(self, input_data: Input, token: Optional[CancellationToken] = None) -> Output:
         metadata = self._get_metadata(input_data) if self._get_metadata else None
         return self._logger.log_operation(
             self._operation,
-            lambda: self._use_case.execute(input_data) if self._use_case else None,
+            lambda: self._execute_wrapped(input_data, token) if self._use_case else None,
             metadata
         )
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Optional, TypeVar
+
+from modules.application.base.use_case_decorator import UseCaseDecorator
+from modules.core.profiling.stage_profiler import StageProfiler
+from modules.core.tasks.cancellation_token import CancellationToken
+
+Input = TypeVar('Input')
+Output = TypeVar('Output')
+
+
+class ProfilingDecorator(UseCaseDecorator[Input, Output]):
+    def __init__(self, profiler: StageProfiler, stage: str):
+        super().__init__()
+        self._profiler = profiler
+        self._stage = stage
+
+    def _execute_internal(self, input_data: Input, token: Optional[CancellationToken] = None) -> Output:
+        return self._profiler.run(self._stage, lambda: self._execute_wrapped(input_data, token))
@@ -0,0 +1,3 @@
+from modules.application.services.load_planner import (
+    LoadPlanner, LoadPlan, load_planner, MEMORY_STRATEGY, LEAN_STRATEGY, DISK_STRATEGY
+)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from modules.core.memory.memory_probe import MemoryProbe, memory_probe
+
+MEMORY_STRATEGY = 'memory'
+LEAN_STRATEGY = 'lean'
+DISK_STRATEGY = 'disk'
+
+
+@dataclass
+class LoadPlan:
+    strategy: str
+    file_size: int
+    estimated_bytes: int
+    budget: Optional[int]
+    fits: bool
+
+
+class LoadPlanner:
+    MEMORY_FACTOR = 3.5
+    LEAN_FACTOR = 2.5
+    DISK_WORKING_SET = 64 << 20
+    BUDGET_FRACTION = 0.6
+
+    def __init__(self, probe: Optional[MemoryProbe] = None, budget_fraction: float = BUDGET_FRACTION):
+        self._probe = probe or memory_probe
+        self._budget_fraction = budget_fraction
+
+    def budget(self, requested: Optional[int] = None) -> Optional[int]:
+        if requested is not None:
+            return requested
+        available = self._probe.available()
+        return int(available * self._budget_fraction) if available is not None else None
+
+    def plan(
+        self,
+        filepath: str,
+        budget: Optional[int] = None,
+        lean: bool = False,
+        disk_backed: bool = False
+    ) -> LoadPlan:
+        try:
+            file_size = os.path.getsize(filepath)
+        except OSError:
+            file_size = 0
+        budget = self.budget(budget)
+        strategies = self.strategies(lean, disk_backed)
+        for strategy in strategies:
+            estimated = self.estimate(strategy, file_size)
+            if budget is None or estimated <= budget:
+                return LoadPlan(strategy, file_size, estimated, budget, True)
+        strategy = strategies[-1]
+        return LoadPlan(strategy, file_size, self.estimate(strategy, file_size), budget, False)
+
+    def fallback(self, strategy: str, lean: bool = False, disk_backed: bool = False) -> Optional[str]:
+        strategies = self.strategies(lean, disk_backed)
+        index = strategies.index(strategy) + 1
+        return strategies[index] if index < len(strategies) else None
+
+    def estimate(self, strategy: str, file_size: int) -> int:
+        if strategy == MEMORY_STRATEGY:
+            return int(file_size * self.MEMORY_FACTOR)
+        if strategy == LEAN_STRATEGY:
+            return int(file_size * self.LEAN_FACTOR)
+        return min(int(file_size * self.MEMORY_FACTOR), self.DISK_WORKING_SET)
+
+    @staticmethod
+    def strategies(lean: bool, disk_backed: bool) -> list[str]:
+        streamed = DISK_STRATEGY if disk_backed else LEAN_STRATEGY
+        return [streamed] if lean else [MEMORY_STRATEGY, streamed]
+
+
+load_planner = LoadPlanner()
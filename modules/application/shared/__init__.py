@@ -1,2 +1,2 @@
-from modules.application.shared.results import BaseResult, CountResult, BatchResult
+from modules.application.shared.results import BaseResult, CountResult, LoadResult, BatchResult
 from modules.application.shared.errors import ExtensionNotFoundError, NoExtensionsError, FileFormatError
@@ -8,14 +8,23 @@ from typing import Optional
 class BaseResult:
     success: bool
     error: Optional[str] = None
+    cancelled: bool = False
 
 
 @dataclass
 class CountResult(BaseResult):
     count: int = 0
+    metrics: Optional[dict] = None
+
+
+@dataclass
+class LoadResult(CountResult):
+    strategy: Optional[str] = None
 
 
 @dataclass
 class BatchResult(BaseResult):
     updated_count: int = 0
     deleted_count: int = 0
+    change_count: int = 0
+    metrics: Optional[dict] = None
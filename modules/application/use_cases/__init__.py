@@ -1,6 +1,9 @@
 from modules.application.use_cases.load_extensions_use_case import LoadExtensionsUseCase, LoadExtensionsInput
 from modules.application.use_cases.export_extensions_use_case import ExportExtensionsUseCase, ExportExtensionsInput
 from modules.application.use_cases.batch_replace_use_case import BatchReplaceUseCase, BatchReplaceInput
+from modules.application.use_cases.stream_replace_use_case import StreamReplaceUseCase, StreamReplaceInput
 from modules.application.use_cases.reset_extensions_use_case import ResetExtensionsUseCase
 from modules.application.use_cases.update_extension_use_case import UpdateExtensionUseCase, UpdateExtensionInput
 from modules.application.use_cases.delete_extension_use_case import DeleteExtensionUseCase, DeleteExtensionInput
+from modules.application.use_cases.undo_replace_use_case import UndoReplaceUseCase
+from modules.application.use_cases.redo_replace_use_case import RedoReplaceUseCase
@@ -1,32 +1,51 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Optional
 
 from modules.application.base.use_case import UseCase
 from modules.application.shared.results import BatchResult
 from modules.core.events.event_bus import IEventBus
 from modules.core.logging.logger import ILogger, ConsoleLogger
-from modules.domain.entities.extension_data import ExtensionData, Metadata
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
+from modules.core.tasks.cancellation_token import CancellationToken, OperationCancelledError
+from modules.core.tasks.task_control import TaskControl
+from modules.domain.entities.extension import Extension
+from modules.domain.entities.extension_data import ExtensionData
 from modules.domain.repositories.i_extension_repository import IExtensionRepository
+from modules.domain.services.change_journal import ChangeJournal, JournalEntry
+from modules.infrastructure.services.checkpoint.checkpoint_store import CheckpointError, CheckpointStore
 from modules.infrastructure.services.encoding.base64_decoder import Base64Decoder
 from modules.infrastructure.services.encoding.base64_encoder import Base64Encoder
-from modules.infrastructure.types.replace_types import ReplaceRule, ReplaceScope, IReplaceEngine
+from modules.infrastructure.services.indexing.trigram_index import plan_for_literal, plan_for_regex
+from modules.infrastructure.services.report.jsonl_change_report_writer import JsonlChangeReportWriter
+from modules.infrastructure.types.replace_types import (
+    BatchReplaceResult, ReplaceResult, ReplaceRule, ReplaceScope, IReplaceEngine
+)
 
 
 @dataclass
 class BatchReplaceInput:
     rules: list[ReplaceRule]
     scope: ReplaceScope
+    report_path: Optional[str] = None
+    dry_run: bool = False
+    checkpoint: Optional[CheckpointStore] = None
 
 
 class BatchReplaceUseCase(UseCase[BatchReplaceInput, BatchResult]):
+    CHECKPOINT_CHUNK_SIZE = 500
+
     def __init__(
         self,
         extension_repo: IExtensionRepository,
         replace_engine: IReplaceEngine,
         decoder: Base64Decoder,
         encoder: Base64Encoder,
-        event_bus: IEventBus
+        event_bus: IEventBus,
+        metrics: Optional[IMetricsRegistry] = None,
+        journal: Optional[ChangeJournal] = None
     ):
         self._extension_repo = extension_repo
         self._replace_engine = replace_engine
@@ -34,67 +53,176 @@ class BatchReplaceUseCase(UseCase[BatchReplaceInput, BatchResult]):
         self._encoder = encoder
         self._event_bus = event_bus
         self._logger: ILogger = ConsoleLogger('BatchReplaceUseCase')
-
-    def execute(self, input_data: BatchReplaceInput) -> BatchResult:
-        return self._logger.log_operation(
-            'execute',
-            lambda: self._do_execute(input_data),
-            {'rule_count': len(input_data.rules)}
-        )
-
-    def _do_execute(self, input_data: BatchReplaceInput) -> BatchResult:
+        self._metrics = metrics or NullMetricsRegistry()
+        self._journal = journal
+
+    def execute(self, input_data: BatchReplaceInput, token: Optional[CancellationToken] = None) -> BatchResult:
+        with self._metrics.collect() as call_metrics:
+            with self._metrics.time('halo_use_case_duration_seconds', use_case='batch_replace'):
+                result = self._logger.log_operation(
+                    'execute',
+                    lambda: self._do_execute(input_data, TaskControl(self._event_bus, 'batch_replace', token)),
+                    {
+                        'rule_count': len(input_data.rules),
+                        'dry_run': input_data.dry_run,
+                        'checkpoint': input_data.checkpoint.path if input_data.checkpoint else None
+                    }
+                )
+        result.metrics = call_metrics.snapshot().to_dict()
+        return result
+
+    def _do_execute(self, input_data: BatchReplaceInput, control: TaskControl) -> BatchResult:
         try:
-            all_extensions = self._extension_repo.find_all()
-
-            if not all_extensions:
+            if self._extension_repo.count() == 0:
                 return BatchResult(success=True, updated_count=0)
 
-            result = self._replace_engine.apply(all_extensions, input_data.rules, input_data.scope)
-
-            if result.results:
-                updated_extensions = []
-                for replace_result in result.results:
-                    original = self._extension_repo.find_by_name(replace_result.extension_name)
-                    if original:
-                        new_data = self._dict_to_extension_data(replace_result.updated_data)
-                        updated_ext = original.update_all(
-                            replace_result.extension_name,
-                            original.version,
-                            new_data
-                        )
-                        updated_extensions.append(updated_ext)
-
-                if updated_extensions:
-                    self._extension_repo.save(updated_extensions)
+            if input_data.checkpoint is not None:
+                result = self._apply_checkpointed(input_data, input_data.checkpoint, control)
+            elif input_data.report_path:
+                with JsonlChangeReportWriter(input_data.report_path) as report:
+                    result = self._replace_engine.apply(
+                        self._candidate_extensions(input_data.rules, input_data.scope),
+                        input_data.rules, input_data.scope, on_change=report.write, control=control,
+                        collect=not input_data.dry_run
+                    )
+            else:
+                result = self._replace_engine.apply(
+                    self._candidate_extensions(input_data.rules, input_data.scope),
+                    input_data.rules, input_data.scope, control=control, collect=not input_data.dry_run
+                )
+            control.raise_if_cancelled()
+
+            if result.results and not input_data.dry_run:
+                updated_extensions = [replace_result.updated for replace_result in result.results]
+                self._extension_repo.save(updated_extensions)
+                if self._journal:
+                    patches = []
+                    for replace_result in result.results:
+                        patch = ChangeJournal.diff(replace_result.original, replace_result.updated)
+                        if patch:
+                            patches.append(patch)
+                    self._journal.record(JournalEntry(self._describe(input_data.rules), patches))
 
             self._event_bus.emit('extensions:batch-replaced', {
                 'total_changes': result.total_changes,
-                'updated_count': len(result.results)
+                'updated_count': result.updated_count,
+                'dry_run': input_data.dry_run,
+                'report_path': input_data.report_path
             })
 
-            return BatchResult(success=True, updated_count=len(result.results))
+            return BatchResult(
+                success=True,
+                updated_count=result.updated_count,
+                change_count=result.total_changes
+            )
         except Exception as e:
             error_message = str(e)
-            self._event_bus.emit('extensions:batch-replace-error', {'error': error_message})
-            return BatchResult(success=False, updated_count=0, error=error_message)
-
-    def _dict_to_extension_data(self, data: dict) -> ExtensionData:
-        metadata = None
-        if 'metadata' in data and data['metadata']:
-            m = data['metadata']
-            metadata = Metadata(
-                name=m.get('name'),
-                annotations=m.get('annotations'),
-                labels=m.get('labels'),
-                resource_version=m.get('resourceVersion'),
-                creation_timestamp=m.get('creationTimestamp'),
-                version=m.get('version')
-            )
+            cancelled = isinstance(e, OperationCancelledError)
+            self._event_bus.emit('extensions:batch-replace-error', {'error': error_message, 'cancelled': cancelled})
+            return BatchResult(success=False, updated_count=0, error=error_message, cancelled=cancelled)
 
-        return ExtensionData(
-            api_version=data.get('apiVersion'),
-            kind=data.get('kind'),
-            metadata=metadata,
-            spec=data.get('spec'),
-            data=data.get('data')
-        )
+    def _apply_checkpointed(
+        self,
+        input_data: BatchReplaceInput,
+        store: CheckpointStore,
+        control: TaskControl
+    ) -> BatchReplaceResult:
+        progress = store.checkpoint.replace
+        results = self._restore_updates(store)
+        if progress.done:
+            return BatchReplaceResult(results=results, total_changes=progress.changes, updated_count=progress.updated)
+
+        narrowed = self._narrowed_candidates(input_data.rules, input_data.scope)
+        if narrowed is None:
+            ordered, total = self._extension_repo.iter_all(), self._extension_repo.count()
+        else:
+            ordered = sorted(narrowed, key=lambda ext: ext.name)
+            total = len(ordered)
+        remaining = control.track(islice(ordered, progress.index, None), 'replace', total - progress.index)
+
+        report = None
+        if input_data.report_path:
+            resume_at = progress.report_bytes if store.resumed else None
+            report = JsonlChangeReportWriter(input_data.report_path, resume_at).open()
+        try:
+            pending: list[ReplaceResult] = []
+            while chunk := list(islice(remaining, self.CHECKPOINT_CHUNK_SIZE)):
+                chunk_result = self._replace_engine.apply(
+                    chunk, input_data.rules, input_data.scope, on_change=report.write if report else None,
+                    collect=not input_data.dry_run
+                )
+                pending.extend(chunk_result.results)
+                progress.index += len(chunk)
+                progress.updated += chunk_result.updated_count
+                progress.changes += chunk_result.total_changes
+                if store.due():
+                    self._commit_checkpoint(store, pending, report)
+                    results.extend(pending)
+                    pending = []
+            control.raise_if_cancelled()
+            progress.done = True
+            self._commit_checkpoint(store, pending, report)
+            results.extend(pending)
+        finally:
+            if report:
+                report.close()
+        return BatchReplaceResult(results=results, total_changes=progress.changes, updated_count=progress.updated)
+
+    @staticmethod
+    def _commit_checkpoint(
+        store: CheckpointStore,
+        results: list[ReplaceResult],
+        report: Optional[JsonlChangeReportWriter]
+    ) -> None:
+        store.record_updates(results)
+        if report:
+            store.checkpoint.replace.report_bytes = report.commit()
+        store.commit()
+
+    def _restore_updates(self, store: CheckpointStore) -> list[ReplaceResult]:
+        results = []
+        for record in store.iter_updates():
+            original = self._extension_repo.find_by_name(record['source'])
+            if original is None:
+                raise CheckpointError(f'断点记录与输入数据不一致: {record["source"]}', 'UPDATES_MISMATCH')
+            updated = original.update_all(record['name'], original.version, ExtensionData.from_document(record['data']))
+            results.append(ReplaceResult(
+                extension_name=updated.name,
+                has_changes=True,
+                source_name=original.name,
+                original=original,
+                updated=updated
+            ))
+        return results
+
+    def _candidate_extensions(self, rules: list[ReplaceRule], scope: ReplaceScope) -> Iterable[Extension]:
+        narrowed = self._narrowed_candidates(rules, scope)
+        return narrowed if narrowed is not None else self._extension_repo.iter_all()
+
+    def _narrowed_candidates(self, rules: list[ReplaceRule], scope: ReplaceScope) -> Optional[Iterable[Extension]]:
+        in_scope = None
+        if scope.selected_kinds or scope.label_selector is not None or scope.created is not None:
+            in_scope = self._extension_repo.find_in_scope(
+                scope.selected_kinds or None, scope.label_selector, scope.created
+            )
+        candidates = self._text_candidates(rules)
+        if in_scope is None:
+            return candidates
+        if candidates is None:
+            return in_scope
+        scoped_names = {ext.name for ext in in_scope}
+        return (ext for ext in candidates if ext.name in scoped_names)
+
+    def _text_candidates(self, rules: list[ReplaceRule]) -> Optional[Iterable[Extension]]:
+        plans = []
+        for rule in rules:
+            if not rule.search.strip():
+                continue
+            plan = plan_for_regex(rule.search) if rule.is_regex else plan_for_literal(rule.search)
+            if plan is None:
+                return None
+            plans.append(plan)
+        return self._extension_repo.find_candidates(plans) if plans else None
+
+    def _describe(self, rules: list[ReplaceRule]) -> str:
+        return '; '.join(f'{rule.search} → {rule.replace}' for rule in rules if rule.search.strip())
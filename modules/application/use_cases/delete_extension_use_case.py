@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 from modules.application.base.use_case import UseCase
 from modules.application.shared.results import BaseResult
 from modules.core.events.event_bus import IEventBus
 from modules.core.logging.logger import ILogger, ConsoleLogger
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
+from modules.core.tasks.cancellation_token import CancellationToken, OperationCancelledError
 from modules.domain.repositories.i_extension_repository import IExtensionRepository
 from modules.application.shared.errors import ExtensionNotFoundError
 
@@ -19,18 +22,23 @@ class DeleteExtensionUseCase(UseCase[DeleteExtensionInput, BaseResult]):
     def __init__(
         self,
         extension_repo: IExtensionRepository,
-        event_bus: IEventBus
+        event_bus: IEventBus,
+        metrics: Optional[IMetricsRegistry] = None
     ):
         self._extension_repo = extension_repo
         self._event_bus = event_bus
         self._logger: ILogger = ConsoleLogger('DeleteExtensionUseCase')
-
-    def execute(self, input_data: DeleteExtensionInput) -> BaseResult:
-        return self._logger.log_operation(
-            'execute',
-            lambda: self._do_execute(input_data),
-            {'extension_name': input_data.name}
-        )
+        self._metrics = metrics or NullMetricsRegistry()
+
+    def execute(self, input_data: DeleteExtensionInput, token: Optional[CancellationToken] = None) -> BaseResult:
+        if token is not None and token.cancelled:
+            return BaseResult(success=False, error=str(OperationCancelledError()), cancelled=True)
+        with self._metrics.time('halo_use_case_duration_seconds', use_case='delete'):
+            return self._logger.log_operation(
+                'execute',
+                lambda: self._do_execute(input_data),
+                {'extension_name': input_data.name}
+            )
 
     def _do_execute(self, input_data: DeleteExtensionInput) -> BaseResult:
         try:
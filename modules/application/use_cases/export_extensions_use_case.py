@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
+from itertools import islice
+from typing import Optional
 
 from modules.application.base.use_case import UseCase
 from modules.application.shared.results import BaseResult
 from modules.core.events.event_bus import IEventBus
 from modules.core.logging.logger import ILogger, ConsoleLogger
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
+from modules.core.tasks.cancellation_token import CancellationToken, OperationCancelledError
+from modules.core.tasks.task_control import TaskControl
 from modules.domain.repositories.i_extension_repository import IExtensionRepository
-from modules.infrastructure.repositories.file_storage_repository import FileStorageRepository
+from modules.domain.value_objects.raw_data_ref import RawDataRef
+from modules.infrastructure.repositories.file_storage_repository import FileFormatError, FileStorageRepository
+from modules.infrastructure.services.checkpoint.checkpoint_store import CheckpointStore
 from modules.infrastructure.services.encoding.base64_encoder import Base64Encoder
 
 
 @dataclass
 class ExportExtensionsInput:
     filepath: str
+    checkpoint: Optional[CheckpointStore] = None
 
 
 class ExportExtensionsUseCase(UseCase[ExportExtensionsInput, BaseResult]):
@@ -22,38 +31,86 @@ class ExportExtensionsUseCase(UseCase[ExportExtensionsInput, BaseResult]):
         extension_repo: IExtensionRepository,
         storage_repo: FileStorageRepository,
         encoder: Base64Encoder,
-        event_bus: IEventBus
+        event_bus: IEventBus,
+        metrics: Optional[IMetricsRegistry] = None
     ):
         self._extension_repo = extension_repo
         self._storage_repo = storage_repo
         self._encoder = encoder
         self._event_bus = event_bus
         self._logger: ILogger = ConsoleLogger('ExportExtensionsUseCase')
+        self._metrics = metrics or NullMetricsRegistry()
 
-    def execute(self, input_data: ExportExtensionsInput) -> BaseResult:
-        return self._logger.log_operation(
-            'execute',
-            lambda: self._do_execute(input_data),
-            {'filepath': input_data.filepath}
-        )
+    def execute(self, input_data: ExportExtensionsInput, token: Optional[CancellationToken] = None) -> BaseResult:
+        with self._metrics.time('halo_use_case_duration_seconds', use_case='export'):
+            return self._logger.log_operation(
+                'execute',
+                lambda: self._do_execute(input_data, TaskControl(self._event_bus, 'export', token)),
+                {
+                    'filepath': input_data.filepath,
+                    'checkpoint': input_data.checkpoint.path if input_data.checkpoint else None
+                }
+            )
 
-    def _do_execute(self, input_data: ExportExtensionsInput) -> BaseResult:
+    def _do_execute(self, input_data: ExportExtensionsInput, control: TaskControl) -> BaseResult:
         try:
-            extensions = self._extension_repo.find_all()
-            if not extensions:
+            count = self._extension_repo.count()
+            if count == 0:
                 return BaseResult(success=False, error='没有可导出的扩展数据')
 
-            raw_data = self._encoder.encode(extensions)
-            self._storage_repo.save(raw_data, input_data.filepath)
+            if input_data.checkpoint is not None:
+                self._export_checkpointed(input_data.filepath, input_data.checkpoint, count, control)
+            else:
+                raw_data = self._encoder.iter_encode(
+                    self._extension_repo.iter_all(), control=control, total=count, raw_reader=self._read_raw
+                )
+                self._storage_repo.save(raw_data, input_data.filepath)
 
             self._extension_repo.mark_as_saved()
             self._event_bus.emit('extensions:exported', {
                 'filename': input_data.filepath,
-                'count': len(extensions)
+                'count': count
             })
 
             return BaseResult(success=True)
         except Exception as e:
             error_message = str(e)
-            self._event_bus.emit('extensions:export-error', {'error': error_message})
-            return BaseResult(success=False, error=error_message)
+            cancelled = isinstance(e, OperationCancelledError)
+            self._event_bus.emit('extensions:export-error', {'error': error_message, 'cancelled': cancelled})
+            return BaseResult(success=False, error=error_message, cancelled=cancelled)
+
+    def _read_raw(self, ref: RawDataRef) -> Optional[str]:
+        if not ref.readable:
+            return None
+        try:
+            return self._storage_repo.read_raw(ref)
+        except FileFormatError:
+            self._metrics.increment('halo_raw_reread_fallbacks_total')
+            return None
+
+    def _export_checkpointed(self, filepath: str, store: CheckpointStore, count: int, control: TaskControl) -> None:
+        progress = store.checkpoint.export
+        if progress.done:
+            return
+        part_path = f'{filepath}.part'
+        if not store.resumed or not os.path.exists(part_path):
+            progress.index = progress.bytes = 0
+
+        writer = self._storage_repo.open_writer(part_path, progress.bytes if progress.index else None, progress.index)
+        try:
+            remaining = islice(self._extension_repo.iter_all(), progress.index, None)
+            for item in self._encoder.iter_encode(
+                remaining, control=control, total=count - progress.index, raw_reader=self._read_raw
+            ):
+                writer.write(item)
+                progress.index += 1
+                if store.due():
+                    progress.bytes = writer.commit()
+                    store.commit()
+            control.raise_if_cancelled()
+            progress.bytes = writer.finish()
+        finally:
+            writer.close()
+        os.replace(part_path, filepath)
+        progress.done = True
+        store.commit()
@@ -1,52 +1,152 @@
 from __future__ import annotations
 
+import gc
 from dataclasses import dataclass
+from typing import Iterator, Optional
 
 from modules.application.base.use_case import UseCase
-from modules.application.shared.results import CountResult
+from modules.application.services.load_planner import LoadPlanner, MEMORY_STRATEGY, load_planner
+from modules.application.shared.results import LoadResult
 from modules.core.events.event_bus import IEventBus
 from modules.core.logging.logger import ILogger, ConsoleLogger
+from modules.core.memory.memory_guard import MemoryGuard, MemoryBudgetExceededError
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
+from modules.core.tasks.cancellation_token import CancellationToken, OperationCancelledError
+from modules.core.tasks.task_control import TaskControl
+from modules.domain.entities.extension import Extension
 from modules.domain.repositories.i_extension_repository import IExtensionRepository
 from modules.domain.repositories.i_storage_repository import IStorageRepository
+from modules.domain.services.change_journal import ChangeJournal
 from modules.infrastructure.services.encoding.base64_decoder import Base64Decoder
+from modules.infrastructure.services.replace.replace_result_cache import ReplaceResultCache
 
 
 @dataclass
 class LoadExtensionsInput:
     filepath: str
+    lean: bool = False
+    memory_budget: Optional[int] = None
 
 
-class LoadExtensionsUseCase(UseCase[LoadExtensionsInput, CountResult]):
+class LoadExtensionsUseCase(UseCase[LoadExtensionsInput, LoadResult]):
     def __init__(
         self,
         storage_repo: IStorageRepository,
         extension_repo: IExtensionRepository,
         decoder: Base64Decoder,
-        event_bus: IEventBus
+        event_bus: IEventBus,
+        metrics: Optional[IMetricsRegistry] = None,
+        journal: Optional[ChangeJournal] = None,
+        planner: Optional[LoadPlanner] = None,
+        replace_cache: Optional[ReplaceResultCache] = None
     ):
         self._storage_repo = storage_repo
         self._extension_repo = extension_repo
         self._decoder = decoder
         self._event_bus = event_bus
         self._logger: ILogger = ConsoleLogger('LoadExtensionsUseCase')
+        self._metrics = metrics or NullMetricsRegistry()
+        self._journal = journal
+        self._planner = planner or load_planner
+        self._replace_cache = replace_cache
 
-    def execute(self, input_data: LoadExtensionsInput) -> CountResult:
-        return self._logger.log_operation(
-            'execute',
-            lambda: self._do_execute(input_data),
-            {'filepath': input_data.filepath}
-        )
+    def execute(self, input_data: LoadExtensionsInput, token: Optional[CancellationToken] = None) -> LoadResult:
+        with self._metrics.collect() as call_metrics:
+            with self._metrics.time('halo_use_case_duration_seconds', use_case='load'):
+                result = self._logger.log_operation(
+                    'execute',
+                    lambda: self._do_execute(input_data, TaskControl(self._event_bus, 'load', token)),
+                    {
+                        'filepath': input_data.filepath,
+                        'lean': input_data.lean,
+                        'memory_budget': input_data.memory_budget
+                    }
+                )
+        result.metrics = call_metrics.snapshot().to_dict()
+        return result
 
-    def _do_execute(self, input_data: LoadExtensionsInput) -> CountResult:
+    def _do_execute(self, input_data: LoadExtensionsInput, control: TaskControl) -> LoadResult:
         try:
-            raw_data = self._storage_repo.load(input_data.filepath)
-            extensions = self._decoder.decode(raw_data)
-            self._extension_repo.save(extensions)
+            disk_backed = self._extension_repo.is_disk_backed()
+            plan = self._planner.plan(
+                input_data.filepath, input_data.memory_budget, input_data.lean, disk_backed
+            )
+            if not plan.fits:
+                raise MemoryBudgetExceededError(plan.estimated_bytes, plan.budget, estimated=True)
+
+            strategy = plan.strategy
+            while True:
+                if plan.budget is not None:
+                    control.guard = MemoryGuard(plan.budget)
+                try:
+                    count = self._load(input_data.filepath, strategy, control)
+                    break
+                except MemoryBudgetExceededError as e:
+                    fallback = self._planner.fallback(strategy, input_data.lean, disk_backed)
+                    if fallback is None:
+                        raise
+                    self._event_bus.emit('extensions:load-degraded', {
+                        'from': strategy, 'to': fallback, 'error': str(e)
+                    })
+                    gc.collect()
+                    strategy = fallback
+
+            if self._journal:
+                self._journal.clear()
+            if self._replace_cache is not None:
+                self._replace_cache.clear()
 
-            self._event_bus.emit('extensions:loaded', {'count': len(extensions)})
+            self._event_bus.emit('extensions:loaded', {'count': count, 'strategy': strategy})
 
-            return CountResult(success=True, count=len(extensions))
+            return LoadResult(success=True, count=count, strategy=strategy)
         except Exception as e:
             error_message = str(e)
-            self._event_bus.emit('extensions:load-error', {'error': error_message})
-            return CountResult(success=False, count=0, error=error_message)
+            cancelled = isinstance(e, OperationCancelledError)
+            self._event_bus.emit('extensions:load-error', {'error': error_message, 'cancelled': cancelled})
+            return LoadResult(success=False, count=0, error=error_message, cancelled=cancelled)
+
+    def _load(self, filepath: str, strategy: str, control: TaskControl) -> int:
+        if strategy == MEMORY_STRATEGY:
+            raw_data = self._storage_repo.load(filepath)
+            extensions = self._decoder.decode(raw_data, control=control)
+            del raw_data
+            control.raise_if_cancelled()
+            self._extension_repo.save(extensions)
+            return len(extensions)
+
+        counter = [0]
+        previous: Optional[dict[str, Optional[Extension]]] = {} if self._extension_repo.count() else None
+        items = self._storage_repo.iter_load(filepath, with_offsets=True)
+        try:
+            self._extension_repo.save(self._counted(
+                self._decoder.iter_decode(items, control, lean=True, source=filepath), counter, previous
+            ))
+        except Exception:
+            self._restore_previous(previous)
+            raise
+        return counter[0]
+
+    def _counted(
+        self,
+        extensions: Iterator[Extension],
+        counter: list[int],
+        previous: Optional[dict[str, Optional[Extension]]]
+    ) -> Iterator[Extension]:
+        for ext in extensions:
+            counter[0] += 1
+            if previous is not None and ext.name not in previous:
+                previous[ext.name] = self._extension_repo.find_by_name(ext.name)
+            yield ext
+
+    def _restore_previous(self, previous: Optional[dict[str, Optional[Extension]]]) -> None:
+        if previous is None:
+            self._extension_repo.clear()
+            return
+        overwritten = []
+        for name, ext in previous.items():
+            if ext is None:
+                self._extension_repo.delete(name)
+            else:
+                overwritten.append(ext)
+        if overwritten:
+            self._extension_repo.save(overwritten)
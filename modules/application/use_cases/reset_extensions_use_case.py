@@ -1,31 +1,50 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from modules.application.base.use_case import UseCase
 from modules.application.shared.results import BaseResult
 from modules.core.events.event_bus import IEventBus
 from modules.core.logging.logger import ILogger, ConsoleLogger
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
+from modules.core.tasks.cancellation_token import CancellationToken, OperationCancelledError
 from modules.domain.repositories.i_extension_repository import IExtensionRepository
+from modules.domain.services.change_journal import ChangeJournal
+from modules.infrastructure.services.replace.replace_result_cache import ReplaceResultCache
 
 
 class ResetExtensionsUseCase(UseCase[None, BaseResult]):
     def __init__(
         self,
         extension_repo: IExtensionRepository,
-        event_bus: IEventBus
+        event_bus: IEventBus,
+        metrics: Optional[IMetricsRegistry] = None,
+        journal: Optional[ChangeJournal] = None,
+        replace_cache: Optional[ReplaceResultCache] = None
     ):
         self._extension_repo = extension_repo
         self._event_bus = event_bus
         self._logger: ILogger = ConsoleLogger('ResetExtensionsUseCase')
+        self._metrics = metrics or NullMetricsRegistry()
+        self._journal = journal
+        self._replace_cache = replace_cache
 
-    def execute(self, input_data: None = None) -> BaseResult:
-        return self._logger.log_operation(
-            'execute',
-            lambda: self._do_execute()
-        )
+    def execute(self, input_data: None = None, token: Optional[CancellationToken] = None) -> BaseResult:
+        if token is not None and token.cancelled:
+            return BaseResult(success=False, error=str(OperationCancelledError()), cancelled=True)
+        with self._metrics.time('halo_use_case_duration_seconds', use_case='reset'):
+            return self._logger.log_operation(
+                'execute',
+                lambda: self._do_execute()
+            )
 
     def _do_execute(self) -> BaseResult:
         try:
             self._extension_repo.clear()
+            if self._journal:
+                self._journal.clear()
+            if self._replace_cache is not None:
+                self._replace_cache.clear()
             self._event_bus.emit('extensions:reset', {})
             return BaseResult(success=True)
         except Exception as e:
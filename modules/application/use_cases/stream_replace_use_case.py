@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from modules.application.base.use_case import UseCase
+from modules.application.shared.results import BatchResult
+from modules.core.events.event_bus import IEventBus
+from modules.core.logging.logger import ILogger, ConsoleLogger
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
+from modules.core.tasks.cancellation_token import CancellationToken, OperationCancelledError
+from modules.core.tasks.task_control import TaskControl
+from modules.domain.entities.extension import Extension
+from modules.domain.repositories.i_storage_repository import IStorageRepository
+from modules.infrastructure.services.encoding.base64_decoder import Base64Decoder
+from modules.infrastructure.services.encoding.base64_encoder import Base64Encoder
+from modules.infrastructure.services.report.jsonl_change_report_writer import JsonlChangeReportWriter
+from modules.infrastructure.types.replace_types import (
+    ChangeSink, PreviewChange, ReplaceResult, ReplaceRule, ReplaceScope, IReplaceEngine
+)
+
+
+@dataclass
+class StreamReplaceInput:
+    input_path: str
+    output_path: Optional[str]
+    rules: list[ReplaceRule]
+    scope: ReplaceScope
+    report_path: Optional[str] = None
+    dry_run: bool = False
+
+
+class _StreamTally:
+    __slots__ = ('items', 'updated', 'changes')
+
+    def __init__(self):
+        self.items = 0
+        self.updated = 0
+        self.changes = 0
+
+
+class StreamReplaceUseCase(UseCase[StreamReplaceInput, BatchResult]):
+    def __init__(
+        self,
+        storage_repo: IStorageRepository,
+        replace_engine: IReplaceEngine,
+        decoder: Base64Decoder,
+        encoder: Base64Encoder,
+        event_bus: IEventBus,
+        metrics: Optional[IMetricsRegistry] = None
+    ):
+        self._storage_repo = storage_repo
+        self._replace_engine = replace_engine
+        self._decoder = decoder
+        self._encoder = encoder
+        self._event_bus = event_bus
+        self._logger: ILogger = ConsoleLogger('StreamReplaceUseCase')
+        self._metrics = metrics or NullMetricsRegistry()
+
+    def execute(self, input_data: StreamReplaceInput, token: Optional[CancellationToken] = None) -> BatchResult:
+        with self._metrics.collect() as call_metrics:
+            with self._metrics.time('halo_use_case_duration_seconds', use_case='stream_replace'):
+                result = self._logger.log_operation(
+                    'execute',
+                    lambda: self._do_execute(input_data, TaskControl(self._event_bus, 'stream_replace', token)),
+                    {'input': input_data.input_path, 'rule_count': len(input_data.rules), 'dry_run': input_data.dry_run}
+                )
+        result.metrics = call_metrics.snapshot().to_dict()
+        return result
+
+    def _do_execute(self, input_data: StreamReplaceInput, control: TaskControl) -> BatchResult:
+        try:
+            if not input_data.dry_run and self._same_file(input_data.input_path, input_data.output_path):
+                raise ValueError('流式处理时输出文件不能与输入文件相同')
+
+            tally = _StreamTally()
+            if input_data.report_path:
+                with JsonlChangeReportWriter(input_data.report_path) as report:
+                    self._run(input_data, tally, report.write, control)
+            else:
+                self._run(input_data, tally, None, control)
+
+            self._event_bus.emit('extensions:stream-replaced', {
+                'item_count': tally.items,
+                'total_changes': tally.changes,
+                'updated_count': tally.updated,
+                'dry_run': input_data.dry_run,
+                'report_path': input_data.report_path
+            })
+
+            return BatchResult(success=True, updated_count=tally.updated, change_count=tally.changes)
+        except Exception as e:
+            error_message = str(e)
+            cancelled = isinstance(e, OperationCancelledError)
+            self._event_bus.emit('extensions:stream-replace-error', {'error': error_message, 'cancelled': cancelled})
+            return BatchResult(success=False, updated_count=0, error=error_message, cancelled=cancelled)
+
+    def _run(
+        self,
+        input_data: StreamReplaceInput,
+        tally: _StreamTally,
+        sink: Optional[ChangeSink],
+        control: TaskControl
+    ) -> None:
+        def on_change(extension_name: str, change: PreviewChange) -> None:
+            tally.changes += 1
+            if sink:
+                sink(extension_name, change)
+
+        items = self._storage_repo.iter_load(input_data.input_path)
+        outcomes = self._replace_engine.iter_apply(
+            self._decoder.iter_decode(items, control), input_data.rules, input_data.scope, on_change
+        )
+        extensions = self._collect(outcomes, tally)
+        if input_data.dry_run:
+            for _ in extensions:
+                pass
+            return
+        self._storage_repo.save(self._encoder.iter_encode(extensions, chunk_size=1), input_data.output_path)
+
+    @staticmethod
+    def _collect(
+        outcomes: Iterable[tuple[Extension, Optional[ReplaceResult]]],
+        tally: _StreamTally
+    ) -> Iterator[Extension]:
+        for ext, result in outcomes:
+            tally.items += 1
+            if result is None:
+                yield ext
+                continue
+            tally.updated += 1
+            yield result.updated
+
+    @staticmethod
+    def _same_file(input_path: str, output_path: Optional[str]) -> bool:
+        if not output_path:
+            raise ValueError('未指定输出文件')
+        if os.path.exists(output_path):
+            return os.path.samefile(input_path, output_path)
+        return os.path.abspath(input_path) == os.path.abspath(output_path)
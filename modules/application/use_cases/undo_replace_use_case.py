@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from modules.application.base.use_case import UseCase
+from modules.application.shared.results import BatchResult
+from modules.core.events.event_bus import IEventBus
+from modules.core.logging.logger import ILogger, ConsoleLogger
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
+from modules.core.tasks.cancellation_token import CancellationToken, OperationCancelledError
+from modules.domain.repositories.i_extension_repository import IExtensionRepository
+from modules.domain.services.change_journal import ChangeJournal
+
+
+class UndoReplaceUseCase(UseCase[None, BatchResult]):
+    def __init__(
+        self,
+        extension_repo: IExtensionRepository,
+        journal: ChangeJournal,
+        event_bus: IEventBus,
+        metrics: Optional[IMetricsRegistry] = None
+    ):
+        self._extension_repo = extension_repo
+        self._journal = journal
+        self._event_bus = event_bus
+        self._logger: ILogger = ConsoleLogger('UndoReplaceUseCase')
+        self._metrics = metrics or NullMetricsRegistry()
+
+    def execute(self, input_data: None = None, token: Optional[CancellationToken] = None) -> BatchResult:
+        if token is not None and token.cancelled:
+            return BatchResult(success=False, error=str(OperationCancelledError()), cancelled=True)
+        with self._metrics.time('halo_use_case_duration_seconds', use_case='undo'):
+            return self._logger.log_operation(
+                'execute',
+                lambda: self._do_execute()
+            )
+
+    def _do_execute(self) -> BatchResult:
+        entry = self._journal.pop_undo()
+        if entry is None:
+            return BatchResult(success=False, error='没有可撤销的替换操作')
+        try:
+            inverse = self._journal.replay(entry, self._extension_repo)
+            self._journal.push_redo(inverse)
+
+            self._event_bus.emit('extensions:replace-undone', {
+                'label': entry.label,
+                'updated_count': len(inverse.patches),
+                'change_count': inverse.change_count
+            })
+            return BatchResult(
+                success=True,
+                updated_count=len(inverse.patches),
+                change_count=inverse.change_count
+            )
+        except Exception as e:
+            self._journal.push_undo(entry)
+            error_message = str(e)
+            self._event_bus.emit('extensions:undo-error', {'error': error_message})
+            return BatchResult(success=False, error=error_message)
@@ -1,3 +1,10 @@
 from modules.core.di.container import DIContainer, Provider, container
-from modules.core.events.event_bus import IEventBus, SimpleEventBus, event_bus
+from modules.core.events.event_bus import IEventBus, SimpleEventBus, AsyncEventBus, event_bus
 from modules.core.logging.logger import ILogger, ConsoleLogger, setup_logging
+from modules.core.profiling.stage_profiler import StageProfiler, StageProfile
+from modules.core.metrics.metrics_registry import IMetricsRegistry, MetricsRegistry, NullMetricsRegistry, MetricsSnapshot
+from modules.core.tasks.cancellation_token import CancellationToken, OperationCancelledError
+from modules.core.tasks.progress_reporter import ProgressReporter, PROGRESS_EVENT
+from modules.core.tasks.task_control import TaskControl
+from modules.core.memory.memory_probe import MemoryProbe, memory_probe
+from modules.core.memory.memory_guard import MemoryGuard, MemoryBudgetExceededError, parse_size, format_size
@@ -1 +1 @@
-from modules.core.events.event_bus import IEventBus, SimpleEventBus, event_bus
+from modules.core.events.event_bus import IEventBus, SimpleEventBus, AsyncEventBus, event_bus
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Callable
+import inspect
+import math
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Iterable, Optional
 
 
 class IEventBus:
@@ -16,24 +22,57 @@ class IEventBus:
     def once(self, event: str, handler: Callable) -> Callable:
         raise NotImplementedError
 
+    def drain(self) -> int:
+        return 0
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        pass
+
+
+class _HandlerRef:
+    __slots__ = ('_ref', '_handler')
+
+    def __init__(self, handler: Callable, weak: bool):
+        if weak and inspect.ismethod(handler):
+            self._ref = weakref.WeakMethod(handler)
+            self._handler = None
+        else:
+            self._ref = None
+            self._handler = handler
+
+    def resolve(self) -> Optional[Callable]:
+        return self._handler if self._ref is None else self._ref()
+
 
 class SimpleEventBus(IEventBus):
     def __init__(self):
-        self._handlers: dict[str, set[Callable]] = {}
+        self._handlers: dict[str, tuple[_HandlerRef, ...]] = {}
+        self._lock = threading.Lock()
 
     def emit(self, event: str, payload: Any = None) -> None:
-        handlers = self._handlers.get(event)
-        if handlers:
-            for handler in handlers:
-                try:
-                    handler(payload)
-                except Exception as e:
-                    print(f"Error in event handler for {event}: {e}")
-
-    def on(self, event: str, handler: Callable) -> Callable:
-        if event not in self._handlers:
-            self._handlers[event] = set()
-        self._handlers[event].add(handler)
+        self._dispatch(event, payload)
+
+    def _dispatch(self, event: str, payload: Any) -> None:
+        refs = self._handlers.get(event)
+        if not refs:
+            return
+        dead = False
+        for ref in refs:
+            handler = ref.resolve()
+            if handler is None:
+                dead = True
+                continue
+            try:
+                handler(payload)
+            except Exception as e:
+                print(f"Error in event handler for {event}: {e}")
+        if dead:
+            self._prune(event)
+
+    def on(self, event: str, handler: Callable, weak: bool = True) -> Callable:
+        ref = _HandlerRef(handler, weak)
+        with self._lock:
+            self._handlers[event] = self._handlers.get(event, ()) + (ref,)
 
         def unsubscribe():
             self.off(event, handler)
@@ -41,10 +80,14 @@ class SimpleEventBus(IEventBus):
         return unsubscribe
 
     def off(self, event: str, handler: Callable) -> None:
-        handlers = self._handlers.get(event)
-        if handlers:
-            handlers.discard(handler)
-            if not handlers:
+        with self._lock:
+            refs = self._handlers.get(event)
+            if not refs:
+                return
+            remaining = tuple(ref for ref in refs if ref.resolve() not in (None, handler))
+            if remaining:
+                self._handlers[event] = remaining
+            else:
                 del self._handlers[event]
 
     def once(self, event: str, handler: Callable) -> Callable:
@@ -55,7 +98,127 @@ class SimpleEventBus(IEventBus):
         return self.on(event, once_handler)
 
     def clear(self) -> None:
-        self._handlers.clear()
+        with self._lock:
+            self._handlers.clear()
+
+    def _prune(self, event: str) -> None:
+        with self._lock:
+            refs = self._handlers.get(event)
+            if not refs:
+                return
+            remaining = tuple(ref for ref in refs if ref.resolve() is not None)
+            if remaining:
+                self._handlers[event] = remaining
+            else:
+                del self._handlers[event]
+
+
+class AsyncEventBus(SimpleEventBus):
+    def __init__(
+        self,
+        coalesce: Iterable[str] = (),
+        interval: float = 0.1,
+        threaded: bool = True,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        super().__init__()
+        self._coalesce = frozenset(coalesce)
+        self._interval = interval
+        self._clock = clock
+        self._queue: deque[tuple[str, Any]] = deque()
+        self._latest: dict[str, Any] = {}
+        self._last_dispatch: dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._busy = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name='event-bus-dispatcher', daemon=True)
+            self._thread.start()
+
+    def emit(self, event: str, payload: Any = None) -> None:
+        if event not in self._handlers:
+            return
+        if event in self._coalesce and event in self._latest:
+            self._latest[event] = payload
+            return
+        with self._cond:
+            if event in self._coalesce:
+                self._latest[event] = payload
+            else:
+                self._queue.append((event, payload))
+            self._cond.notify()
+
+    def drain(self) -> int:
+        return self._drain(force=False)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is None:
+            self._drain(force=True)
+            return True
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            while self._queue or self._latest or self._busy:
+                remaining = None if deadline is None else deadline - self._clock()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        else:
+            self._drain(force=True)
+
+    def _drain(self, force: bool) -> int:
+        with self._cond:
+            events = list(self._queue)
+            self._queue.clear()
+            now = self._clock()
+            for event in list(self._latest):
+                if force or now - self._last_dispatch.get(event, -math.inf) >= self._interval:
+                    events.append((event, self._latest.pop(event)))
+                    self._last_dispatch[event] = now
+            self._busy += 1
+        try:
+            for event, payload in events:
+                self._dispatch(event, payload)
+        finally:
+            with self._cond:
+                self._busy -= 1
+                self._cond.notify_all()
+        return len(events)
+
+    def _pending_delay(self) -> Optional[float]:
+        if self._queue or (self._closed and self._latest):
+            return 0.0
+        if not self._latest:
+            return None
+        now = self._clock()
+        return max(0.0, min(
+            self._last_dispatch.get(event, -math.inf) + self._interval - now for event in self._latest
+        ))
+
+    def _run(self) -> None:
+        with self._cond:
+            while True:
+                delay = self._pending_delay()
+                if delay is None:
+                    if self._closed:
+                        return
+                    self._cond.wait(self._interval if self._coalesce else None)
+                elif delay > 0:
+                    self._cond.wait(delay)
+                else:
+                    self._cond.release()
+                    try:
+                        self._drain(force=self._closed)
+                    finally:
+                        self._cond.acquire()
 
 
 event_bus = SimpleEventBus()
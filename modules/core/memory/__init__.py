@@ -0,0 +1,2 @@
+from modules.core.memory.memory_probe import MemoryProbe, memory_probe
+from modules.core.memory.memory_guard import MemoryGuard, MemoryBudgetExceededError, parse_size, format_size
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from modules.core.memory.memory_probe import MemoryProbe, memory_probe
+
+_SIZE_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+_SIZE_PATTERN = re.compile(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*', re.IGNORECASE)
+
+
+def parse_size(text: str) -> int:
+    match = _SIZE_PATTERN.fullmatch(text)
+    if not match:
+        raise ValueError(f'Invalid size: {text!r}')
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size: int) -> str:
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if abs(size) < 1024 or unit == 'GiB':
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} TiB'
+
+
+class MemoryBudgetExceededError(Exception):
+    def __init__(self, used: int, budget: int, estimated: bool = False):
+        prefix = '预计内存占用超出预算' if estimated else '内存占用超出预算'
+        super().__init__(f'{prefix}: {format_size(used)} > {format_size(budget)}')
+        self.used = used
+        self.budget = budget
+
+
+class MemoryGuard:
+    def __init__(self, budget: int, probe: Optional[MemoryProbe] = None):
+        self._budget = budget
+        self._probe = probe or memory_probe
+        self._baseline = self._probe.sample()
+        self._peak = 0
+
+    @property
+    def budget(self) -> int:
+        return self._budget
+
+    @property
+    def peak(self) -> int:
+        return self._peak
+
+    @property
+    def active(self) -> bool:
+        return self._baseline is not None
+
+    def check(self) -> None:
+        if self._baseline is None:
+            return
+        sample = self._probe.sample()
+        if sample is None:
+            return
+        used = sample - self._baseline
+        if used > self._peak:
+            self._peak = used
+        if used > self._budget:
+            raise MemoryBudgetExceededError(used, self._budget)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+import sys
+import tracemalloc
+from typing import Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class MemoryProbe:
+    def available(self) -> Optional[int]:
+        if psutil is not None:
+            return psutil.virtual_memory().available
+        if sys.platform == 'win32':
+            return _windows_available()
+        return _proc_meminfo_available()
+
+    def rss(self) -> Optional[int]:
+        if psutil is not None:
+            return psutil.Process().memory_info().rss
+        if sys.platform == 'win32':
+            return _windows_rss()
+        return _proc_statm_rss()
+
+    def sample(self) -> Optional[int]:
+        rss = self.rss()
+        if rss is not None:
+            return rss
+        if tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return None
+
+
+def _proc_meminfo_available() -> Optional[int]:
+    try:
+        with open('/proc/meminfo', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def _proc_statm_rss() -> Optional[int]:
+    try:
+        with open('/proc/self/statm', 'r', encoding='ascii') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _windows_available() -> Optional[int]:
+    import ctypes
+
+    class MemoryStatusEx(ctypes.Structure):
+        _fields_ = [
+            ('dwLength', ctypes.c_ulong),
+            ('dwMemoryLoad', ctypes.c_ulong),
+            ('ullTotalPhys', ctypes.c_ulonglong),
+            ('ullAvailPhys', ctypes.c_ulonglong),
+            ('ullTotalPageFile', ctypes.c_ulonglong),
+            ('ullAvailPageFile', ctypes.c_ulonglong),
+            ('ullTotalVirtual', ctypes.c_ulonglong),
+            ('ullAvailVirtual', ctypes.c_ulonglong),
+            ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+        ]
+
+    global_memory_status = ctypes.windll.kernel32.GlobalMemoryStatusEx
+    global_memory_status.restype = ctypes.c_int
+    global_memory_status.argtypes = [ctypes.POINTER(MemoryStatusEx)]
+
+    status = MemoryStatusEx()
+    status.dwLength = ctypes.sizeof(MemoryStatusEx)
+    if not global_memory_status(ctypes.byref(status)):
+        return None
+    return status.ullAvailPhys
+
+
+def _windows_rss() -> Optional[int]:
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+    get_current_process.restype = wintypes.HANDLE
+    get_current_process.argtypes = []
+    get_process_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+    get_process_memory_info.restype = wintypes.BOOL
+    get_process_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(ProcessMemoryCounters)
+    if not get_process_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize
+
+
+memory_probe = MemoryProbe()
@@ -0,0 +1,3 @@
+from modules.core.metrics.metrics_registry import (
+    IMetricsRegistry, MetricsRegistry, NullMetricsRegistry, MetricsSnapshot, HistogramSnapshot
+)
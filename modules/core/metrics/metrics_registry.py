@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+_collectors: ContextVar[tuple[tuple[IMetricsRegistry, IMetricsRegistry], ...]] = ContextVar(
+    'halo_metrics_collectors', default=()
+)
+
+
+@dataclass
+class HistogramSnapshot:
+    buckets: tuple[float, ...]
+    counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class MetricsSnapshot:
+    counters: dict[tuple[str, Labels], float] = field(default_factory=dict)
+    histograms: dict[tuple[str, Labels], HistogramSnapshot] = field(default_factory=dict)
+
+    def counter(self, name: str, **labels: str) -> float:
+        return self.counters.get((name, _label_key(labels)), 0)
+
+    def merge(self, other: MetricsSnapshot) -> MetricsSnapshot:
+        counters = dict(self.counters)
+        for key, value in other.counters.items():
+            counters[key] = counters.get(key, 0) + value
+        histograms = {key: _copy_histogram(hist) for key, hist in self.histograms.items()}
+        for key, hist in other.histograms.items():
+            merged = histograms.get(key)
+            if merged is None:
+                histograms[key] = _copy_histogram(hist)
+                continue
+            merged.counts = [a + b for a, b in zip(merged.counts, hist.counts)]
+            merged.sum += hist.sum
+            merged.count += hist.count
+        return MetricsSnapshot(counters, histograms)
+
+    def to_dict(self) -> dict:
+        counters = [
+            {'name': name, 'labels': dict(labels), 'value': value}
+            for (name, labels), value in sorted(self.counters.items())
+        ]
+        histograms = [
+            {
+                'name': name,
+                'labels': dict(labels),
+                'count': hist.count,
+                'sum': hist.sum,
+                'buckets': dict(zip(map(_format_bound, hist.buckets), _cumulative(hist.counts))),
+            }
+            for (name, labels), hist in sorted(self.histograms.items())
+        ]
+        return {'counters': counters, 'histograms': histograms}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = []
+        declared: set[str] = set()
+        for (name, labels), value in sorted(self.counters.items()):
+            if name not in declared:
+                lines.append(f'# TYPE {name} counter')
+                declared.add(name)
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        for (name, labels), hist in sorted(self.histograms.items()):
+            if name not in declared:
+                lines.append(f'# TYPE {name} histogram')
+                declared.add(name)
+            for bound, cumulative in zip(hist.buckets, _cumulative(hist.counts)):
+                bucket_labels = labels + (('le', _format_bound(bound)),)
+                lines.append(f'{name}_bucket{_format_labels(bucket_labels)} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(hist.sum)}')
+            lines.append(f'{name}_count{_format_labels(labels)} {hist.count}')
+        return '\n'.join(lines) + '\n'
+
+
+class IMetricsRegistry(ABC):
+    @abstractmethod
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        pass
+
+    @abstractmethod
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        pass
+
+    @abstractmethod
+    def snapshot(self) -> MetricsSnapshot:
+        pass
+
+    @abstractmethod
+    def reset(self) -> None:
+        pass
+
+    @contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def collect(self) -> Iterator[IMetricsRegistry]:
+        collector = self._new_collector()
+        reset = _collectors.set(_collectors.get() + ((self, collector),))
+        try:
+            yield collector
+        finally:
+            _collectors.reset(reset)
+
+    def _new_collector(self) -> IMetricsRegistry:
+        return NullMetricsRegistry()
+
+
+class MetricsRegistry(IMetricsRegistry):
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], HistogramSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        for owner, collector in _collectors.get():
+            if owner is self:
+                collector.increment(name, value, **labels)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = HistogramSnapshot(self._buckets, [0] * len(self._buckets))
+                self._histograms[key] = hist
+            for i, bound in enumerate(self._buckets):
+                if value <= bound:
+                    hist.counts[i] += 1
+                    break
+            hist.sum += value
+            hist.count += 1
+        for owner, collector in _collectors.get():
+            if owner is self:
+                collector.observe(name, value, **labels)
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            return MetricsSnapshot(
+                counters=dict(self._counters),
+                histograms={
+                    key: HistogramSnapshot(hist.buckets, list(hist.counts), hist.sum, hist.count)
+                    for key, hist in self._histograms.items()
+                },
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _new_collector(self) -> IMetricsRegistry:
+        return MetricsRegistry(self._buckets)
+
+
+class NullMetricsRegistry(IMetricsRegistry):
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        pass
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        pass
+
+    def snapshot(self) -> MetricsSnapshot:
+        return MetricsSnapshot()
+
+    def reset(self) -> None:
+        pass
+
+
+def _copy_histogram(hist: HistogramSnapshot) -> HistogramSnapshot:
+    return HistogramSnapshot(hist.buckets, list(hist.counts), hist.sum, hist.count)
+
+
+def _cumulative(counts: list[int]) -> list[int]:
+    total = 0
+    result = []
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+def _label_key(labels: dict[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label_value(value)}"' for key, value in labels) + '}'
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if math.isinf(bound) else repr(bound)
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
@@ -0,0 +1 @@
+from modules.core.profiling.stage_profiler import StageProfiler, StageProfile
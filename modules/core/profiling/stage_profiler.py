@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+_IGNORED_TRACE_FILES = (tracemalloc.__file__, cProfile.__file__, '<frozen importlib._bootstrap>')
+
+
+@dataclass
+class StageProfile:
+    stage: str
+    seconds: float
+    peak_bytes: int
+    pstats_path: str
+    allocations_path: str
+    top_functions: list[str] = field(default_factory=list)
+    top_allocations: list[str] = field(default_factory=list)
+
+
+class StageProfiler:
+    SUMMARY_FILENAME = 'summary.txt'
+
+    def __init__(self, output_dir: str, top_count: int = 25):
+        self._output_dir = output_dir
+        self._top_count = top_count
+        self._profiles: list[StageProfile] = []
+        self._stage_runs: dict[str, int] = {}
+        self._lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    @property
+    def profiles(self) -> list[StageProfile]:
+        return list(self._profiles)
+
+    def run(self, stage: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            file_stem = self._next_file_stem(stage)
+            return self._run_profiled(stage, file_stem, fn)
+
+    def _run_profiled(self, stage: str, file_stem: str, fn: Callable[[], T]) -> T:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(10)
+        tracemalloc.reset_peak()
+        base_bytes, _ = tracemalloc.get_traced_memory()
+        before = tracemalloc.take_snapshot()
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            return profiler.runcall(fn)
+        finally:
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            self._record(stage, file_stem, seconds, peak - base_bytes, profiler, before, after)
+
+    def _record(
+        self,
+        stage: str,
+        file_stem: str,
+        seconds: float,
+        peak_bytes: int,
+        profiler: cProfile.Profile,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot
+    ) -> None:
+        pstats_path = os.path.join(self._output_dir, f'{file_stem}.pstats')
+        profiler.dump_stats(pstats_path)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(10)
+        top_functions = [line for line in stream.getvalue().splitlines() if line.strip()][-10:]
+
+        filters = [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_TRACE_FILES]
+        diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+        top_allocations = [str(stat) for stat in diff[:self._top_count]]
+
+        allocations_path = os.path.join(self._output_dir, f'{file_stem}.alloc.txt')
+        with open(allocations_path, 'w', encoding='utf-8') as f:
+            f.write(f'stage: {stage}\n')
+            f.write(f'peak: {self._format_bytes(peak_bytes)}\n\n')
+            f.write('\n'.join(top_allocations))
+            f.write('\n')
+
+        self._profiles.append(StageProfile(
+            stage=stage,
+            seconds=seconds,
+            peak_bytes=peak_bytes,
+            pstats_path=pstats_path,
+            allocations_path=allocations_path,
+            top_functions=top_functions,
+            top_allocations=top_allocations[:5],
+        ))
+        self.write_summary()
+
+    def write_summary(self) -> str:
+        lines = ['Halo 批量替换 - 性能剖析摘要', '=' * 40, '']
+        lines.append(f'{"阶段":<20}{"耗时(s)":>12}{"峰值内存":>14}')
+        for profile in self._profiles:
+            lines.append(f'{profile.stage:<20}{profile.seconds:>12.3f}{self._format_bytes(profile.peak_bytes):>14}')
+
+        for profile in self._profiles:
+            lines.extend(['', f'[{profile.stage}] {os.path.basename(profile.pstats_path)}', '  累计耗时最高的函数:'])
+            lines.extend(f'    {line.strip()}' for line in profile.top_functions)
+            lines.append('  新增内存最多的分配点:')
+            lines.extend(f'    {line}' for line in profile.top_allocations)
+
+        summary_path = os.path.join(self._output_dir, self.SUMMARY_FILENAME)
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines))
+            f.write('\n')
+        return summary_path
+
+    def _next_file_stem(self, stage: str) -> str:
+        run = self._stage_runs.get(stage, 0) + 1
+        self._stage_runs[stage] = run
+        return stage if run == 1 else f'{stage}.{run}'
+
+    def _format_bytes(self, size: int) -> str:
+        return f'{size / 1024 / 1024:.2f} MiB'
@@ -0,0 +1,3 @@
+from modules.core.tasks.cancellation_token import CancellationToken, OperationCancelledError
+from modules.core.tasks.progress_reporter import ProgressReporter, PROGRESS_EVENT
+from modules.core.tasks.task_control import TaskControl
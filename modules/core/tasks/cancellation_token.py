@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import threading
+
+
+class OperationCancelledError(Exception):
+    def __init__(self, message: str = '操作已取消'):
+        super().__init__(message)
+
+
+class CancellationToken:
+    __slots__ = ('_event',)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelledError()
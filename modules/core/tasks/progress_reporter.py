@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+from modules.core.events.event_bus import IEventBus
+
+PROGRESS_EVENT = 'task:progress'
+
+
+class ProgressReporter:
+    def __init__(
+        self,
+        event_bus: IEventBus,
+        operation: str,
+        min_interval: float = 0.1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._event_bus = event_bus
+        self._operation = operation
+        self._min_interval = min_interval
+        self._clock = clock
+        self._last_emit: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def report(self, stage: str, items_done: int, items_total: Optional[int], nbytes: int, final: bool = False) -> bool:
+        now = self._clock()
+        with self._lock:
+            if not final and self._last_emit is not None and now - self._last_emit < self._min_interval:
+                return False
+            self._last_emit = now
+        self._event_bus.emit(PROGRESS_EVENT, {
+            'operation': self._operation,
+            'stage': stage,
+            'items_done': items_done,
+            'items_total': items_total,
+            'bytes': nbytes,
+            'final': final
+        })
+        return True
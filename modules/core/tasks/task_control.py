@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+from modules.core.events.event_bus import IEventBus
+from modules.core.memory.memory_guard import MemoryGuard
+from modules.core.tasks.cancellation_token import CancellationToken
+from modules.core.tasks.progress_reporter import ProgressReporter
+
+T = TypeVar('T')
+
+
+class TaskControl:
+    CHUNK_SIZE = 100
+
+    def __init__(
+        self,
+        event_bus: IEventBus,
+        operation: str,
+        token: Optional[CancellationToken] = None,
+        min_interval: float = 0.1,
+        guard: Optional[MemoryGuard] = None
+    ):
+        self._token = token or CancellationToken()
+        self._progress = ProgressReporter(event_bus, operation, min_interval)
+        self.guard = guard
+
+    @property
+    def token(self) -> CancellationToken:
+        return self._token
+
+    def raise_if_cancelled(self) -> None:
+        self._token.raise_if_cancelled()
+
+    def track(
+        self,
+        items: Iterable[T],
+        stage: str,
+        total: Optional[int] = None,
+        size: Optional[Callable[[T], int]] = None,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[T]:
+        self._token.raise_if_cancelled()
+        self._progress.report(stage, 0, total, 0)
+        done = 0
+        nbytes = 0
+        for item in items:
+            yield item
+            done += 1
+            if size is not None:
+                nbytes += size(item)
+            if done % chunk_size == 0:
+                self._token.raise_if_cancelled()
+                if self.guard is not None:
+                    self.guard.check()
+                self._progress.report(stage, done, total, nbytes)
+        self._progress.report(stage, done, total, nbytes, final=True)
@@ -1,4 +1,4 @@
 from modules.domain.entities import Extension, ExtensionItem, ExtensionData, Metadata
-from modules.domain.repositories import IExtensionRepository, IStorageRepository, SearchResult
-from modules.domain.services import ExtensionSearchService
-from modules.domain.value_objects import Pagination, SearchQuery, FilterCriteria
+from modules.domain.repositories import IExtensionRepository, IStorageRepository, SearchResult, CursorPage
+from modules.domain.services import ExtensionSearchService, ChangeJournal, JournalEntry, ExtensionPatch, FieldPatch
+from modules.domain.value_objects import Pagination, SearchQuery, FilterCriteria, SearchTerm, LabelSelector, LabelRequirement, TimeRange, RawDataRef
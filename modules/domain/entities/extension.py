@@ -1,29 +1,33 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional, Union
 
 from modules.domain.entities.extension_data import ExtensionData
+from modules.domain.value_objects.raw_data_ref import RawDataRef
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtensionItem:
     name: str
     data: str
     version: int
+    offset: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Extension:
     name: str
     version: int
     data: ExtensionData
-    raw_data: str
+    raw_data: Union[str, RawDataRef]
+    modified: bool = False
 
     def update_data(self, new_data: ExtensionData) -> 'Extension':
-        return Extension(self.name, self.version, new_data, self.raw_data)
+        return Extension(self.name, self.version, new_data, self.raw_data, True)
 
-    def update_all(self, name: str, version: int, new_data: ExtensionData) -> 'Extension':
-        return Extension(name, version, new_data, self.raw_data)
+    def update_all(self, name: str, version: int, new_data: ExtensionData, modified: bool = True) -> 'Extension':
+        return Extension(name, version, new_data, self.raw_data, modified)
 
     def get_kind(self) -> str:
         return self.data.kind or 'Unknown'
@@ -1,29 +1,163 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Any, Optional
 
+DATA_FIELDS = {
+    'apiVersion': 'api_version',
+    'kind': 'kind',
+    'metadata': 'metadata',
+    'spec': 'spec',
+    'data': 'data',
+}
+METADATA_FIELDS = {
+    'name': 'name',
+    'annotations': 'annotations',
+    'labels': 'labels',
+    'resourceVersion': 'resource_version',
+    'creationTimestamp': 'creation_timestamp',
+    'version': 'version',
+}
+_DATA_KEYS = {attr: key for key, attr in DATA_FIELDS.items()}
+_METADATA_KEYS = {attr: key for key, attr in METADATA_FIELDS.items()}
+
+
+class _DocumentField:
+    __slots__ = ('key',)
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+        return instance._document.get(self.key)
+
+
+def _build_document(keys: dict[str, str], values: dict[str, Any]) -> dict:
+    return {keys[attr]: value for attr, value in values.items() if value is not None}
+
+
+def _with_values(document: dict, keys: dict[str, str], changes: dict[str, Any]) -> dict:
+    updated = dict(document)
+    for attr, value in changes.items():
+        key = keys.get(attr)
+        if key is None:
+            raise TypeError(f'Unknown field: {attr!r}')
+        if value is None:
+            updated.pop(key, None)
+        else:
+            updated[key] = value
+    return updated
+
 
-@dataclass
 class Metadata:
-    name: Optional[str] = None
-    annotations: Optional[dict[str, str]] = None
-    labels: Optional[dict[str, str]] = None
-    resource_version: Optional[int] = None
-    creation_timestamp: Optional[str] = None
-    version: Optional[int] = None
+    __slots__ = ('_document',)
+
+    name: Optional[str] = _DocumentField('name')
+    annotations: Optional[dict[str, str]] = _DocumentField('annotations')
+    labels: Optional[dict[str, str]] = _DocumentField('labels')
+    resource_version: Optional[int] = _DocumentField('resourceVersion')
+    creation_timestamp: Optional[str] = _DocumentField('creationTimestamp')
+    version: Optional[int] = _DocumentField('version')
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        annotations: Optional[dict[str, str]] = None,
+        labels: Optional[dict[str, str]] = None,
+        resource_version: Optional[int] = None,
+        creation_timestamp: Optional[str] = None,
+        version: Optional[int] = None
+    ):
+        self._document = _build_document(_METADATA_KEYS, {
+            'name': name,
+            'annotations': annotations,
+            'labels': labels,
+            'resource_version': resource_version,
+            'creation_timestamp': creation_timestamp,
+            'version': version,
+        })
+
+    @classmethod
+    def from_document(cls, document: dict) -> 'Metadata':
+        metadata = cls.__new__(cls)
+        metadata._document = document
+        return metadata
+
+    @property
+    def document(self) -> dict:
+        return self._document
+
+    def with_fields(self, **changes: Any) -> 'Metadata':
+        return Metadata.from_document(_with_values(self._document, _METADATA_KEYS, changes))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Metadata):
+            return NotImplemented
+        return self._document == other._document
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'Metadata({self._document!r})'
 
 
-@dataclass
 class ExtensionData:
-    api_version: Optional[str] = None
-    kind: Optional[str] = None
-    metadata: Optional[Metadata] = None
-    spec: Optional[dict[str, Any]] = None
-    data: Optional[dict[str, str]] = None
+    __slots__ = ('_document', '_metadata')
+
+    api_version: Optional[str] = _DocumentField('apiVersion')
+    kind: Optional[str] = _DocumentField('kind')
+    spec: Optional[dict[str, Any]] = _DocumentField('spec')
+    data: Optional[dict[str, str]] = _DocumentField('data')
+
+    def __init__(
+        self,
+        api_version: Optional[str] = None,
+        kind: Optional[str] = None,
+        metadata: Optional[Metadata] = None,
+        spec: Optional[dict[str, Any]] = None,
+        data: Optional[dict[str, str]] = None
+    ):
+        self._document = _build_document(_DATA_KEYS, {
+            'api_version': api_version,
+            'kind': kind,
+            'metadata': metadata.document if metadata is not None else None,
+            'spec': spec,
+            'data': data,
+        })
+        self._metadata = metadata
+
+    @classmethod
+    def from_document(cls, document: dict) -> 'ExtensionData':
+        data = cls.__new__(cls)
+        data._document = document
+        metadata = document.get('metadata')
+        data._metadata = Metadata.from_document(metadata) if isinstance(metadata, dict) and metadata else None
+        return data
+
+    @property
+    def document(self) -> dict:
+        return self._document
+
+    @property
+    def metadata(self) -> Optional[Metadata]:
+        return self._metadata
+
+    def with_fields(self, **changes: Any) -> 'ExtensionData':
+        metadata = changes.get('metadata')
+        if isinstance(metadata, Metadata):
+            changes['metadata'] = metadata.document
+        return ExtensionData.from_document(_with_values(self._document, _DATA_KEYS, changes))
 
     def __getitem__(self, key: str) -> Any:
         return getattr(self, key, None)
 
-    def __setitem__(self, key: str, value: Any) -> None:
-        setattr(self, key, value)
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ExtensionData):
+            return NotImplemented
+        return self._document == other._document
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'ExtensionData({self._document!r})'
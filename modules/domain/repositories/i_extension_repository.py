@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from modules.domain.entities.extension import Extension
+from modules.domain.value_objects.label_selector import LabelSelector
 from modules.domain.value_objects.search_query import SearchQuery
+from modules.domain.value_objects.time_range import TimeRange
 from modules.domain.value_objects.pagination import Pagination
 
 
@@ -14,6 +17,14 @@ class SearchResult:
     items: list[Extension]
     total: int
     pagination: Pagination
+    total_is_exact: bool = True
+
+
+@dataclass
+class CursorPage:
+    items: list[Extension]
+    next_cursor: Optional[str]
+    total: int
 
 
 class IExtensionRepository(ABC):
@@ -26,7 +37,7 @@ class IExtensionRepository(ABC):
         pass
 
     @abstractmethod
-    def find_by_query(self, query: SearchQuery, pagination: Pagination) -> SearchResult:
+    def find_by_query(self, query: SearchQuery, pagination: Pagination, exact_total: bool = False) -> SearchResult:
         pass
 
     @abstractmethod
@@ -52,3 +63,32 @@ class IExtensionRepository(ABC):
     @abstractmethod
     def mark_as_saved(self) -> None:
         pass
+
+    def iter_all(self) -> Iterator[Extension]:
+        return iter(self.find_all())
+
+    def is_disk_backed(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        pass
+
+    def find_candidates(self, literal_plans: Iterable[list]) -> Optional[Iterable[Extension]]:
+        return None
+
+    def find_in_scope(
+        self,
+        kinds: Optional[list[str]] = None,
+        label_selector: Optional[LabelSelector] = None,
+        created: Optional[TimeRange] = None
+    ) -> Optional[Iterable[Extension]]:
+        return None
+
+    def find_page_after(self, query: SearchQuery, cursor: Optional[str], limit: int) -> CursorPage:
+        total = self.count(query)
+        items = sorted(
+            self.find_by_query(query, Pagination(1, max(total, 1), 0), exact_total=True).items, key=lambda ext: ext.name
+        )
+        start = 0 if cursor is None else bisect_right([ext.name for ext in items], cursor)
+        page = items[start:start + limit]
+        return CursorPage(page, page[-1].name if start + limit < len(items) else None, total)
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
 
 from modules.domain.entities.extension import ExtensionItem
+from modules.domain.value_objects.raw_data_ref import RawDataRef
 
 
 class IStorageRepository(ABC):
     @abstractmethod
-    def load(self, filepath: str) -> list[ExtensionItem]:
+    def load(self, filepath: str, with_offsets: bool = False) -> list[ExtensionItem]:
         pass
 
     @abstractmethod
-    def save(self, data: list[ExtensionItem], filepath: str) -> None:
+    def save(self, data: Iterable[ExtensionItem], filepath: str) -> None:
+        pass
+
+    def iter_load(self, filepath: str, with_offsets: bool = False) -> Iterator[ExtensionItem]:
+        return iter(self.load(filepath, with_offsets=with_offsets))
+
+    @abstractmethod
+    def read_raw(self, ref: RawDataRef) -> str:
         pass
@@ -1,2 +1,3 @@
 from modules.domain.entities.extension import Extension, ExtensionItem
 from modules.domain.services.extension_search_service import ExtensionSearchService
+from modules.domain.services.change_journal import ChangeJournal, JournalEntry, ExtensionPatch, FieldPatch
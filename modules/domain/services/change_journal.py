@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from modules.domain.entities.extension import Extension
+from modules.domain.entities.extension_data import DATA_FIELDS, METADATA_FIELDS, ExtensionData, Metadata
+from modules.domain.repositories.i_extension_repository import IExtensionRepository
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+_PATCH_OVERHEAD = 64
+
+
+@dataclass
+class FieldPatch:
+    path: tuple
+    value: Any
+
+
+@dataclass
+class ExtensionPatch:
+    name: str
+    restore_name: str
+    fields: list[FieldPatch]
+    modified: bool = True
+
+
+@dataclass
+class JournalEntry:
+    label: str
+    patches: list[ExtensionPatch]
+    size: int = field(default=0, compare=False)
+
+    @property
+    def change_count(self) -> int:
+        return sum(len(patch.fields) for patch in self.patches)
+
+
+class ChangeJournal:
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._undo: deque[JournalEntry] = deque()
+        self._redo: deque[JournalEntry] = deque()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo_count(self) -> int:
+        return len(self._undo)
+
+    def redo_count(self) -> int:
+        return len(self._redo)
+
+    def record(self, entry: JournalEntry) -> None:
+        if not entry.patches:
+            return
+        self._size -= sum(e.size for e in self._redo)
+        self._redo.clear()
+        self._push(self._undo, entry)
+
+    def pop_undo(self) -> Optional[JournalEntry]:
+        return self._pop(self._undo)
+
+    def pop_redo(self) -> Optional[JournalEntry]:
+        return self._pop(self._redo)
+
+    def push_undo(self, entry: JournalEntry) -> None:
+        self._push(self._undo, entry)
+
+    def push_redo(self, entry: JournalEntry) -> None:
+        self._push(self._redo, entry)
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+
+    def replay(self, entry: JournalEntry, extension_repo: IExtensionRepository) -> JournalEntry:
+        updated: list[Extension] = []
+        inverse: list[ExtensionPatch] = []
+        for patch in entry.patches:
+            extension = extension_repo.find_by_name(patch.name)
+            if extension is None:
+                continue
+            data = extension.data
+            restore_fields = []
+            for field_patch in patch.fields:
+                restore_fields.append(FieldPatch(field_patch.path, get_field(data, field_patch.path)))
+                data = set_field(data, field_patch.path, field_patch.value)
+            restore_fields.reverse()
+            updated.append(extension.update_all(patch.restore_name, extension.version, data, patch.modified))
+            inverse.append(ExtensionPatch(patch.restore_name, patch.name, restore_fields, extension.modified))
+        if updated:
+            extension_repo.save(updated)
+        return JournalEntry(entry.label, inverse)
+
+    @staticmethod
+    def diff(original: Extension, updated: Extension) -> Optional[ExtensionPatch]:
+        fields = diff_extension_data(updated.data, original.data)
+        if not fields and original.name == updated.name:
+            return None
+        return ExtensionPatch(updated.name, original.name, fields, original.modified)
+
+    def _push(self, stack: deque[JournalEntry], entry: JournalEntry) -> None:
+        entry.size = entry.size or self._estimate_entry(entry)
+        stack.append(entry)
+        self._size += entry.size
+        while self._size > self._max_bytes and (self._undo or self._redo):
+            self._size -= (self._undo or self._redo).popleft().size
+
+    def _pop(self, stack: deque[JournalEntry]) -> Optional[JournalEntry]:
+        if not stack:
+            return None
+        entry = stack.pop()
+        self._size -= entry.size
+        return entry
+
+    def _estimate_entry(self, entry: JournalEntry) -> int:
+        size = 0
+        for patch in entry.patches:
+            size += _PATCH_OVERHEAD + sys.getsizeof(patch.name) + sys.getsizeof(patch.restore_name)
+            for field_patch in patch.fields:
+                size += _PATCH_OVERHEAD + _estimate_value(field_patch.path) + _estimate_value(field_patch.value)
+        return size
+
+
+def diff_extension_data(current: ExtensionData, target: ExtensionData) -> list[FieldPatch]:
+    if list(current.document) != list(target.document):
+        return [FieldPatch((), target.document)]
+    patches: list[FieldPatch] = []
+    for key, attr in DATA_FIELDS.items():
+        current_value, target_value = getattr(current, attr), getattr(target, attr)
+        if key == 'metadata' and isinstance(current_value, Metadata) and isinstance(target_value, Metadata):
+            if list(current_value.document) != list(target_value.document):
+                patches.append(FieldPatch((key,), target_value))
+                continue
+            for meta_key, meta_attr in METADATA_FIELDS.items():
+                _diff(getattr(current_value, meta_attr), getattr(target_value, meta_attr), (key, meta_key), patches)
+        else:
+            _diff(current_value, target_value, (key,), patches)
+    return patches
+
+
+def get_field(data: ExtensionData, path: tuple) -> Any:
+    if not path:
+        return data.document
+    value = getattr(data, DATA_FIELDS[path[0]])
+    rest = path[1:]
+    if path[0] == 'metadata' and rest:
+        if value is None:
+            return MISSING
+        value, rest = getattr(value, METADATA_FIELDS[rest[0]]), rest[1:]
+    for part in rest:
+        if isinstance(value, dict):
+            value = value.get(part, MISSING)
+        elif isinstance(value, list) and isinstance(part, int) and part < len(value):
+            value = value[part]
+        else:
+            return MISSING
+    return value
+
+
+def set_field(data: ExtensionData, path: tuple, value: Any) -> ExtensionData:
+    if not path:
+        return ExtensionData.from_document(value)
+    attr = DATA_FIELDS[path[0]]
+    if path[0] == 'metadata' and len(path) > 1:
+        metadata = data.metadata or Metadata()
+        meta_attr = METADATA_FIELDS[path[1]]
+        new_metadata = metadata.with_fields(**{meta_attr: _assoc(getattr(metadata, meta_attr), path[2:], value)})
+        return data.with_fields(metadata=new_metadata)
+    return data.with_fields(**{attr: _assoc(getattr(data, attr), path[1:], value)})
+
+
+def _diff(current: Any, target: Any, path: tuple, patches: list[FieldPatch]) -> None:
+    if current is target:
+        return
+    if isinstance(current, dict) and isinstance(target, dict):
+        if list(current) != list(target):
+            patches.append(FieldPatch(path, target))
+            return
+        for key, value in current.items():
+            _diff(value, target[key], path + (key,), patches)
+    elif isinstance(current, list) and isinstance(target, list) and len(current) == len(target):
+        for i, (current_item, target_item) in enumerate(zip(current, target)):
+            _diff(current_item, target_item, path + (i,), patches)
+    elif current != target:
+        patches.append(FieldPatch(path, target))
+
+
+def _assoc(container: Any, path: tuple, value: Any) -> Any:
+    if not path:
+        return None if value is MISSING else value
+    key, rest = path[0], path[1:]
+    if isinstance(container, list):
+        copy = list(container)
+        copy[key] = _assoc(copy[key], rest, value)
+        return copy
+    copy = dict(container or {})
+    if rest:
+        copy[key] = _assoc(copy.get(key), rest, value)
+    elif value is MISSING:
+        copy.pop(key, None)
+    else:
+        copy[key] = value
+    return copy
+
+
+def _estimate_value(value: Any) -> int:
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_value(k) + _estimate_value(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_estimate_value(item) for item in value)
+    return sys.getsizeof(value)
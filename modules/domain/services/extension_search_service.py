@@ -1,74 +1,206 @@
 from __future__ import annotations
 
+import re
+from threading import Lock
+from typing import Callable, Iterator, Optional
+
 from modules.domain.entities.extension import Extension
 from modules.domain.value_objects.search_query import SearchQuery
+from modules.domain.value_objects.search_term import SEARCH_FIELDS, SearchTerm
+
+FieldText = tuple[str, str, bool]
+
+
+class _CompiledTerm:
+    __slots__ = ('field', 'prefix', 'section', 'needle', 'pattern')
+
+    def __init__(self, term: SearchTerm):
+        self.field = term.field
+        self.prefix = term.field + '.' if term.field is not None else None
+        self.section = term.section
+        self.needle = None if term.regex else term.value.lower()
+        self.pattern = re.compile(term.value, re.IGNORECASE) if term.regex else None
+
+    def applies_to(self, path: str, is_key: bool) -> bool:
+        if self.field is None:
+            return True
+        return not is_key and (path == self.field or path.startswith(self.prefix))
+
+    def test(self, text: str, lowered: str) -> bool:
+        if self.pattern is not None:
+            return self.pattern.search(text) is not None
+        return self.needle in lowered
 
 
 class ExtensionSearchService:
     MAX_SEARCH_DEPTH = 5
+    FIELD_SEPARATOR = '\x00'
+
+    def __init__(self, max_depth: Optional[int] = MAX_SEARCH_DEPTH, cache_texts: bool = True):
+        self._max_depth = max_depth
+        self._cache_texts = cache_texts
+        self._texts: dict[str, tuple[Extension, str]] = {}
+        self._lock = Lock()
+        self._sections: dict[str, Callable[[Extension], Iterator[FieldText]]] = {
+            'name': self._iter_name,
+            'kind': self._iter_kind,
+            'apiVersion': self._iter_api_version,
+            'metadata': self._iter_metadata,
+            'data': self._iter_data,
+            'spec': self._iter_spec,
+        }
 
     def matches(self, extension: Extension, query: SearchQuery) -> bool:
-        if query.is_empty():
+        if not query.has_text_criteria():
             return True
-        if query.has_keywords():
-            return all(
-                self._matches_keyword(extension, kw.lower().strip())
-                for kw in query.keywords
-            )
-        return True
-
-    def _matches_keyword(self, extension: Extension, keyword: str) -> bool:
-        if not keyword:
-            return True
-        return self._matches_in_extension(extension, keyword)
+        return self.matcher(query)(extension)
 
-    def _matches_in_extension(self, extension: Extension, query: str) -> bool:
-        if query in extension.name.lower():
-            return True
+    def filter(self, extensions: list[Extension], query: SearchQuery) -> list[Extension]:
+        if not query.has_text_criteria():
+            return list(extensions)
+        predicate = self.matcher(query)
+        return [ext for ext in extensions if predicate(ext)]
 
-        data = extension.data
-        if data.kind and query in data.kind.lower():
-            return True
-        if data.api_version and query in data.api_version.lower():
-            return True
-        if data.metadata and data.metadata.name and query in data.metadata.name.lower():
-            return True
+    def matcher(self, query: SearchQuery) -> Callable[[Extension], bool]:
+        keyword_match = self._keyword_matcher(self._prepare_keywords(query))
+        if not query.has_terms():
+            return keyword_match
+        terms = [_CompiledTerm(term) for term in query.terms]
+        needles = [term.needle for term in terms if term.needle and self.FIELD_SEPARATOR not in term.needle]
+        if any(term.section is None for term in terms):
+            sections = list(SEARCH_FIELDS)
+        else:
+            sections = [section for section in SEARCH_FIELDS if any(term.section == section for term in terms)]
+        search_text = self.search_text
 
-        if data.metadata and data.metadata.annotations:
-            for key, value in data.metadata.annotations.items():
-                if query in key.lower() or query in value.lower():
-                    return True
+        def match(ext: Extension) -> bool:
+            if not keyword_match(ext):
+                return False
+            if needles:
+                text = search_text(ext)
+                if not all(needle in text for needle in needles):
+                    return False
+            return self._match_terms(ext, terms, sections)
 
-        if data.metadata and data.metadata.labels:
-            for key, value in data.metadata.labels.items():
-                if query in key.lower() or query in value.lower():
-                    return True
+        return match
 
-        if data.data:
-            for key, value in data.data.items():
-                if query in key.lower() or query in value.lower():
+    def search_text(self, extension: Extension) -> str:
+        cached = self._texts.get(extension.name)
+        if cached is not None and cached[0] is extension:
+            return cached[1]
+        text = self.FIELD_SEPARATOR.join(part.lower() for part in self._iter_parts(extension))
+        if not self._cache_texts:
+            return text
+        with self._lock:
+            self._texts[extension.name] = (extension, text)
+        return text
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._texts.clear()
+            else:
+                self._texts.pop(name, None)
+
+    def iter_fields(self, extension: Extension) -> Iterator[FieldText]:
+        for section in SEARCH_FIELDS:
+            yield from self._sections[section](extension)
+
+    @staticmethod
+    def _prepare_keywords(query: SearchQuery) -> list[str]:
+        return [kw for kw in (kw.lower().strip() for kw in query.keywords) if kw]
+
+    def _keyword_matcher(self, keywords: list[str]) -> Callable[[Extension], bool]:
+        if not keywords:
+            return lambda ext: True
+        if any(self.FIELD_SEPARATOR in kw for kw in keywords):
+            return lambda ext: all(self._matches_keyword(ext, self.search_text(ext), kw) for kw in keywords)
+        search_text = self.search_text
+        return lambda ext: all(kw in search_text(ext) for kw in keywords)
+
+    def _match_terms(self, extension: Extension, terms: list[_CompiledTerm], sections: list[str]) -> bool:
+        pending = list(terms)
+        for section in sections:
+            for path, text, is_key in self._sections[section](extension):
+                lowered = None
+                remaining = []
+                for term in pending:
+                    if term.applies_to(path, is_key):
+                        if lowered is None:
+                            lowered = text.lower()
+                        if term.test(text, lowered):
+                            continue
+                    remaining.append(term)
+                if not remaining:
                     return True
+                pending = remaining
+            if any(term.section == section for term in pending):
+                return False
+        return not pending
+
+    def _matches_keyword(self, extension: Extension, text: str, keyword: str) -> bool:
+        if self.FIELD_SEPARATOR in keyword:
+            return self._matches_in_extension(extension, keyword)
+        return keyword in text
+
+    def _matches_in_extension(self, extension: Extension, query: str) -> bool:
+        return any(query in part.lower() for part in self._iter_parts(extension))
 
-        if data.spec:
-            return self._search_in_object(data.spec, query)
+    def _iter_parts(self, extension: Extension) -> Iterator[str]:
+        for _, text, _ in self.iter_fields(extension):
+            yield text
 
-        return False
+    @staticmethod
+    def _iter_name(extension: Extension) -> Iterator[FieldText]:
+        yield 'name', extension.name, False
 
-    def _search_in_object(self, obj: object, query: str, depth: int = 0) -> bool:
-        if depth > self.MAX_SEARCH_DEPTH:
-            return False
+    @staticmethod
+    def _iter_kind(extension: Extension) -> Iterator[FieldText]:
+        if extension.data.kind:
+            yield 'kind', extension.data.kind, False
+
+    @staticmethod
+    def _iter_api_version(extension: Extension) -> Iterator[FieldText]:
+        if extension.data.api_version:
+            yield 'apiVersion', extension.data.api_version, False
+
+    @staticmethod
+    def _iter_metadata(extension: Extension) -> Iterator[FieldText]:
+        metadata = extension.data.metadata
+        if not metadata:
+            return
+        if metadata.name:
+            yield 'metadata.name', metadata.name, False
+        for section, mapping in (('metadata.annotations', metadata.annotations), ('metadata.labels', metadata.labels)):
+            if mapping:
+                for key, value in mapping.items():
+                    yield section, key, True
+                    yield f'{section}.{key}', str(value), False
+
+    @staticmethod
+    def _iter_data(extension: Extension) -> Iterator[FieldText]:
+        data = extension.data.data
+        if data:
+            for key, value in data.items():
+                yield 'data', key, True
+                yield f'data.{key}', str(value), False
+
+    def _iter_spec(self, extension: Extension) -> Iterator[FieldText]:
+        if extension.data.spec:
+            yield from self._iter_object(extension.data.spec, 'spec')
+
+    def _iter_object(self, obj: object, path: str, depth: int = 0) -> Iterator[FieldText]:
+        if self._max_depth is not None and depth > self._max_depth:
+            return
 
         if isinstance(obj, str):
-            return query in obj.lower()
-        if isinstance(obj, (int, float, bool)):
-            return query in str(obj).lower()
-        if isinstance(obj, list):
-            return any(self._search_in_object(item, query, depth + 1) for item in obj)
-        if isinstance(obj, dict):
+            yield path, obj, False
+        elif isinstance(obj, (int, float, bool)):
+            yield path, str(obj), False
+        elif isinstance(obj, list):
+            for item in obj:
+                yield from self._iter_object(item, path, depth + 1)
+        elif isinstance(obj, dict):
             for key, value in obj.items():
-                if query in str(key).lower():
-                    return True
-                if self._search_in_object(value, query, depth + 1):
-                    return True
-
-        return False
+                yield path, str(key), True
+                yield from self._iter_object(value, f'{path}.{key}', depth + 1)
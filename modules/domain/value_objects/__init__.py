@@ -1,2 +1,6 @@
 from modules.domain.value_objects.pagination import Pagination
+from modules.domain.value_objects.label_selector import LabelSelector, LabelRequirement
+from modules.domain.value_objects.time_range import TimeRange
+from modules.domain.value_objects.raw_data_ref import RawDataRef, raw_digest
+from modules.domain.value_objects.search_term import SearchTerm
 from modules.domain.value_objects.search_query import SearchQuery, FilterCriteria
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+_TOKEN = re.compile(r'\s*(!=|==|=|\(|\)|,|!|[^\s!=(),]+)')
+
+
+@dataclass(frozen=True)
+class LabelRequirement:
+    key: str
+    operator: str
+    values: tuple[str, ...] = ()
+
+    IN = 'in'
+    NOT_IN = 'notin'
+    EXISTS = 'exists'
+    NOT_EXISTS = '!'
+
+    def matches(self, labels: Optional[dict[str, str]]) -> bool:
+        labels = labels or {}
+        if self.operator == self.EXISTS:
+            return self.key in labels
+        if self.operator == self.NOT_EXISTS:
+            return self.key not in labels
+        if self.operator == self.IN:
+            return self.key in labels and labels[self.key] in self.values
+        return self.key not in labels or labels[self.key] not in self.values
+
+    def __str__(self) -> str:
+        if self.operator == self.EXISTS:
+            return self.key
+        if self.operator == self.NOT_EXISTS:
+            return f'!{self.key}'
+        if len(self.values) == 1:
+            return f'{self.key}{"=" if self.operator == self.IN else "!="}{self.values[0]}'
+        return f'{self.key} {self.operator} ({",".join(self.values)})'
+
+
+@dataclass(frozen=True)
+class LabelSelector:
+    requirements: tuple[LabelRequirement, ...] = field(default_factory=tuple)
+
+    def is_empty(self) -> bool:
+        return len(self.requirements) == 0
+
+    def matches(self, labels: Optional[dict[str, str]]) -> bool:
+        return all(requirement.matches(labels) for requirement in self.requirements)
+
+    @staticmethod
+    def parse(text: str) -> 'LabelSelector':
+        tokens = _tokenize(text)
+        requirements = []
+        pos = 0
+        while pos < len(tokens):
+            requirement, pos = _parse_requirement(tokens, pos)
+            requirements.append(requirement)
+            if pos < len(tokens):
+                if tokens[pos] != ',':
+                    raise ValueError(f'Invalid label selector: {text!r}')
+                pos += 1
+                if pos == len(tokens):
+                    raise ValueError(f'Invalid label selector: {text!r}')
+        return LabelSelector(tuple(requirements))
+
+    def __str__(self) -> str:
+        return ','.join(str(requirement) for requirement in self.requirements)
+
+
+def _tokenize(text: str) -> list[str]:
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match:
+            raise ValueError(f'Invalid label selector: {text!r}')
+        tokens.append(match.group(1))
+        pos = match.end()
+    return tokens
+
+
+def _parse_requirement(tokens: list[str], pos: int) -> tuple[LabelRequirement, int]:
+    if tokens[pos] == '!':
+        key = _expect_word(tokens, pos + 1)
+        return LabelRequirement(key, LabelRequirement.NOT_EXISTS), pos + 2
+    key = _expect_word(tokens, pos)
+    pos += 1
+    if pos == len(tokens) or tokens[pos] == ',':
+        return LabelRequirement(key, LabelRequirement.EXISTS), pos
+    op = tokens[pos]
+    if op in ('=', '=='):
+        return LabelRequirement(key, LabelRequirement.IN, (_expect_word(tokens, pos + 1),)), pos + 2
+    if op == '!=':
+        return LabelRequirement(key, LabelRequirement.NOT_IN, (_expect_word(tokens, pos + 1),)), pos + 2
+    if op in (LabelRequirement.IN, LabelRequirement.NOT_IN):
+        if pos + 1 >= len(tokens) or tokens[pos + 1] != '(':
+            raise ValueError(f'Expected "(" after {op!r}')
+        values = []
+        pos += 2
+        while True:
+            values.append(_expect_word(tokens, pos))
+            pos += 1
+            if pos < len(tokens) and tokens[pos] == ',':
+                pos += 1
+                continue
+            if pos < len(tokens) and tokens[pos] == ')':
+                return LabelRequirement(key, op, tuple(values)), pos + 1
+            raise ValueError(f'Expected ")" in set for {key!r}')
+    raise ValueError(f'Unexpected token {op!r} after {key!r}')
+
+
+def _expect_word(tokens: list[str], pos: int) -> str:
+    if pos >= len(tokens) or tokens[pos] in ('=', '==', '!=', '(', ')', ',', '!'):
+        raise ValueError('Expected label key or value')
+    return tokens[pos]
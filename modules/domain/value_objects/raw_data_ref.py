@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+DIGEST_SIZE = 16
+
+
+@dataclass(frozen=True, slots=True)
+class RawDataRef:
+    digest: bytes
+    length: int
+    source: Optional[str] = field(default=None, compare=False)
+    offset: Optional[int] = field(default=None, compare=False)
+
+    @property
+    def readable(self) -> bool:
+        return self.source is not None and self.offset is not None
+
+    @staticmethod
+    def of(raw: str, source: Optional[str] = None, offset: Optional[int] = None) -> 'RawDataRef':
+        return RawDataRef(raw_digest(raw), len(raw), source, offset)
+
+
+def raw_digest(raw: Union[str, RawDataRef]) -> bytes:
+    if isinstance(raw, RawDataRef):
+        return raw.digest
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=DIGEST_SIZE).digest()
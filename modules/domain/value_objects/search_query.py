@@ -3,6 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Optional
 
+from modules.domain.value_objects.label_selector import LabelSelector
+from modules.domain.value_objects.search_term import SearchTerm
+from modules.domain.value_objects.time_range import TimeRange
+
 
 @dataclass(frozen=True)
 class FilterCriteria:
@@ -14,16 +18,34 @@ class FilterCriteria:
 class SearchQuery:
     keywords: tuple[str, ...] = field(default_factory=tuple)
     filters: tuple[FilterCriteria, ...] = field(default_factory=tuple)
+    label_selector: Optional[LabelSelector] = None
+    created: Optional[TimeRange] = None
+    terms: tuple[SearchTerm, ...] = field(default_factory=tuple)
 
     def is_empty(self) -> bool:
-        return len(self.keywords) == 0 and len(self.filters) == 0
+        return (
+            len(self.keywords) == 0 and len(self.filters) == 0 and len(self.terms) == 0
+            and not self.has_label_selector() and not self.has_created_range()
+        )
 
     def has_keywords(self) -> bool:
         return len(self.keywords) > 0
 
+    def has_terms(self) -> bool:
+        return len(self.terms) > 0
+
+    def has_text_criteria(self) -> bool:
+        return self.has_keywords() or self.has_terms()
+
     def has_filters(self) -> bool:
         return len(self.filters) > 0
 
+    def has_label_selector(self) -> bool:
+        return self.label_selector is not None and not self.label_selector.is_empty()
+
+    def has_created_range(self) -> bool:
+        return self.created is not None and not self.created.is_unbounded()
+
     def get_filter_value(self, field_name: str) -> Optional[str]:
         for f in self.filters:
             if f.field == field_name:
@@ -31,7 +53,7 @@ class SearchQuery:
         return None
 
     def with_keywords(self, keywords: list[str]) -> 'SearchQuery':
-        return SearchQuery(tuple(keywords), self.filters)
+        return SearchQuery(tuple(keywords), self.filters, self.label_selector, self.created, self.terms)
 
     def with_filter(self, field_name: str, value: str) -> 'SearchQuery':
         new_filters = []
@@ -44,11 +66,26 @@ class SearchQuery:
                 new_filters.append(f)
         if not replaced:
             new_filters.append(FilterCriteria(field_name, value))
-        return SearchQuery(self.keywords, tuple(new_filters))
+        return SearchQuery(self.keywords, tuple(new_filters), self.label_selector, self.created, self.terms)
 
     def without_filter(self, field_name: str) -> 'SearchQuery':
         new_filters = tuple(f for f in self.filters if f.field != field_name)
-        return SearchQuery(self.keywords, new_filters)
+        return SearchQuery(self.keywords, new_filters, self.label_selector, self.created, self.terms)
+
+    def with_label_selector(self, selector: Optional[LabelSelector]) -> 'SearchQuery':
+        return SearchQuery(self.keywords, self.filters, selector, self.created, self.terms)
+
+    def with_created(self, created: Optional[TimeRange]) -> 'SearchQuery':
+        return SearchQuery(self.keywords, self.filters, self.label_selector, created, self.terms)
+
+    def with_terms(self, terms: list[SearchTerm]) -> 'SearchQuery':
+        return SearchQuery(self.keywords, self.filters, self.label_selector, self.created, tuple(terms))
+
+    @staticmethod
+    def parse(text: str) -> 'SearchQuery':
+        parsed = SearchTerm.parse(text)
+        keywords = tuple(term.value for term in parsed if term.is_keyword())
+        return SearchQuery(keywords, terms=tuple(term for term in parsed if not term.is_keyword()))
 
     @staticmethod
     def empty() -> 'SearchQuery':
@@ -58,7 +95,13 @@ class SearchQuery:
         parts = []
         if self.keywords:
             parts.append(f'keywords:[{",".join(self.keywords)}]')
+        if self.terms:
+            parts.append(f'terms:[{" ".join(str(term) for term in self.terms)}]')
         if self.filters:
             filter_str = ','.join(f'{f.field}={f.value}' for f in self.filters)
             parts.append(f'filters:{{{filter_str}}}')
+        if self.has_label_selector():
+            parts.append(f'labels:{{{self.label_selector}}}')
+        if self.has_created_range():
+            parts.append(f'created:{{{self.created}}}')
         return ','.join(parts) if parts else '(empty)'
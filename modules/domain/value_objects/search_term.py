@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+SEARCH_FIELDS = ('name', 'kind', 'apiVersion', 'metadata', 'data', 'spec')
+_TOKEN = re.compile(
+    r'\s*(?:(?P<field>(?:' + '|'.join(SEARCH_FIELDS) + r')(?:\.[^\s:"]+)?):)?'
+    r'(?:/(?P<regex>(?:\\.|[^/\\])+)/(?=\s|$)|"(?P<quoted>[^"]*)"|(?P<bare>\S+))'
+)
+
+
+@dataclass(frozen=True)
+class SearchTerm:
+    value: str
+    field: Optional[str] = None
+    regex: bool = False
+
+    def __post_init__(self):
+        if self.field is not None and self.section not in SEARCH_FIELDS:
+            raise ValueError(f'Unknown search field: {self.field!r}')
+        if self.regex:
+            try:
+                re.compile(self.value)
+            except re.error as e:
+                raise ValueError(f'Invalid regex term {self.value!r}: {e}') from e
+
+    @property
+    def section(self) -> Optional[str]:
+        return self.field.split('.', 1)[0] if self.field is not None else None
+
+    def is_keyword(self) -> bool:
+        return self.field is None and not self.regex
+
+    def applies_to(self, path: str) -> bool:
+        field = self.field
+        return field is None or path == field or path.startswith(field + '.')
+
+    @staticmethod
+    def parse(text: str) -> tuple['SearchTerm', ...]:
+        terms = []
+        pos = 0
+        text = text.strip()
+        while pos < len(text):
+            match = _TOKEN.match(text, pos)
+            if not match:
+                raise ValueError(f'Invalid search expression: {text!r}')
+            pos = match.end()
+            field = match.group('field')
+            if match.group('regex') is not None:
+                terms.append(SearchTerm(match.group('regex'), field, regex=True))
+                continue
+            value = match.group('quoted') if match.group('quoted') is not None else match.group('bare')
+            if value:
+                terms.append(SearchTerm(value, field))
+        return tuple(terms)
+
+    def __str__(self) -> str:
+        if self.regex:
+            value = f'/{self.value}/'
+        elif not self.value or any(ch.isspace() for ch in self.value) or self.value[0] == '/' or ':' in self.value:
+            value = f'"{self.value}"'
+        else:
+            value = self.value
+        return f'{self.field}:{value}' if self.field is not None else value
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+RANGE_SEPARATOR = '..'
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str) and value.strip():
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    else:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def timestamp_key(value: Any) -> Optional[float]:
+    parsed = parse_timestamp(value)
+    return parsed.timestamp() if parsed else None
+
+
+@dataclass(frozen=True)
+class TimeRange:
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, 'start', parse_timestamp(self.start))
+        object.__setattr__(self, 'end', parse_timestamp(self.end))
+        if self.start and self.end and self.start > self.end:
+            raise ValueError('Time range start must not be after end')
+
+    def is_unbounded(self) -> bool:
+        return self.start is None and self.end is None
+
+    def bounds(self) -> tuple[Optional[float], Optional[float]]:
+        return (
+            self.start.timestamp() if self.start else None,
+            self.end.timestamp() if self.end else None
+        )
+
+    def contains(self, value: Any) -> bool:
+        key = timestamp_key(value)
+        if key is None:
+            return False
+        start, end = self.bounds()
+        return (start is None or key >= start) and (end is None or key < end)
+
+    @staticmethod
+    def parse(text: str) -> 'TimeRange':
+        start_text, separator, end_text = text.partition(RANGE_SEPARATOR)
+        if not separator:
+            raise ValueError(f'Time range must look like START..END: {text!r}')
+        bounds = []
+        for part in (start_text.strip(), end_text.strip()):
+            if not part:
+                bounds.append(None)
+                continue
+            parsed = parse_timestamp(part)
+            if parsed is None:
+                raise ValueError(f'Invalid timestamp: {part!r}')
+            bounds.append(parsed)
+        return TimeRange(*bounds)
+
+    def __str__(self) -> str:
+        start = self.start.isoformat() if self.start else ''
+        end = self.end.isoformat() if self.end else ''
+        return f'{start}{RANGE_SEPARATOR}{end}'
@@ -2,6 +2,9 @@ from modules.infrastructure.types import (
     ReplaceRule, ReplaceScope, PreviewChange, ReplaceResult,
     BatchReplaceResult, IReplaceEngine
 )
-from modules.infrastructure.repositories import InMemoryExtensionRepository, FileStorageRepository, FileFormatError
+from modules.infrastructure.repositories import InMemoryExtensionRepository, SqliteExtensionRepository, FileStorageRepository, FileFormatError, ItemFileWriter, QueryResultCache
 from modules.infrastructure.services.encoding import Base64Decoder, base64_decoder, Base64Encoder, base64_encoder
-from modules.infrastructure.services.replace import DefaultReplaceEngine, default_replace_engine
+from modules.infrastructure.services.replace import DefaultReplaceEngine, default_replace_engine, ReplaceResultCache
+from modules.infrastructure.services.indexing import TrigramIndex, ExtensionFieldIndex, CategoricalColumn
+from modules.infrastructure.services.report import JsonlChangeReportWriter
+from modules.infrastructure.services.checkpoint import CheckpointStore, Checkpoint, StageProgress, CheckpointError, fingerprint_file, fingerprint_rules
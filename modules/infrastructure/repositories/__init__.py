@@ -1,2 +1,4 @@
 from modules.infrastructure.repositories.in_memory_extension_repository import InMemoryExtensionRepository
-from modules.infrastructure.repositories.file_storage_repository import FileStorageRepository, FileFormatError
+from modules.infrastructure.repositories.sqlite_extension_repository import SqliteExtensionRepository
+from modules.infrastructure.repositories.file_storage_repository import FileStorageRepository, FileFormatError, ItemFileWriter
+from modules.infrastructure.repositories.query_result_cache import QueryResultCache, QueryScan
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import json
+import os
+import re
+from typing import Any, Iterable, Iterator, Optional, TextIO
 
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
 from modules.domain.entities.extension import ExtensionItem
 from modules.domain.repositories.i_storage_repository import IStorageRepository
+from modules.domain.value_objects.raw_data_ref import RawDataRef, raw_digest
 
 
 class FileFormatError(Exception):
@@ -12,11 +17,155 @@ class FileFormatError(Exception):
         self.code = code
 
 
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _JsonArrayStream:
+    def __init__(self, f: TextIO, chunk_size: int):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._ascii = True
+        self._base_bytes = 0
+        self._value_start = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._next_char() != '[':
+            self._decode_value()
+            self._expect_end()
+            raise FileFormatError('无效的文件格式: 期望数组', 'NOT_ARRAY')
+        self._pos += 1
+        if self._next_char() == ']':
+            self._pos += 1
+            self._expect_end()
+            return
+        while True:
+            yield self._decode_value()
+            char = self._next_char()
+            self._pos += 1
+            if char == ']':
+                self._expect_end()
+                return
+            if char != ',':
+                raise FileFormatError('无效的JSON格式', 'INVALID_JSON')
+
+    def _next_char(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read(self._chunk_size):
+                return ''
+
+    def _decode_value(self) -> Any:
+        self._next_char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                if end < len(self._buffer) or self._eof:
+                    self._value_start = self._pos
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise FileFormatError('无效的JSON格式', 'INVALID_JSON') from None
+            self._read(len(self._buffer) - self._pos)
+
+    def locate(self, text: str) -> Optional[int]:
+        index = self._buffer.find(text, self._value_start, self._pos)
+        if index < 0:
+            return None
+        return self._base_bytes + self._byte_length(index)
+
+    def _byte_length(self, end: int) -> int:
+        return end if self._ascii else len(self._buffer[:end].encode('utf-8'))
+
+    def _expect_end(self) -> None:
+        if self._next_char():
+            raise FileFormatError('无效的JSON格式', 'INVALID_JSON')
+
+    def _read(self, size: int) -> bool:
+        chunk = self._file.read(max(size, self._chunk_size))
+        if not chunk:
+            self._eof = True
+            return False
+        self._base_bytes += self._byte_length(self._pos)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._ascii = self._buffer.isascii()
+        self._pos = 0
+        return True
+
+
 class FileStorageRepository(IStorageRepository):
-    def load(self, filepath: str) -> list[ExtensionItem]:
+    STREAM_CHUNK_SIZE = 1 << 16
+
+    def __init__(self, metrics: Optional[IMetricsRegistry] = None):
+        self._metrics = metrics or NullMetricsRegistry()
+
+    def load(self, filepath: str, with_offsets: bool = False) -> list[ExtensionItem]:
+        with self._metrics.time('halo_stage_duration_seconds', stage='storage_load'):
+            items = self._load(filepath, with_offsets)
+        self._metrics.increment('halo_bytes_read_total', os.path.getsize(filepath))
+        return items
+
+    def iter_load(
+        self,
+        filepath: str,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        with_offsets: bool = False
+    ) -> Iterator[ExtensionItem]:
+        try:
+            f = open(filepath, 'r', encoding='utf-8', newline='')
+        except Exception as e:
+            raise FileFormatError(f'读取文件失败: {filepath}', 'READ_ERROR') from e
+        count = 0
+        with f:
+            try:
+                stream = _JsonArrayStream(f, chunk_size)
+                for item in stream:
+                    if not self._is_valid_extension_item(item):
+                        raise FileFormatError(
+                            f'索引 {count} 处的扩展项无效: 缺少必需字段 (name, version, data)',
+                            'INVALID_ITEM'
+                        )
+                    count += 1
+                    extension_item = ExtensionItem(name=item['name'], data=item['data'], version=item['version'])
+                    if with_offsets and extension_item.data.isascii():
+                        position = stream.locate(f'"{extension_item.data}"')
+                        if position is not None:
+                            extension_item.offset = position + 1
+                    yield extension_item
+            except UnicodeDecodeError as e:
+                raise FileFormatError(f'读取文件失败: {filepath}', 'READ_ERROR') from e
+        if count == 0:
+            raise FileFormatError('文件不包含扩展数据', 'EMPTY_ARRAY')
+        self._metrics.increment('halo_bytes_read_total', os.path.getsize(filepath))
+
+    def read_raw(self, ref: RawDataRef) -> str:
+        if not ref.readable:
+            raise FileFormatError('原始数据不可回读: 缺少文件位置', 'RAW_UNAVAILABLE')
+        try:
+            with open(ref.source, 'rb') as f:
+                f.seek(ref.offset)
+                chunk = f.read(ref.length)
+        except Exception as e:
+            raise FileFormatError(f'读取文件失败: {ref.source}', 'READ_ERROR') from e
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                text = f.read()
+            raw = chunk.decode('ascii')
+        except UnicodeDecodeError:
+            raw = None
+        if raw is None or len(raw) != ref.length or raw_digest(raw) != ref.digest:
+            raise FileFormatError(f'原始数据与加载时不一致, 文件可能已被修改: {ref.source}', 'RAW_MISMATCH')
+        return raw
+
+    def _load(self, filepath: str, with_offsets: bool = False) -> list[ExtensionItem]:
+        try:
+            with open(filepath, 'rb') as f:
+                buffer = f.read()
+            text = buffer.decode('utf-8')
         except Exception as e:
             raise FileFormatError(f'读取文件失败: {filepath}', 'READ_ERROR') from e
 
@@ -38,12 +187,48 @@ class FileStorageRepository(IStorageRepository):
                     'INVALID_ITEM'
                 )
 
-        return [ExtensionItem(name=item['name'], data=item['data'], version=item['version']) for item in data]
+        items = [ExtensionItem(name=item['name'], data=item['data'], version=item['version']) for item in data]
+        if with_offsets:
+            self._locate(items, buffer)
+        return items
+
+    @staticmethod
+    def _locate(items: list[ExtensionItem], buffer: bytes) -> None:
+        cursor = 0
+        for item in items:
+            if not item.data.isascii():
+                continue
+            needle = b'"' + item.data.encode('ascii') + b'"'
+            position = buffer.find(needle, cursor)
+            if position < 0:
+                continue
+            item.offset = position + 1
+            cursor = position + len(needle)
+
+    def save(self, data: Iterable[ExtensionItem], filepath: str) -> None:
+        with self._metrics.time('halo_stage_duration_seconds', stage='storage_save'):
+            temp_path = f'{filepath}.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    self._write_items(data, f)
+                os.replace(temp_path, filepath)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        self._metrics.increment('halo_bytes_written_total', os.path.getsize(filepath))
+
+    def open_writer(self, filepath: str, resume_at: Optional[int] = None, count: int = 0) -> 'ItemFileWriter':
+        return ItemFileWriter(filepath, resume_at, count, self._metrics)
 
-    def save(self, data: list[ExtensionItem], filepath: str) -> None:
-        items = [{'name': item.name, 'data': item.data, 'version': item.version} for item in data]
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(items, f, ensure_ascii=False, indent=2)
+    @staticmethod
+    def _write_items(data: Iterable[ExtensionItem], f: TextIO) -> None:
+        separator = '[\n  '
+        for item in data:
+            f.write(separator)
+            f.write(_format_item(item))
+            separator = ',\n  '
+        f.write('[]' if separator == '[\n  ' else '\n]')
 
     def _is_valid_extension_item(self, item: object) -> bool:
         if not isinstance(item, dict):
@@ -55,3 +240,53 @@ class FileStorageRepository(IStorageRepository):
         if not isinstance(item.get('data'), str) or not item['data'].strip():
             return False
         return True
+
+
+class ItemFileWriter:
+    def __init__(
+        self,
+        filepath: str,
+        resume_at: Optional[int] = None,
+        count: int = 0,
+        metrics: Optional[IMetricsRegistry] = None
+    ):
+        self._filepath = filepath
+        self._metrics = metrics or NullMetricsRegistry()
+        self._count = count
+        self._start = resume_at or 0
+        if resume_at is None:
+            self._file = open(filepath, 'w', encoding='utf-8')
+        else:
+            os.truncate(filepath, resume_at)
+            self._file = open(filepath, 'a', encoding='utf-8')
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def write(self, item: ExtensionItem) -> None:
+        self._file.write(',\n  ' if self._count else '[\n  ')
+        self._file.write(_format_item(item))
+        self._count += 1
+
+    def commit(self) -> int:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return os.fstat(self._file.fileno()).st_size
+
+    def finish(self) -> int:
+        self._file.write('\n]' if self._count else '[]')
+        size = self.commit()
+        self._metrics.increment('halo_bytes_written_total', size - self._start)
+        return size
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _format_item(item: ExtensionItem) -> str:
+    return (
+        f'{{\n    "name": {json.dumps(item.name, ensure_ascii=False)},'
+        f'\n    "data": {json.dumps(item.data, ensure_ascii=False)},'
+        f'\n    "version": {json.dumps(item.version)}\n  }}'
+    )
@@ -1,19 +1,37 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from modules.domain.entities.extension import Extension
-from modules.domain.repositories.i_extension_repository import IExtensionRepository, SearchResult
+from modules.domain.repositories.i_extension_repository import IExtensionRepository, SearchResult, CursorPage
+from modules.domain.value_objects.label_selector import LabelSelector
 from modules.domain.value_objects.search_query import SearchQuery
+from modules.domain.value_objects.time_range import TimeRange
 from modules.domain.value_objects.pagination import Pagination
 from modules.domain.services.extension_search_service import ExtensionSearchService
+from modules.infrastructure.repositories.query_result_cache import QueryResultCache, QueryScan
+from modules.infrastructure.services.indexing.field_index import ExtensionFieldIndex
+from modules.infrastructure.services.indexing.trigram_index import TrigramIndex, plan_for_query
 
 
 class InMemoryExtensionRepository(IExtensionRepository):
-    def __init__(self):
+    def __init__(
+        self,
+        trigram_index: Optional[TrigramIndex] = None,
+        field_index: Optional[ExtensionFieldIndex] = None
+    ):
         self._extensions: dict[str, Extension] = {}
         self._has_unsaved_changes = False
         self._search_service = ExtensionSearchService()
+        self._trigram_index = trigram_index
+        self._field_index = field_index if field_index is not None else ExtensionFieldIndex()
+        self._names_by_raw: dict[str, dict[str, None]] = {}
+        self._query_cache = QueryResultCache()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     def find_all(self) -> list[Extension]:
         return list(self._extensions.values())
@@ -21,46 +39,68 @@ class InMemoryExtensionRepository(IExtensionRepository):
     def find_by_name(self, name: str) -> Optional[Extension]:
         return self._extensions.get(name)
 
-    def find_by_query(self, query: SearchQuery, pagination: Pagination) -> SearchResult:
-        all_extensions = self.find_all()
-        filtered = self._filter_by_query(all_extensions, query)
-
+    def find_by_query(self, query: SearchQuery, pagination: Pagination, exact_total: bool = False) -> SearchResult:
+        scan = self._scan(query)
         offset = pagination.offset
-        limit = pagination.page_size
-        paginated = filtered[offset:offset + limit]
-        new_pagination = pagination.with_total(len(filtered))
+        end = offset + pagination.page_size
+        scan.fill(None if exact_total else end + 1)
+        total = len(scan.matches)
 
         return SearchResult(
-            items=paginated,
-            total=len(filtered),
-            pagination=new_pagination
+            items=scan.matches[offset:end],
+            total=total,
+            pagination=pagination.with_total(total),
+            total_is_exact=scan.done
         )
 
+    def find_page_after(self, query: SearchQuery, cursor: Optional[str], limit: int) -> CursorPage:
+        scan = self._scan(query)
+        items, has_more = scan.page_after(cursor, limit)
+        return CursorPage(items, items[-1].name if has_more else None, len(scan.matches))
+
     def count(self, query: Optional[SearchQuery] = None) -> int:
-        all_extensions = self.find_all()
         if not query or query.is_empty():
-            return len(all_extensions)
-        return len(self._filter_by_query(all_extensions, query))
+            return len(self._extensions)
+        scan = self._scan(query)
+        scan.fill()
+        return len(scan.matches)
 
     def save(self, extensions: list[Extension]) -> None:
+        order: Optional[list[str]] = None
+        renames: dict[str, str] = {}
         for ext in extensions:
-            existing = None
-            for key, val in self._extensions.items():
-                if key != ext.name and val.raw_data == ext.raw_data:
-                    existing = key
-                    break
-            if existing:
-                del self._extensions[existing]
+            existing = self._renamed_from(ext)
+            if existing is not None:
+                if ext.name not in self._extensions:
+                    if order is None:
+                        order = list(self._extensions)
+                    renames[existing] = ext.name
+                self._unindex(self._extensions.pop(existing))
+            overwritten = self._extensions.get(ext.name)
             self._extensions[ext.name] = ext
+            if overwritten is not None:
+                self._reindex(overwritten, ext)
+            else:
+                self._index(ext)
+        if renames:
+            self._restore_order(order, renames)
+        self._touch()
         self._has_unsaved_changes = True
 
     def delete(self, name: str) -> None:
         if name in self._extensions:
-            del self._extensions[name]
+            self._unindex(self._extensions.pop(name))
+        self._touch()
         self._has_unsaved_changes = True
 
     def clear(self) -> None:
         self._extensions.clear()
+        self._names_by_raw.clear()
+        self._field_index.clear()
+        self._search_service.invalidate()
+        if self._trigram_index is not None:
+            self._trigram_index.clear()
+        self._touch()
         self._has_unsaved_changes = False
 
     def has_changes(self) -> bool:
@@ -69,20 +109,118 @@ class InMemoryExtensionRepository(IExtensionRepository):
     def mark_as_saved(self) -> None:
         self._has_unsaved_changes = False
 
-    def get_kinds(self) -> list[str]:
-        kinds = set()
-        for ext in self._extensions.values():
-            kinds.add(ext.get_kind())
-        return sorted(kinds)
-
-    def _filter_by_query(self, extensions: list[Extension], query: SearchQuery) -> list[Extension]:
-        filtered = extensions
+    def find_candidates(self, literal_plans: Iterable[list]) -> Optional[list[Extension]]:
+        if self._trigram_index is None:
+            return None
+        names = self._trigram_index.candidates(literal_plans)
+        if names is None:
+            return None
+        return [self._extensions[name] for name in names]
+
+    def find_in_scope(
+        self,
+        kinds: Optional[list[str]] = None,
+        label_selector: Optional[LabelSelector] = None,
+        created: Optional[TimeRange] = None
+    ) -> Optional[list[Extension]]:
+        names = self._field_index.select(scope_kinds=kinds, label_selector=label_selector, created=created)
+        if names is None:
+            return None
+        return [self._extensions[name] for name in names]
 
-        if query.has_keywords():
-            filtered = [ext for ext in filtered if self._search_service.matches(ext, query)]
-
-        kind_filter = query.get_filter_value('kind')
-        if kind_filter:
-            filtered = [ext for ext in filtered if ext.get_kind() == kind_filter]
-
-        return filtered
+    def get_kinds(self) -> list[str]:
+        return sorted(self._field_index.kind_counts())
+
+    def count_by_kind(self) -> dict[str, int]:
+        return self._field_index.kind_counts()
+
+    def _keyword_candidates(self, query: SearchQuery) -> Optional[list[Extension]]:
+        plan = plan_for_query(query)
+        return self.find_candidates([plan]) if plan else None
+
+    def _touch(self) -> None:
+        self._version += 1
+        self._query_cache.clear()
+
+    def _restore_order(self, order: list[str], renames: dict[str, str]) -> None:
+        extensions = self._extensions
+        ordered: dict[str, Extension] = {}
+        for name in order:
+            while name not in extensions and name in renames:
+                name = renames.pop(name)
+            if name in extensions and name not in ordered:
+                ordered[name] = extensions[name]
+        for name, ext in extensions.items():
+            if name not in ordered:
+                ordered[name] = ext
+        self._extensions = ordered
+
+    def _renamed_from(self, ext: Extension) -> Optional[str]:
+        for name in self._names_by_raw.get(ext.raw_data, ()):
+            if name != ext.name:
+                return name
+        return None
+
+    def _index(self, ext: Extension) -> None:
+        self._names_by_raw.setdefault(ext.raw_data, {})[ext.name] = None
+        self._field_index.add(ext)
+        if self._trigram_index is not None:
+            self._trigram_index.add(ext)
+
+    def _unindex(self, ext: Extension) -> None:
+        names = self._names_by_raw.get(ext.raw_data)
+        if names is not None:
+            names.pop(ext.name, None)
+            if not names:
+                del self._names_by_raw[ext.raw_data]
+        self._field_index.remove(ext)
+        self._search_service.invalidate(ext.name)
+        if self._trigram_index is not None:
+            self._trigram_index.remove(ext)
+
+    def _reindex(self, old: Extension, new: Extension) -> None:
+        if old.raw_data != new.raw_data:
+            names = self._names_by_raw.get(old.raw_data)
+            if names is not None:
+                names.pop(old.name, None)
+                if not names:
+                    del self._names_by_raw[old.raw_data]
+            self._names_by_raw.setdefault(new.raw_data, {})[new.name] = None
+        self._field_index.replace(old, new)
+        if self._trigram_index is not None:
+            self._trigram_index.replace(old, new)
+
+    def _scan(self, query: SearchQuery) -> QueryScan:
+        scan = self._query_cache.get(query, self._version)
+        if scan is None:
+            scan = QueryScan(self._version, self._iter_matches(self._query_source(query), query))
+            self._query_cache.put(query, scan)
+        return scan
+
+    def _query_source(self, query: SearchQuery) -> list[Extension]:
+        selected = self._field_index.select(
+            kind=query.get_filter_value('kind'),
+            api_version=query.get_filter_value('apiVersion'),
+            metadata_name=query.get_filter_value('metadata.name'),
+            label_selector=query.label_selector,
+            created=query.created
+        )
+        candidates = self._keyword_candidates(query) if query.has_text_criteria() else None
+        if selected is None:
+            return candidates if candidates is not None else self.find_all()
+        if candidates is not None and len(candidates) < len(selected):
+            selected_names = set(selected)
+            return [ext for ext in candidates if ext.name in selected_names]
+        if candidates is not None:
+            candidate_names = {ext.name for ext in candidates}
+            selected = [name for name in selected if name in candidate_names]
+        return [self._extensions[name] for name in selected]
+
+    def _iter_matches(self, extensions: list[Extension], query: SearchQuery) -> Iterator[Extension]:
+        if not query.has_text_criteria():
+            yield from extensions
+            return
+        predicate = self._search_service.matcher(query)
+        for ext in extensions:
+            if predicate(ext):
+                yield ext
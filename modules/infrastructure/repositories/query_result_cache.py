@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import OrderedDict
+from threading import Lock, RLock
+from typing import Iterator, Optional
+
+from modules.domain.entities.extension import Extension
+from modules.domain.value_objects.search_query import SearchQuery
+
+
+class QueryScan:
+    def __init__(self, version: int, source: Iterator[Extension]):
+        self.version = version
+        self.matches: list[Extension] = []
+        self._source: Optional[Iterator[Extension]] = source
+        self._names: Optional[list[str]] = None
+        self._ordered: Optional[list[Extension]] = None
+        self._lock = RLock()
+
+    @property
+    def done(self) -> bool:
+        return self._source is None
+
+    def fill(self, size: Optional[int] = None) -> None:
+        with self._lock:
+            source = self._source
+            if source is None:
+                return
+            matches = self.matches
+            if size is None:
+                matches.extend(source)
+                self._source = None
+                return
+            while len(matches) < size:
+                extension = next(source, None)
+                if extension is None:
+                    self._source = None
+                    return
+                matches.append(extension)
+
+    def page_after(self, cursor: Optional[str], limit: int) -> tuple[list[Extension], bool]:
+        with self._lock:
+            if self._ordered is None:
+                self.fill()
+                self._ordered = sorted(self.matches, key=lambda ext: ext.name)
+                self._names = [ext.name for ext in self._ordered]
+            start = 0 if cursor is None else bisect_right(self._names, cursor)
+            end = start + limit
+            return self._ordered[start:end], end < len(self._ordered)
+
+
+class QueryResultCache:
+    DEFAULT_MAX_ENTRIES = 16
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._scans: OrderedDict[SearchQuery, QueryScan] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._scans)
+
+    def get(self, query: SearchQuery, version: int) -> Optional[QueryScan]:
+        with self._lock:
+            scan = self._scans.get(query)
+            if scan is None:
+                return None
+            if scan.version != version:
+                del self._scans[query]
+                return None
+            self._scans.move_to_end(query)
+            return scan
+
+    def put(self, query: SearchQuery, scan: QueryScan) -> None:
+        with self._lock:
+            self._scans[query] = scan
+            self._scans.move_to_end(query)
+            while len(self._scans) > self._max_entries:
+                self._scans.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scans.clear()
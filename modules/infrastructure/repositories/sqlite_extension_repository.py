@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+import weakref
+from contextlib import contextmanager
+from itertools import islice
+from threading import RLock
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from modules.domain.entities.extension import Extension
+from modules.domain.entities.extension_data import ExtensionData
+from modules.domain.repositories.i_extension_repository import IExtensionRepository, SearchResult, CursorPage
+from modules.domain.services.extension_search_service import ExtensionSearchService
+from modules.domain.value_objects.label_selector import LabelSelector
+from modules.domain.value_objects.pagination import Pagination
+from modules.domain.value_objects.raw_data_ref import RawDataRef, raw_digest
+from modules.domain.value_objects.search_query import SearchQuery
+from modules.domain.value_objects.time_range import TimeRange, timestamp_key
+from modules.infrastructure.services.indexing.field_index import UNKNOWN_KIND
+from modules.infrastructure.services.indexing.trigram_index import TrigramIndex, plan_for_query
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS extensions (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        version INTEGER NOT NULL,
+        kind TEXT,
+        api_version TEXT,
+        metadata_name TEXT,
+        creation_timestamp TEXT,
+        created_at REAL,
+        raw_digest BLOB NOT NULL,
+        raw_length INTEGER NOT NULL,
+        raw_source TEXT,
+        raw_offset INTEGER,
+        raw_text TEXT,
+        modified INTEGER NOT NULL DEFAULT 0,
+        data TEXT NOT NULL
+    )''',
+    'CREATE INDEX IF NOT EXISTS ix_extensions_kind ON extensions (kind)',
+    'CREATE INDEX IF NOT EXISTS ix_extensions_api_version ON extensions (api_version)',
+    'CREATE INDEX IF NOT EXISTS ix_extensions_metadata_name ON extensions (metadata_name)',
+    'CREATE INDEX IF NOT EXISTS ix_extensions_created_at ON extensions (created_at)',
+    'CREATE INDEX IF NOT EXISTS ix_extensions_raw_digest ON extensions (raw_digest)',
+)
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS extensions_fts "
+    "USING fts5(body, tokenize='trigram case_sensitive 1', detail=none)"
+)
+_COLUMNS = 'seq, name, version, data, raw_digest, raw_length, raw_source, raw_offset, raw_text, modified'
+_UPSERT = '''INSERT INTO extensions (
+        name, version, kind, api_version, metadata_name, creation_timestamp, created_at,
+        raw_digest, raw_length, raw_source, raw_offset, raw_text, modified, data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (name) DO UPDATE SET
+        version = excluded.version, kind = excluded.kind, api_version = excluded.api_version,
+        metadata_name = excluded.metadata_name, creation_timestamp = excluded.creation_timestamp,
+        created_at = excluded.created_at, raw_digest = excluded.raw_digest, raw_length = excluded.raw_length,
+        raw_source = excluded.raw_source, raw_offset = excluded.raw_offset, raw_text = excluded.raw_text,
+        modified = excluded.modified, data = excluded.data
+    RETURNING seq'''
+_TEXT_SEPARATOR = '\n'
+
+Clause = tuple[str, list]
+
+
+class SqliteExtensionRepository(IExtensionRepository):
+    BATCH_SIZE = 2000
+
+    def __init__(self, path: Optional[str] = None, batch_size: int = BATCH_SIZE, full_text: bool = True):
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='halo-', suffix='.sqlite3')
+            os.close(fd)
+        self._path = path
+        self._batch_size = batch_size
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = RLock()
+        self._search_service = ExtensionSearchService(cache_texts=False)
+        self._has_unsaved_changes = False
+        self._version = 0
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._add_missing_columns()
+        self._full_text = full_text and self._create_full_text_table()
+        self._finalizer = weakref.finalize(self, _close, self._conn, path if self._temporary else None)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def full_text(self) -> bool:
+        return self._full_text
+
+    def close(self) -> None:
+        with self._lock:
+            self._finalizer()
+
+    def find_all(self) -> list[Extension]:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[Extension]:
+        return self._stream(('', []))
+
+    def find_by_name(self, name: str) -> Optional[Extension]:
+        with self._lock:
+            row = self._conn.execute(f'SELECT {_COLUMNS} FROM extensions WHERE name = ?', (name,)).fetchone()
+        return _row_to_extension(row) if row else None
+
+    def find_by_query(self, query: SearchQuery, pagination: Pagination, exact_total: bool = False) -> SearchResult:
+        clause = self._query_clause(query)
+        offset = pagination.offset
+        end = offset + pagination.page_size
+        predicate = self._query_predicate(query)
+        if predicate is None:
+            total = self._count_rows(clause)
+            items = self._fetch(clause, 'seq', pagination.page_size, offset)
+            return SearchResult(items, total, pagination.with_total(total))
+
+        matches = (ext for ext in self._stream(clause) if predicate(ext))
+        items: list[Extension] = []
+        total = 0
+        done = True
+        for ext in matches:
+            if offset <= total < end:
+                items.append(ext)
+            total += 1
+            if not exact_total and total > end:
+                done = False
+                break
+        return SearchResult(items, total, pagination.with_total(total), total_is_exact=done)
+
+    def find_page_after(self, query: SearchQuery, cursor: Optional[str], limit: int) -> CursorPage:
+        clause = self._query_clause(query)
+        predicate = self._query_predicate(query)
+        items = list(islice(
+            (ext for ext in self._stream(clause, 'name', cursor) if predicate is None or predicate(ext)),
+            limit + 1
+        ))
+        has_more = len(items) > limit
+        items = items[:limit]
+        return CursorPage(items, items[-1].name if has_more else None, self.count(query))
+
+    def count(self, query: Optional[SearchQuery] = None) -> int:
+        if not query or query.is_empty():
+            return self._count_rows(('', []))
+        clause = self._query_clause(query)
+        predicate = self._query_predicate(query)
+        if predicate is None:
+            return self._count_rows(clause)
+        return sum(1 for ext in self._stream(clause) if predicate(ext))
+
+    def save(self, extensions: Iterable[Extension]) -> None:
+        iterator = iter(extensions)
+        while True:
+            batch = list(islice(iterator, self._batch_size))
+            if not batch:
+                break
+            with self._transaction() as conn:
+                written: dict[int, Extension] = {}
+                stale: set[int] = set()
+                for ext in batch:
+                    self._save_one(conn, ext, written, stale)
+                if self._full_text:
+                    conn.executemany('DELETE FROM extensions_fts WHERE rowid = ?', ((seq,) for seq in stale))
+                    conn.executemany(
+                        'INSERT INTO extensions_fts (rowid, body) VALUES (?, ?)',
+                        ((seq, _full_text_body(ext)) for seq, ext in written.items())
+                    )
+        self._version += 1
+        self._has_unsaved_changes = True
+
+    def delete(self, name: str) -> None:
+        with self._transaction() as conn:
+            row = conn.execute('SELECT seq FROM extensions WHERE name = ?', (name,)).fetchone()
+            if row:
+                conn.execute('DELETE FROM extensions WHERE seq = ?', (row[0],))
+                if self._full_text:
+                    conn.execute('DELETE FROM extensions_fts WHERE rowid = ?', (row[0],))
+        self._version += 1
+        self._has_unsaved_changes = True
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM extensions')
+            if self._full_text:
+                conn.execute('DELETE FROM extensions_fts')
+        self._version += 1
+        self._has_unsaved_changes = False
+
+    def is_disk_backed(self) -> bool:
+        return True
+
+    def has_changes(self) -> bool:
+        return self._has_unsaved_changes
+
+    def mark_as_saved(self) -> None:
+        self._has_unsaved_changes = False
+
+    def find_candidates(self, literal_plans: Iterable[list]) -> Optional[Iterator[Extension]]:
+        if not self._full_text:
+            return None
+        expressions = []
+        for plan in literal_plans:
+            expression = _plan_expression(plan)
+            if expression is None:
+                return None
+            expressions.append(f'({expression})')
+        if not expressions:
+            return None
+        return self._stream(_full_text_clause(' OR '.join(expressions)))
+
+    def find_in_scope(
+        self,
+        kinds: Optional[list[str]] = None,
+        label_selector: Optional[LabelSelector] = None,
+        created: Optional[TimeRange] = None
+    ) -> Optional[Iterator[Extension]]:
+        clauses: list[Clause] = []
+        if kinds:
+            clauses.append((f'(kind IS NULL OR kind IN ({", ".join("?" * len(kinds))}))', list(kinds)))
+        if created is not None and not created.is_unbounded():
+            clauses.append(_created_clause(created))
+        selector = label_selector if label_selector is not None and not label_selector.is_empty() else None
+        if not clauses and selector is None:
+            return None
+        stream = self._stream(_and(clauses))
+        if selector is None:
+            return stream
+        return (ext for ext in stream if selector.matches(_labels(ext)))
+
+    def get_kinds(self) -> list[str]:
+        return sorted(self.count_by_kind())
+
+    def count_by_kind(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT COALESCE(kind, ?), COUNT(*) FROM extensions GROUP BY 1', (UNKNOWN_KIND,)
+            ).fetchall()
+        return dict(rows)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def _add_missing_columns(self) -> None:
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(extensions)')}
+        if 'raw_text' not in columns:
+            self._conn.execute('ALTER TABLE extensions ADD COLUMN raw_text TEXT')
+
+    def _create_full_text_table(self) -> bool:
+        try:
+            self._conn.execute(_FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        return True
+
+    def _save_one(
+        self,
+        conn: sqlite3.Connection,
+        ext: Extension,
+        written: dict[int, Extension],
+        stale: set[int]
+    ) -> None:
+        digest = raw_digest(ext.raw_data)
+        renamed = conn.execute(
+            'SELECT seq FROM extensions WHERE raw_digest = ? AND name != ? ORDER BY seq LIMIT 1',
+            (digest, ext.name)
+        ).fetchone()
+        if renamed and conn.execute('SELECT 1 FROM extensions WHERE name = ?', (ext.name,)).fetchone():
+            conn.execute('DELETE FROM extensions WHERE seq = ?', (renamed[0],))
+            written.pop(renamed[0], None)
+            stale.add(renamed[0])
+        elif renamed:
+            conn.execute('UPDATE extensions SET name = ? WHERE seq = ?', (ext.name, renamed[0]))
+        data = ext.data
+        metadata = data.metadata
+        creation_timestamp = metadata.creation_timestamp if metadata else None
+        raw = ext.raw_data
+        seq = conn.execute(_UPSERT, (
+            ext.name,
+            ext.version,
+            data.kind if isinstance(data.kind, str) and data.kind else None,
+            data.api_version if isinstance(data.api_version, str) else None,
+            metadata.name if metadata and isinstance(metadata.name, str) else None,
+            creation_timestamp if isinstance(creation_timestamp, str) else None,
+            timestamp_key(creation_timestamp),
+            digest,
+            raw.length if isinstance(raw, RawDataRef) else len(raw),
+            raw.source if isinstance(raw, RawDataRef) else None,
+            raw.offset if isinstance(raw, RawDataRef) else None,
+            raw if isinstance(raw, str) else None,
+            int(ext.modified),
+            json.dumps(data.document, ensure_ascii=False, separators=(',', ':'))
+        )).fetchone()[0]
+        written[seq] = ext
+        stale.add(seq)
+
+    def _count_rows(self, clause: Clause) -> int:
+        where, params = clause
+        with self._lock:
+            return self._conn.execute(
+                f'SELECT COUNT(*) FROM extensions{" WHERE " + where if where else ""}', params
+            ).fetchone()[0]
+
+    def _fetch(self, clause: Clause, order: str, limit: int, offset: int = 0) -> list[Extension]:
+        return [_row_to_extension(row) for row in self._fetch_rows(clause, order, limit, offset)]
+
+    def _fetch_rows(self, clause: Clause, order: str, limit: int, offset: int = 0) -> list[tuple]:
+        where, params = clause
+        with self._lock:
+            return self._conn.execute(
+                f'SELECT {_COLUMNS} FROM extensions{" WHERE " + where if where else ""} '
+                f'ORDER BY {order} LIMIT ? OFFSET ?',
+                [*params, limit, offset]
+            ).fetchall()
+
+    def _stream(self, clause: Clause, order: str = 'seq', after: Optional[Any] = None) -> Iterator[Extension]:
+        key = _COLUMNS.split(', ').index(order)
+        while True:
+            page = clause if after is None else _and([clause, (f'{order} > ?', [after])])
+            rows = self._fetch_rows(page, order, self._batch_size)
+            yield from map(_row_to_extension, rows)
+            if len(rows) < self._batch_size:
+                return
+            after = rows[-1][key]
+
+    def _query_clause(self, query: SearchQuery) -> Clause:
+        clauses: list[Clause] = []
+        kind = query.get_filter_value('kind')
+        if kind:
+            clauses.append(('(kind = ? OR kind IS NULL)' if kind == UNKNOWN_KIND else 'kind = ?', [kind]))
+        api_version = query.get_filter_value('apiVersion')
+        if api_version:
+            clauses.append(('api_version = ?', [api_version]))
+        metadata_name = query.get_filter_value('metadata.name')
+        if metadata_name:
+            clauses.append(('metadata_name = ?', [metadata_name]))
+        if query.has_created_range():
+            clauses.append(_created_clause(query.created))
+        if self._full_text and query.has_text_criteria():
+            expression = _plan_expression(plan_for_query(query))
+            if expression is not None:
+                clauses.append(_full_text_clause(expression))
+        return _and(clauses)
+
+    def _query_predicate(self, query: SearchQuery) -> Optional[Callable[[Extension], bool]]:
+        keyword_match = self._search_service.matcher(query) if query.has_text_criteria() else None
+        selector = query.label_selector if query.has_label_selector() else None
+        if keyword_match is None and selector is None:
+            return None
+        if selector is None:
+            return keyword_match
+        if keyword_match is None:
+            return lambda ext: selector.matches(_labels(ext))
+        return lambda ext: selector.matches(_labels(ext)) and keyword_match(ext)
+
+
+def _close(conn: sqlite3.Connection, temporary_path: Optional[str]) -> None:
+    conn.close()
+    if temporary_path is None:
+        return
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            os.remove(temporary_path + suffix)
+        except OSError:
+            pass
+
+
+def _and(clauses: list[Clause]) -> Clause:
+    clauses = [clause for clause in clauses if clause[0]]
+    if not clauses:
+        return '', []
+    if len(clauses) == 1:
+        return clauses[0]
+    return ' AND '.join(f'({where})' for where, _ in clauses), [param for _, params in clauses for param in params]
+
+
+def _created_clause(created: TimeRange) -> Clause:
+    start, end = created.bounds()
+    parts, params = [], []
+    if start is not None:
+        parts.append('created_at >= ?')
+        params.append(start)
+    if end is not None:
+        parts.append('created_at < ?')
+        params.append(end)
+    return ' AND '.join(parts), params
+
+
+def _full_text_clause(expression: str) -> Clause:
+    return 'seq IN (SELECT rowid FROM extensions_fts WHERE extensions_fts MATCH ?)', [expression]
+
+
+def _full_text_body(ext: Extension) -> str:
+    return _TEXT_SEPARATOR.join(set(_TEXT_SEPARATOR.join(TrigramIndex.iter_texts(ext)).casefold().split()))
+
+
+def _plan_expression(plan: list) -> Optional[str]:
+    terms = []
+    for item in plan:
+        if isinstance(item, tuple):
+            branches = [_plan_expression(branch) for branch in item[1]]
+            if not branches or None in branches:
+                continue
+            terms.append(f'({" OR ".join(branches)})')
+            continue
+        grams = TrigramIndex.text_grams(item.casefold())
+        if grams:
+            terms.append(' AND '.join('"' + gram.replace('"', '""') + '"' for gram in sorted(grams)))
+    return ' AND '.join(terms) if terms else None
+
+
+def _labels(ext: Extension) -> Optional[dict]:
+    metadata = ext.data.metadata
+    return metadata.labels if metadata and isinstance(metadata.labels, dict) else None
+
+
+def _row_to_extension(row: tuple) -> Extension:
+    _, name, version, data, digest, length, source, offset, raw_text, modified = row
+    return Extension(
+        name=name,
+        version=version,
+        data=ExtensionData.from_document(json.loads(data)),
+        raw_data=raw_text if raw_text is not None else RawDataRef(digest, length, source, offset),
+        modified=bool(modified)
+    )
@@ -0,0 +1,3 @@
+from modules.infrastructure.services.checkpoint.checkpoint_store import (
+    CheckpointStore, Checkpoint, StageProgress, CheckpointError, fingerprint_file, fingerprint_rules
+)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterable, Iterator, Optional
+
+from modules.infrastructure.types.replace_types import ReplaceResult, ReplaceRule, ReplaceScope
+
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointError(Exception):
+    def __init__(self, message: str, code: str = 'UNKNOWN'):
+        super().__init__(message)
+        self.code = code
+
+
+def fingerprint_file(filepath: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_rules(rules: list[ReplaceRule], scope: ReplaceScope) -> str:
+    return hashlib.blake2b(repr((rules, scope)).encode('utf-8'), digest_size=16).hexdigest()
+
+
+@dataclass
+class StageProgress:
+    index: int = 0
+    bytes: int = 0
+    done: bool = False
+    updated: int = 0
+    changes: int = 0
+    report_bytes: int = 0
+
+
+@dataclass
+class Checkpoint:
+    input_digest: str
+    rules_digest: str
+    replace: StageProgress = field(default_factory=StageProgress)
+    export: StageProgress = field(default_factory=StageProgress)
+    version: int = CHECKPOINT_VERSION
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Checkpoint':
+        return cls(
+            input_digest=data['input_digest'],
+            rules_digest=data['rules_digest'],
+            replace=StageProgress(**data['replace']),
+            export=StageProgress(**data['export']),
+            version=data['version']
+        )
+
+
+class CheckpointStore:
+    DEFAULT_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        path: str,
+        input_path: str,
+        rules_digest: str,
+        interval: float = DEFAULT_INTERVAL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._path = path
+        self._input_path = input_path
+        self._rules_digest = rules_digest
+        self._interval = interval
+        self._clock = clock
+        self._last_commit = clock()
+        self._checkpoint: Optional[Checkpoint] = None
+        self._resumed = False
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def updates_path(self) -> str:
+        return f'{self._path}.updates'
+
+    @property
+    def checkpoint(self) -> Checkpoint:
+        if self._checkpoint is None:
+            raise CheckpointError('断点尚未打开', 'NOT_OPEN')
+        return self._checkpoint
+
+    @property
+    def resumed(self) -> bool:
+        return self._resumed
+
+    def open(self, resume: bool = False) -> Checkpoint:
+        input_digest = fingerprint_file(self._input_path)
+        if resume and os.path.exists(self._path):
+            checkpoint = self._read()
+            if checkpoint.input_digest != input_digest:
+                raise CheckpointError('输入文件自上次断点以来已被修改, 无法继续', 'INPUT_CHANGED')
+            if checkpoint.rules_digest != self._rules_digest:
+                raise CheckpointError('替换规则或范围与断点记录不一致, 无法继续', 'RULES_CHANGED')
+            self._checkpoint = checkpoint
+            self._resumed = True
+        else:
+            self.discard()
+            self._checkpoint = Checkpoint(input_digest, self._rules_digest)
+            self._resumed = False
+            self.commit()
+        return self._checkpoint
+
+    def due(self) -> bool:
+        return self._clock() - self._last_commit >= self._interval
+
+    def commit(self) -> None:
+        temp_path = f'{self._path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self.checkpoint), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._path)
+        self._last_commit = self._clock()
+
+    def record_updates(self, results: Iterable[ReplaceResult]) -> None:
+        progress = self.checkpoint.replace
+        if os.path.exists(self.updates_path):
+            os.truncate(self.updates_path, progress.bytes)
+        with open(self.updates_path, 'a', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps({
+                    'source': result.source_name,
+                    'name': result.updated.name,
+                    'data': result.updated.data.document,
+                }, ensure_ascii=False))
+                f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+            progress.bytes = os.fstat(f.fileno()).st_size
+
+    def iter_updates(self) -> Iterator[dict]:
+        progress = self.checkpoint.replace
+        if not progress.bytes:
+            return
+        with open(self.updates_path, 'rb') as f:
+            committed = f.read(progress.bytes)
+        if len(committed) != progress.bytes:
+            raise CheckpointError(f'断点数据不完整: {self.updates_path}', 'UPDATES_TRUNCATED')
+        for line in committed.split(b'\n'):
+            if line.strip():
+                yield json.loads(line)
+
+    def discard(self) -> None:
+        for path in (self._path, self.updates_path, f'{self._path}.tmp'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _read(self) -> Checkpoint:
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                checkpoint = Checkpoint.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise CheckpointError(f'无法读取断点文件: {self._path}', 'INVALID_CHECKPOINT') from e
+        if checkpoint.version != CHECKPOINT_VERSION:
+            raise CheckpointError(f'不支持的断点文件版本: {checkpoint.version}', 'INVALID_CHECKPOINT')
+        return checkpoint
@@ -2,50 +2,92 @@ from __future__ import annotations
 
 import base64
 import json
+import sys
+from typing import Any, Iterable, Iterator, Optional
 
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
+from modules.core.tasks.task_control import TaskControl
 from modules.domain.entities.extension import Extension, ExtensionItem
-from modules.domain.entities.extension_data import ExtensionData, Metadata
+from modules.domain.entities.extension_data import ExtensionData
+from modules.domain.value_objects.raw_data_ref import RawDataRef
 
 
 class Base64Decoder:
-    def decode(self, items: list[ExtensionItem]) -> list[Extension]:
-        return [self._decode_item(item) for item in items]
+    def __init__(self, metrics: Optional[IMetricsRegistry] = None, intern_strings: bool = True):
+        self._metrics = metrics or NullMetricsRegistry()
+        self._intern_strings = intern_strings
 
-    def _decode_item(self, item: ExtensionItem) -> Extension:
+    def decode(
+        self,
+        items: list[ExtensionItem],
+        lean: bool = False,
+        source: Optional[str] = None,
+        control: Optional[TaskControl] = None
+    ) -> list[Extension]:
+        with self._metrics.time('halo_stage_duration_seconds', stage='decode'):
+            tracked = control.track(items, 'decode', len(items), _item_size) if control else items
+            extensions = [self._decode_item(item, lean, source) for item in tracked]
+        self._metrics.increment('halo_items_decoded_total', len(extensions))
+        return extensions
+
+    def iter_decode(
+        self,
+        items: Iterable[ExtensionItem],
+        control: Optional[TaskControl] = None,
+        lean: bool = False,
+        source: Optional[str] = None
+    ) -> Iterator[Extension]:
+        for item in control.track(items, 'decode', size=_item_size) if control else items:
+            extension = self._decode_item(item, lean, source)
+            self._metrics.increment('halo_items_decoded_total')
+            yield extension
+
+    def _decode_item(self, item: ExtensionItem, lean: bool = False, source: Optional[str] = None) -> Extension:
         decoded_data = self._decode_base64(item.data)
         return Extension(
             name=item.name,
             version=item.version,
             data=decoded_data,
-            raw_data=item.data
+            raw_data=RawDataRef.of(item.data, source, item.offset) if lean else item.data
         )
 
     def _decode_base64(self, base64_string: str) -> ExtensionData:
-        decoded_bytes = base64.b64decode(base64_string)
-        json_string = decoded_bytes.decode('utf-8')
-        parsed = json.loads(json_string)
-        return self._dict_to_extension_data(parsed)
-
-    def _dict_to_extension_data(self, data: dict) -> ExtensionData:
-        metadata = None
-        if 'metadata' in data and data['metadata']:
-            m = data['metadata']
-            metadata = Metadata(
-                name=m.get('name'),
-                annotations=m.get('annotations'),
-                labels=m.get('labels'),
-                resource_version=m.get('resourceVersion'),
-                creation_timestamp=m.get('creationTimestamp'),
-                version=m.get('version')
-            )
-
-        return ExtensionData(
-            api_version=data.get('apiVersion'),
-            kind=data.get('kind'),
-            metadata=metadata,
-            spec=data.get('spec'),
-            data=data.get('data')
-        )
+        parsed = json.loads(base64.b64decode(base64_string))
+        return ExtensionData.from_document(self._intern_document(parsed))
+
+    def _intern_document(self, document: dict) -> dict:
+        if not self._intern_strings:
+            return document
+        for key in ('apiVersion', 'kind'):
+            if key in document:
+                document[key] = self._intern(document[key])
+        metadata = document.get('metadata')
+        if isinstance(metadata, dict):
+            if 'annotations' in metadata:
+                metadata['annotations'] = self._intern_keys(metadata['annotations'])
+            if 'labels' in metadata:
+                metadata['labels'] = self._intern_items(metadata['labels'])
+        return document
+
+    def _intern(self, value: Any) -> Any:
+        if self._intern_strings and type(value) is str:
+            return sys.intern(value)
+        return value
+
+    def _intern_keys(self, mapping: Any) -> Any:
+        if not self._intern_strings or not isinstance(mapping, dict):
+            return mapping
+        return {sys.intern(key) if type(key) is str else key: value for key, value in mapping.items()}
+
+    def _intern_items(self, mapping: Any) -> Any:
+        if not self._intern_strings or not isinstance(mapping, dict):
+            return mapping
+        intern = self._intern
+        return {intern(key): intern(value) for key, value in mapping.items()}
+
+
+def _item_size(item: ExtensionItem) -> int:
+    return len(item.data)
 
 
 base64_decoder = Base64Decoder()
@@ -2,17 +2,64 @@ from __future__ import annotations
 
 import base64
 import json
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
 
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
+from modules.core.tasks.task_control import TaskControl
 from modules.domain.entities.extension import Extension, ExtensionItem
 from modules.domain.entities.extension_data import ExtensionData
+from modules.domain.value_objects.raw_data_ref import RawDataRef
+
+RawReader = Callable[[RawDataRef], Optional[str]]
 
 
 class Base64Encoder:
-    def encode(self, extensions: list[Extension]) -> list[ExtensionItem]:
-        return [self._encode_extension(ext) for ext in extensions]
+    CHUNK_SIZE = 1000
+
+    def __init__(self, metrics: Optional[IMetricsRegistry] = None):
+        self._metrics = metrics or NullMetricsRegistry()
+
+    def encode(self, extensions: list[Extension], raw_reader: Optional[RawReader] = None) -> list[ExtensionItem]:
+        with self._metrics.time('halo_stage_duration_seconds', stage='encode'):
+            items = [self._encode_extension(ext, raw_reader) for ext in extensions]
+        self._metrics.increment('halo_items_encoded_total', len(items))
+        return items
 
-    def _encode_extension(self, extension: Extension) -> ExtensionItem:
-        encoded_data = self._encode_base64(extension.data)
+    def iter_encode(
+        self,
+        extensions: Iterable[Extension],
+        chunk_size: int = CHUNK_SIZE,
+        control: Optional[TaskControl] = None,
+        total: Optional[int] = None,
+        raw_reader: Optional[RawReader] = None
+    ) -> Iterator[ExtensionItem]:
+        items = self._iter_chunks(iter(extensions), chunk_size, raw_reader)
+        if control:
+            return control.track(items, 'encode', total, lambda item: len(item.data))
+        return items
+
+    def _iter_chunks(
+        self,
+        iterator: Iterator[Extension],
+        chunk_size: int,
+        raw_reader: Optional[RawReader]
+    ) -> Iterator[ExtensionItem]:
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield from self.encode(chunk, raw_reader)
+
+    def _encode_extension(self, extension: Extension, raw_reader: Optional[RawReader] = None) -> ExtensionItem:
+        encoded_data = None
+        if not extension.modified:
+            if isinstance(extension.raw_data, str):
+                encoded_data = extension.raw_data
+            elif isinstance(extension.raw_data, RawDataRef) and raw_reader is not None:
+                encoded_data = raw_reader(extension.raw_data)
+        if encoded_data is None:
+            encoded_data = self._encode_base64(extension.data)
         return ExtensionItem(
             name=extension.name,
             version=extension.version,
@@ -20,37 +67,8 @@ class Base64Encoder:
         )
 
     def _encode_base64(self, data: ExtensionData) -> str:
-        data_dict = self._extension_data_to_dict(data)
-        json_string = json.dumps(data_dict, ensure_ascii=False)
+        json_string = json.dumps(data.document, ensure_ascii=False)
         return base64.b64encode(json_string.encode('utf-8')).decode()
 
-    def _extension_data_to_dict(self, data: ExtensionData) -> dict:
-        result = {}
-        if data.api_version is not None:
-            result['apiVersion'] = data.api_version
-        if data.kind is not None:
-            result['kind'] = data.kind
-        if data.metadata is not None:
-            m = data.metadata
-            metadata = {}
-            if m.name is not None:
-                metadata['name'] = m.name
-            if m.annotations is not None:
-                metadata['annotations'] = m.annotations
-            if m.labels is not None:
-                metadata['labels'] = m.labels
-            if m.resource_version is not None:
-                metadata['resourceVersion'] = m.resource_version
-            if m.creation_timestamp is not None:
-                metadata['creationTimestamp'] = m.creation_timestamp
-            if m.version is not None:
-                metadata['version'] = m.version
-            result['metadata'] = metadata
-        if data.spec is not None:
-            result['spec'] = data.spec
-        if data.data is not None:
-            result['data'] = data.data
-        return result
-
 
 base64_encoder = Base64Encoder()
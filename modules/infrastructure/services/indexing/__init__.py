@@ -0,0 +1,3 @@
+from modules.infrastructure.services.indexing.trigram_index import TrigramIndex, LiteralPlan, plan_for_literal, plan_for_regex, plan_for_query
+from modules.infrastructure.services.indexing.field_index import ExtensionFieldIndex
+from modules.infrastructure.services.indexing.categorical_column import CategoricalColumn
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Hashable, Iterable, Optional
+
+ABSENT = 0
+_MISSING_VALUE = object()
+
+
+class CategoricalColumn:
+    def __init__(self):
+        self._codes = array('H')
+        self._categories: list[Optional[Hashable]] = [_MISSING_VALUE]
+        self._lookup: dict[Optional[Hashable], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self._codes.itemsize * len(self._codes)
+
+    def set(self, row: int, value: Optional[Hashable]) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self._categories)
+            self._categories.append(value)
+            if code > 0xFFFF and self._codes.typecode == 'H':
+                self._codes = array('I', self._codes)
+        codes = self._codes
+        if row >= len(codes):
+            codes.extend(array(codes.typecode, bytes(codes.itemsize * (row + 1 - len(codes)))))
+        codes[row] = code
+
+    def discard(self, row: int) -> None:
+        if row < len(self._codes):
+            self._codes[row] = ABSENT
+
+    def get(self, row: int, default: Optional[Hashable] = None) -> Optional[Hashable]:
+        if row >= len(self._codes) or self._codes[row] == ABSENT:
+            return default
+        return self._categories[self._codes[row]]
+
+    def clear(self) -> None:
+        self._codes = array('H')
+        self._categories = [_MISSING_VALUE]
+        self._lookup.clear()
+
+    def counts(self) -> dict[Optional[Hashable], int]:
+        categories = self._categories
+        return {
+            categories[code]: count
+            for code, count in Counter(self._codes).items()
+            if code != ABSENT
+        }
+
+    def rows(self, values: Iterable[Optional[Hashable]]) -> list[int]:
+        codes = {self._lookup[value] for value in values if value in self._lookup}
+        if not codes:
+            return []
+        if len(codes) == 1:
+            selector = map(next(iter(codes)).__eq__, self._codes)
+        else:
+            selector = map(codes.__contains__, self._codes)
+        return list(compress(range(len(self._codes)), selector))
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from threading import RLock
+from typing import Hashable, Iterable, Optional
+
+from modules.domain.entities.extension import Extension
+from modules.domain.value_objects.label_selector import LabelRequirement, LabelSelector
+from modules.domain.value_objects.time_range import TimeRange, timestamp_key
+from modules.infrastructure.services.indexing.categorical_column import CategoricalColumn
+
+UNKNOWN_KIND = 'Unknown'
+
+
+class ExtensionFieldIndex:
+    def __init__(self, columnar: bool = False):
+        self._columnar = columnar
+        self._names_at: list[Optional[str]] = []
+        self._kind_column = CategoricalColumn()
+        self._api_version_column = CategoricalColumn()
+        self._positions: dict[str, int] = {}
+        self._next_position = 0
+        self._kinds: dict[Optional[str], set[str]] = {}
+        self._api_versions: dict[Optional[str], set[str]] = {}
+        self._metadata_names: dict[Optional[str], set[str]] = {}
+        self._label_values: dict[tuple[str, str], set[str]] = {}
+        self._label_keys: dict[str, set[str]] = {}
+        self._created_at: dict[str, float] = {}
+        self._created: Optional[list[tuple[float, str]]] = None
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def add(self, extension: Extension) -> None:
+        with self._lock:
+            name = extension.name
+            if name not in self._positions:
+                self._positions[name] = self._next_position
+                self._next_position += 1
+                if self._columnar:
+                    self._names_at.append(name)
+            self._add_postings(extension)
+            self._set_created(name, self._created_key(extension))
+
+    def remove(self, extension: Extension) -> None:
+        with self._lock:
+            position = self._positions.pop(extension.name, None)
+            if self._columnar and position is not None:
+                self._names_at[position] = None
+                self._kind_column.discard(position)
+                self._api_version_column.discard(position)
+            self._drop_postings(extension)
+            self._set_created(extension.name, None)
+
+    def replace(self, old: Extension, new: Extension) -> None:
+        with self._lock:
+            if old.name != new.name:
+                self.remove(old)
+                self.add(new)
+                return
+            self._drop_postings(old)
+            self._add_postings(new)
+            self._set_created(new.name, self._created_key(new))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._positions.clear()
+            self._next_position = 0
+            self._kinds.clear()
+            self._api_versions.clear()
+            self._metadata_names.clear()
+            self._label_values.clear()
+            self._label_keys.clear()
+            self._created_at.clear()
+            self._created = None
+            self._names_at.clear()
+            self._kind_column.clear()
+            self._api_version_column.clear()
+
+    def kind_counts(self) -> dict[str, int]:
+        with self._lock:
+            if self._columnar:
+                kind_sizes = self._kind_column.counts().items()
+            else:
+                kind_sizes = ((kind, len(names)) for kind, names in self._kinds.items())
+            counts: dict[str, int] = {}
+            for kind, size in kind_sizes:
+                key = kind or UNKNOWN_KIND
+                counts[key] = counts.get(key, 0) + size
+            return counts
+
+    def select(
+        self,
+        kind: Optional[str] = None,
+        scope_kinds: Optional[Iterable[str]] = None,
+        api_version: Optional[str] = None,
+        metadata_name: Optional[str] = None,
+        label_selector: Optional[LabelSelector] = None,
+        created: Optional[TimeRange] = None
+    ) -> Optional[list[str]]:
+        with self._lock:
+            sets: list[set[str]] = []
+            if kind:
+                sets.append(self._kind_names([kind, None] if kind == UNKNOWN_KIND else [kind]))
+            if scope_kinds:
+                sets.append(self._kind_names([None, *scope_kinds]))
+            if api_version:
+                sets.append(self._api_version_names(api_version))
+            if metadata_name:
+                sets.append(self._metadata_names.get(metadata_name, set()))
+            if created is not None and not created.is_unbounded():
+                sets.append(set(self._created_names(created)))
+            excluded: list[set[str]] = []
+            if label_selector is not None:
+                for requirement in label_selector.requirements:
+                    names, negated = self._label_names(requirement)
+                    (excluded if negated else sets).append(names)
+            if not sets and not excluded:
+                return None
+            if sets:
+                sets.sort(key=len)
+                result = set(sets[0]).intersection(*sets[1:])
+            else:
+                result = set(self._positions)
+            for names in excluded:
+                result -= names
+            positions = self._positions
+            return sorted(result, key=positions.__getitem__)
+
+    def created_between(self, created: TimeRange) -> list[str]:
+        with self._lock:
+            return self._created_names(created)
+
+    def _created_names(self, created: TimeRange) -> list[str]:
+        start, end = created.bounds()
+        entries = self._created
+        if entries is None:
+            entries = self._created = sorted((stamp, name) for name, stamp in self._created_at.items())
+        lo = 0 if start is None else bisect_left(entries, (start,))
+        hi = len(entries) if end is None else bisect_left(entries, (end,))
+        return [name for _, name in entries[lo:hi]]
+
+    def _kind_names(self, kinds: list[Optional[str]]) -> set[str]:
+        if self._columnar:
+            return self._column_names(self._kind_column, kinds)
+        names: set[str] = set()
+        for kind in kinds:
+            names |= self._kinds.get(kind, set())
+        return names
+
+    def _api_version_names(self, api_version: str) -> set[str]:
+        if self._columnar:
+            return self._column_names(self._api_version_column, [api_version])
+        return self._api_versions.get(api_version, set())
+
+    def _column_names(self, column: CategoricalColumn, values: list[Optional[str]]) -> set[str]:
+        names_at = self._names_at
+        return {names_at[row] for row in column.rows(values)}
+
+    def _label_names(self, requirement: LabelRequirement) -> tuple[set[str], bool]:
+        if requirement.operator in (LabelRequirement.EXISTS, LabelRequirement.NOT_EXISTS):
+            return self._label_keys.get(requirement.key, set()), requirement.operator == LabelRequirement.NOT_EXISTS
+        names: set[str] = set()
+        for value in requirement.values:
+            names |= self._label_values.get((requirement.key, value), set())
+        return names, requirement.operator == LabelRequirement.NOT_IN
+
+    def _add_postings(self, extension: Extension) -> None:
+        name = extension.name
+        for postings, key in self._keys(extension):
+            postings.setdefault(key, set()).add(name)
+        if self._columnar:
+            position = self._positions[name]
+            data = extension.data
+            self._kind_column.set(position, self._kind_key(data.kind))
+            self._api_version_column.set(position, self._api_version_key(data.api_version))
+
+    def _drop_postings(self, extension: Extension) -> None:
+        name = extension.name
+        for postings, key in self._keys(extension):
+            names = postings.get(key)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del postings[key]
+
+    def _set_created(self, name: str, stamp: Optional[float]) -> None:
+        previous = self._created_at.get(name)
+        if previous == stamp:
+            return
+        if stamp is None:
+            del self._created_at[name]
+        else:
+            self._created_at[name] = stamp
+        entries = self._created
+        if entries is None:
+            return
+        if previous is not None:
+            index = bisect_left(entries, (previous, name))
+            if index < len(entries) and entries[index] == (previous, name):
+                del entries[index]
+        if stamp is not None:
+            insort(entries, (stamp, name))
+
+    @staticmethod
+    def _created_key(extension: Extension) -> Optional[float]:
+        metadata = extension.data.metadata
+        return timestamp_key(metadata.creation_timestamp) if metadata else None
+
+    @staticmethod
+    def _kind_key(kind: Optional[str]) -> Optional[str]:
+        return kind if isinstance(kind, str) and kind else None
+
+    @staticmethod
+    def _api_version_key(api_version: Optional[str]) -> Optional[str]:
+        return api_version if isinstance(api_version, str) else None
+
+    def _keys(self, extension: Extension) -> list[tuple[dict, Hashable]]:
+        data = extension.data
+        metadata = data.metadata
+        keys: list[tuple[dict, Hashable]] = [
+            (self._metadata_names, metadata.name if metadata and isinstance(metadata.name, str) else None),
+        ]
+        if not self._columnar:
+            keys.append((self._kinds, self._kind_key(data.kind)))
+            keys.append((self._api_versions, self._api_version_key(data.api_version)))
+        labels = metadata.labels if metadata and isinstance(metadata.labels, dict) else None
+        if labels:
+            for key, value in labels.items():
+                keys.append((self._label_keys, key))
+                if isinstance(value, str):
+                    keys.append((self._label_values, (key, value)))
+        return keys
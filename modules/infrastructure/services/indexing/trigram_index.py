@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import re
+from threading import RLock
+from typing import Any, Iterable, Iterator, Optional, Union
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+from modules.domain.entities.extension import Extension
+from modules.domain.value_objects.search_query import SearchQuery
+
+LiteralPlan = list[Union[str, tuple]]
+_REPEAT_OPS = tuple(
+    getattr(sre_constants, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(sre_constants, name)
+)
+_ATOMIC_GROUP = getattr(sre_constants, 'ATOMIC_GROUP', None)
+_OR = 'or'
+
+
+class TrigramIndex:
+    GRAM = 3
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._names: dict[int, str] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._next_id = 0
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, extension: Extension) -> None:
+        with self._lock:
+            doc_id = self._ids.get(extension.name)
+            if doc_id is None:
+                doc_id = self._ids[extension.name] = self._next_id
+                self._names[doc_id] = extension.name
+                self._next_id += 1
+            postings = self._postings
+            for gram in self.extension_grams(extension):
+                docs = postings.get(gram)
+                if docs is None:
+                    postings[gram] = {doc_id}
+                else:
+                    docs.add(doc_id)
+
+    def remove(self, extension: Extension) -> None:
+        with self._lock:
+            doc_id = self._ids.pop(extension.name, None)
+            if doc_id is None:
+                return
+            del self._names[doc_id]
+            postings = self._postings
+            for gram in self.extension_grams(extension):
+                docs = postings.get(gram)
+                if docs is not None:
+                    docs.discard(doc_id)
+                    if not docs:
+                        del postings[gram]
+
+    def replace(self, old: Extension, new: Extension) -> None:
+        with self._lock:
+            if old.name == new.name:
+                doc_id = self._ids.get(old.name)
+                old_grams, new_grams = self.extension_grams(old), self.extension_grams(new)
+                if doc_id is not None:
+                    for gram in old_grams - new_grams:
+                        docs = self._postings.get(gram)
+                        if docs is not None:
+                            docs.discard(doc_id)
+                            if not docs:
+                                del self._postings[gram]
+                    for gram in new_grams - old_grams:
+                        self._postings.setdefault(gram, set()).add(doc_id)
+                    return
+            self.remove(old)
+            self.add(new)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+            self._names.clear()
+            self._postings.clear()
+            self._next_id = 0
+
+    def candidates(self, plans: Iterable[LiteralPlan]) -> Optional[list[str]]:
+        with self._lock:
+            union: set[int] = set()
+            for plan in plans:
+                docs = self._match_plan(plan)
+                if docs is None:
+                    return None
+                union |= docs
+            return [self._names[doc_id] for doc_id in sorted(union)]
+
+    def _match_plan(self, plan: LiteralPlan) -> Optional[set[int]]:
+        result: Optional[set[int]] = None
+        for item in plan:
+            if isinstance(item, tuple):
+                docs: Optional[set[int]] = set()
+                for branch in item[1]:
+                    branch_docs = self._match_plan(branch)
+                    if branch_docs is None:
+                        docs = None
+                        break
+                    docs |= branch_docs
+            else:
+                docs = self._match_literal(item)
+            if docs is None:
+                continue
+            result = docs if result is None else result & docs
+            if not result:
+                return set()
+        return result
+
+    def _match_literal(self, literal: str) -> Optional[set[int]]:
+        grams = self.text_grams(literal.casefold())
+        if not grams:
+            return None
+        postings = self._postings
+        sets = []
+        for gram in grams:
+            docs = postings.get(gram)
+            if not docs:
+                return set()
+            sets.append(docs)
+        sets.sort(key=len)
+        return set(sets[0]).intersection(*sets[1:])
+
+    @classmethod
+    def text_grams(cls, text: str) -> set[str]:
+        return cls._word_grams(text.split())
+
+    @classmethod
+    def extension_grams(cls, extension: Extension) -> set[str]:
+        words: set[str] = set()
+        for text in cls.iter_texts(extension):
+            words.update(text.casefold().split())
+        return cls._word_grams(words)
+
+    @staticmethod
+    def _word_grams(words: Iterable[str]) -> set[str]:
+        return {word[i:i + 3] for word in words for i in range(len(word) - 2)}
+
+    @classmethod
+    def iter_texts(cls, extension: Extension) -> Iterator[str]:
+        yield extension.name
+        data = extension.data
+        for value in (data.api_version, data.kind):
+            if isinstance(value, str):
+                yield value
+        if data.metadata:
+            for value in data.metadata.document.values():
+                if value is not None:
+                    yield from cls._iter_value(value)
+        if data.data:
+            yield from cls._iter_value(data.data)
+        if data.spec:
+            yield from cls._iter_value(data.spec)
+
+    @classmethod
+    def _iter_value(cls, value: Any) -> Iterator[str]:
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                yield str(key)
+                yield from cls._iter_value(item)
+        elif isinstance(value, list):
+            for item in value:
+                yield from cls._iter_value(item)
+        elif value is not None:
+            yield str(value)
+
+
+def plan_for_literal(text: str) -> LiteralPlan:
+    return [text]
+
+
+def plan_for_regex(pattern: str) -> Optional[LiteralPlan]:
+    try:
+        re.compile(pattern)
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError):
+        return None
+    plan = _sequence_plan(parsed)
+    return plan if _is_selective(plan) else None
+
+
+def plan_for_query(query: SearchQuery) -> LiteralPlan:
+    plan: LiteralPlan = [literal for kw in query.keywords for literal in plan_for_literal(kw.strip())]
+    for term in query.terms:
+        term_plan = plan_for_regex(term.value) if term.regex else plan_for_literal(term.value)
+        if term_plan is not None:
+            plan.extend(term_plan)
+    return plan
+
+
+def _sequence_plan(items) -> LiteralPlan:
+    plan: LiteralPlan = []
+    run: list[str] = []
+
+    def flush():
+        if run:
+            plan.append(''.join(run))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+        elif op is sre_constants.AT:
+            continue
+        elif op is sre_constants.SUBPATTERN:
+            flush()
+            plan.extend(_sequence_plan(av[-1]))
+        elif _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+            flush()
+            plan.extend(_sequence_plan(av))
+        elif op in _REPEAT_OPS:
+            flush()
+            if av[0] >= 1:
+                plan.extend(_sequence_plan(av[2]))
+        elif op is sre_constants.BRANCH:
+            flush()
+            branches = [_sequence_plan(branch) for branch in av[1]]
+            if all(_is_selective(branch) for branch in branches):
+                plan.append((_OR, branches))
+        else:
+            flush()
+    flush()
+    return plan
+
+
+def _is_selective(plan: LiteralPlan) -> bool:
+    return any(isinstance(item, tuple) or len(item) >= TrigramIndex.GRAM for item in plan)
@@ -1 +1,3 @@
 from modules.infrastructure.services.replace.default_replace_engine import DefaultReplaceEngine, default_replace_engine
+from modules.infrastructure.services.replace.batched_regex_executor import BatchedRegexExecutor
+from modules.infrastructure.services.replace.replace_result_cache import ReplaceResultCache, CachedReplaceState
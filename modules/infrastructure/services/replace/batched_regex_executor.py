@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Optional
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+from modules.infrastructure.types.replace_types import ReplaceRule
+
+_CONTEXT_SENSITIVE_OPS = {
+    sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT, sre_constants.GROUPREF_EXISTS
+}
+_REPEAT_OPS = tuple(
+    getattr(sre_constants, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(sre_constants, name)
+)
+_ATOMIC_GROUP = getattr(sre_constants, 'ATOMIC_GROUP', None)
+_SEPARATOR_CANDIDATES = ('\x00', '\x1f', '\n', '\uffff')
+
+
+class BatchedRegexExecutor:
+    def __init__(self, pattern: re.Pattern, rule: ReplaceRule):
+        self._pattern = pattern
+        self._replace = rule.replace
+        self._separator = next(
+            (c for c in _SEPARATOR_CANDIDATES if not pattern.search(c)),
+            _SEPARATOR_CANDIDATES[0]
+        )
+
+    @classmethod
+    def for_rule(cls, rule: ReplaceRule) -> Optional['BatchedRegexExecutor']:
+        if not rule.is_regex:
+            return None
+        try:
+            pattern = re.compile(rule.search)
+            pattern.sub(rule.replace, '')
+            parsed = sre_parse.parse(rule.search)
+        except (re.error, RecursionError):
+            return None
+        if pattern.fullmatch('') is not None or cls._is_context_sensitive(parsed):
+            return None
+        return cls(pattern, rule)
+
+    def run(self, leaves: list[str], max_matched_leaves: Optional[int] = None) -> Optional[tuple[dict[int, str], int]]:
+        if not leaves:
+            return {}, 0
+        if max_matched_leaves is None:
+            max_matched_leaves = len(leaves)
+
+        starts = list(accumulate(map((1).__add__, map(len, leaves)), initial=0))
+        buffer = self._separator.join(leaves)
+
+        replaced: dict[int, str] = {}
+        match_count = 0
+        search = self._pattern.search
+        matched_leaves = 0
+        match = search(buffer)
+        while match:
+            matched_leaves += 1
+            if matched_leaves > max_matched_leaves:
+                return None
+            index = bisect_right(starts, match.start()) - 1
+            leaf = leaves[index]
+            new_text, count = self._pattern.subn(self._replace, leaf)
+            if new_text != leaf:
+                replaced[index] = new_text
+            match_count += count
+            if index + 1 >= len(leaves):
+                break
+            match = search(buffer, starts[index + 1])
+        return replaced, match_count
+
+    @classmethod
+    def _is_context_sensitive(cls, parsed) -> bool:
+        for op, av in parsed:
+            if op in _CONTEXT_SENSITIVE_OPS:
+                return True
+            for sub in cls._subpatterns(op, av):
+                if cls._is_context_sensitive(sub):
+                    return True
+        return False
+
+    @staticmethod
+    def _subpatterns(op, av) -> list:
+        if op is sre_constants.SUBPATTERN:
+            return [av[-1]]
+        if op in _REPEAT_OPS:
+            return [av[2]]
+        if op is sre_constants.BRANCH:
+            return list(av[1])
+        if _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+            return [av]
+        return []
@@ -1,117 +1,602 @@
 from __future__ import annotations
 
 import re
-from typing import Any
+from bisect import bisect_right
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional, Sized
 
+from modules.core.metrics.metrics_registry import IMetricsRegistry, NullMetricsRegistry
+from modules.core.tasks.task_control import TaskControl
 from modules.domain.entities.extension import Extension
 from modules.domain.entities.extension_data import ExtensionData
+from modules.infrastructure.services.replace.batched_regex_executor import BatchedRegexExecutor
+from modules.infrastructure.services.replace.replace_result_cache import (
+    CachedReplaceState, ContentKey, ReplaceResultCache, RuleKey
+)
 from modules.infrastructure.types.replace_types import (
     ReplaceRule, ReplaceScope, PreviewChange, ReplaceResult,
-    BatchReplaceResult, IReplaceEngine
+    BatchReplaceResult, IReplaceEngine, ChangeSink
 )
 
 
+class _ReplaceCounters:
+    __slots__ = ('leaves', 'regex_calls', 'matches', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.leaves = 0
+        self.regex_calls = 0
+        self.matches = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+class _NewText:
+    __slots__ = ('value',)
+
+    def __init__(self, value: str):
+        self.value = value
+
+
+class _UnsupportedLeaf(Exception):
+    pass
+
+
+_UNCHANGED = CachedReplaceState(None, None, ())
+
+
+class _RuleState:
+    __slots__ = ('name', 'data', 'changes')
+
+    def __init__(self, name: str, data: ExtensionData, changes: Optional[list[PreviewChange]] = None):
+        self.name = name
+        self.data = data
+        self.changes = changes if changes is not None else []
+
+    def to_result(self, original: Extension) -> ReplaceResult:
+        return _result(original, self.name, self.data, self.changes)
+
+
+def _result(original: Extension, name: str, data: ExtensionData, changes: list[PreviewChange]) -> ReplaceResult:
+    return ReplaceResult(
+        extension_name=name,
+        changes=changes,
+        has_changes=bool(changes),
+        source_name=original.name,
+        original=original,
+        updated=original.update_all(name, original.version, data) if changes else None
+    )
+
+
 class DefaultReplaceEngine(IReplaceEngine):
     CHUNK_SIZE = 100
+    CACHED_CHUNK_SIZE = 1000
+    FIRST_BATCH_CHARS = 1 << 16
+    BATCH_CHARS = 1 << 22
+    DENSE_LEAF_RATIO = 0.1
+
+    def __init__(
+        self,
+        metrics: Optional[IMetricsRegistry] = None,
+        batched: bool = True,
+        cache: Optional[ReplaceResultCache] = None
+    ):
+        self._metrics = metrics or NullMetricsRegistry()
+        self._batched = batched
+        self._cache = cache
+
+    def apply(
+        self,
+        extensions: list[Extension],
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        on_change: Optional[ChangeSink] = None,
+        control: Optional[TaskControl] = None,
+        collect: bool = True
+    ) -> BatchReplaceResult:
+        counters = _ReplaceCounters()
+        if control:
+            total = len(extensions) if isinstance(extensions, Sized) else None
+            extensions = control.track(extensions, 'replace', total)
+        with self._metrics.time('halo_stage_duration_seconds', stage='replace'):
+            result = self._apply(extensions, rules, scope, counters, on_change, collect)
+        self._record_metrics(counters, result.total_changes)
+        if self._cache is not None:
+            self._metrics.increment('halo_replace_cache_hits_total', counters.cache_hits)
+            self._metrics.increment('halo_replace_cache_misses_total', counters.cache_misses)
+        return result
 
-    def apply(self, extensions: list[Extension], rules: list[ReplaceRule], scope: ReplaceScope) -> BatchReplaceResult:
+    def iter_apply(
+        self,
+        extensions: Iterable[Extension],
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        on_change: Optional[ChangeSink] = None
+    ) -> Iterator[tuple[Extension, Optional[ReplaceResult]]]:
+        counters = _ReplaceCounters()
+        total_changes = 0
+        try:
+            for ext in extensions:
+                result = self._apply_to_extension(ext, rules, scope, counters) if self._in_scope(ext, scope) else None
+                if result is None or not result.has_changes:
+                    yield ext, None
+                    continue
+                total_changes += len(result.changes)
+                if on_change:
+                    for change in result.changes:
+                        on_change(ext.name, change)
+                    result.changes = []
+                yield ext, result
+        finally:
+            self._record_metrics(counters, total_changes)
+
+    def _record_metrics(self, counters: _ReplaceCounters, total_changes: int) -> None:
+        self._metrics.increment('halo_leaves_visited_total', counters.leaves)
+        self._metrics.increment('halo_regex_calls_total', counters.regex_calls)
+        self._metrics.increment('halo_matches_total', counters.matches)
+        self._metrics.increment('halo_changes_total', total_changes)
+
+    def _apply(
+        self,
+        extensions: list[Extension],
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        counters: _ReplaceCounters,
+        on_change: Optional[ChangeSink] = None,
+        collect: bool = True
+    ) -> BatchReplaceResult:
         results: list[ReplaceResult] = []
         total_changes = 0
-
-        for ext in extensions:
-            ext_kind = ext.data.kind
-            if scope.selected_kinds and ext_kind and ext_kind not in scope.selected_kinds:
-                continue
-
-            result = self._apply_to_extension(ext, rules, scope)
-            if result.has_changes:
-                results.append(result)
+        updated_count = 0
+
+        in_scope = (ext for ext in extensions if self._in_scope(ext, scope))
+        batched_rule = self._batched_rule(rules) if self._batched else None
+        if self._cache is not None:
+            outcomes = self._apply_cached(in_scope, rules, scope, batched_rule, counters)
+        elif batched_rule:
+            outcomes = self._apply_batched(in_scope, rules, scope, *batched_rule, counters)
+        else:
+            outcomes = ((ext, self._apply_to_extension(ext, rules, scope, counters)) for ext in in_scope)
+
+        for ext, result in outcomes:
+            if result and result.has_changes:
                 total_changes += len(result.changes)
+                updated_count += 1
+                if on_change:
+                    for change in result.changes:
+                        on_change(ext.name, change)
+                    result.changes = []
+                if collect:
+                    results.append(result)
 
-        return BatchReplaceResult(results=results, total_changes=total_changes)
+        return BatchReplaceResult(results=results, total_changes=total_changes, updated_count=updated_count)
 
     def preview(self, extensions: list[Extension], rules: list[ReplaceRule], scope: ReplaceScope) -> BatchReplaceResult:
         return self.apply(extensions, rules, scope)
 
-    def _apply_to_extension(self, ext: Extension, rules: list[ReplaceRule], scope: ReplaceScope) -> ReplaceResult:
-        changes: list[PreviewChange] = []
-        new_data_dict = self._extension_data_to_dict(ext.data)
-        new_name = ext.name
-        has_changes = False
-
-        for rule in rules:
-            if not rule.search.strip():
+    def _in_scope(self, ext: Extension, scope: ReplaceScope) -> bool:
+        return scope.selects(ext.data)
+
+    def _batched_rule(self, rules: list[ReplaceRule]) -> Optional[tuple[int, BatchedRegexExecutor]]:
+        active = [(index, rule) for index, rule in enumerate(rules) if rule.search.strip()]
+        if len(active) != 1:
+            return None
+        rule_index, rule = active[0]
+        executor = BatchedRegexExecutor.for_rule(rule)
+        return (rule_index, executor) if executor else None
+
+    def _apply_cached(
+        self,
+        extensions: Iterable[Extension],
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        batched_rule: Optional[tuple[int, BatchedRegexExecutor]],
+        counters: _ReplaceCounters
+    ) -> Iterator[tuple[Extension, Optional[ReplaceResult]]]:
+        cache = self._cache
+        prefixes = cache.prefix_keys(rules, scope)
+        if not prefixes:
+            yield from ((ext, None) for ext in extensions)
+            return
+
+        iterator = iter(extensions)
+        while chunk := list(islice(iterator, self.CACHED_CHUNK_SIZE)):
+            yield from self._apply_cached_chunk(chunk, rules, scope, batched_rule, prefixes, counters)
+
+    def _apply_cached_chunk(
+        self,
+        extensions: list[Extension],
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        batched_rule: Optional[tuple[int, BatchedRegexExecutor]],
+        prefixes: list[RuleKey],
+        counters: _ReplaceCounters
+    ) -> list[list]:
+        cache = self._cache
+        outcomes: list[list] = []
+        batch_misses: list[list] = []
+        for ext in extensions:
+            content = cache.content_key(ext)
+            if content is None:
+                outcomes.append([ext, self._apply_to_extension(ext, rules, scope, counters)])
                 continue
+            state = cache.get(content, prefixes[-1])
+            if state is not None:
+                counters.cache_hits += 1
+                outcomes.append([ext, self._cached_result(ext, state)])
+                continue
+            counters.cache_misses += 1
+            if batched_rule:
+                rule_key = prefixes[-1][batched_rule[0]]
+                if cache.has_no_match(content, rule_key):
+                    cache.put(content, prefixes[-1], _UNCHANGED)
+                    outcomes.append([ext, None])
+                else:
+                    outcome = [ext, content]
+                    outcomes.append(outcome)
+                    batch_misses.append(outcome)
+            else:
+                outcomes.append([ext, self._apply_incremental(ext, content, rules, scope, prefixes, counters)])
+
+        if batch_misses:
+            rule_key = prefixes[-1][batched_rule[0]]
+            batched = self._apply_batched((ext for ext, _ in batch_misses), rules, scope, *batched_rule, counters)
+            for outcome, (_, result) in zip(batch_misses, batched):
+                content = outcome[1]
+                state = self._snapshot(result) if result and result.has_changes else _UNCHANGED
+                cache.put(content, prefixes[-1], state)
+                if state is _UNCHANGED:
+                    cache.add_no_match(content, rule_key)
+                outcome[1] = result
+        return outcomes
+
+    def _apply_incremental(
+        self,
+        ext: Extension,
+        content: ContentKey,
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        prefixes: list[RuleKey],
+        counters: _ReplaceCounters
+    ) -> ReplaceResult:
+        cache = self._cache
+        start, cached = 0, None
+        for end in range(len(prefixes) - 1, 0, -1):
+            cached = cache.get(content, prefixes[end - 1])
+            if cached is not None:
+                start = end
+                break
+
+        if cached is not None and not cached.unchanged:
+            state = _RuleState(cached.name, cached.data, list(cached.changes))
+        else:
+            state = _RuleState(ext.name, ext.data)
+
+        for rule_index in range(start, len(rules)):
+            rule_key = prefixes[rule_index][-1]
+            pristine = not state.changes
+            if not (pristine and cache.has_no_match(content, rule_key)):
+                changed = self._apply_rule(state, rule_index, rules[rule_index], scope, counters)
+                if pristine and not changed:
+                    cache.add_no_match(content, rule_key)
+            cache.put(content, prefixes[rule_index], self._snapshot(state) if state.changes else _UNCHANGED)
+        return state.to_result(ext)
+
+    def _snapshot(self, state: _RuleState | ReplaceResult) -> CachedReplaceState:
+        if isinstance(state, ReplaceResult):
+            return CachedReplaceState(state.extension_name, state.updated.data, tuple(state.changes))
+        return CachedReplaceState(state.name, state.data, tuple(state.changes))
+
+    def _cached_result(self, ext: Extension, state: CachedReplaceState) -> Optional[ReplaceResult]:
+        if state.unchanged:
+            return None
+        return _result(ext, state.name, state.data, list(state.changes))
+
+    def _apply_batched(
+        self,
+        extensions: Iterable[Extension],
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        rule_index: int,
+        executor: BatchedRegexExecutor,
+        counters: _ReplaceCounters
+    ) -> Iterator[tuple[Extension, Optional[ReplaceResult]]]:
+        chunk: list[tuple[Extension, int, int]] = []
+        values: list[str] = []
+        structural: list[str] = []
+        chars = 0
+        batch_chars = self.FIRST_BATCH_CHARS
+        dense = False
 
-            if scope.search_in_name:
-                replaced_name = self._apply_replace_to_text(ext.name, rule.search, rule.replace, rule.is_regex)
-                if replaced_name != ext.name:
-                    changes.append(PreviewChange(field='name', old=ext.name, new=replaced_name))
-                    new_name = replaced_name
-                    has_changes = True
-
-            current_data = new_data_dict
-
-            if scope.search_in_kind and current_data.get('kind'):
-                new_kind = self._apply_replace_to_text(current_data['kind'], rule.search, rule.replace, rule.is_regex)
-                if new_kind != current_data['kind']:
-                    changes.append(PreviewChange(field='kind', old=current_data['kind'], new=new_kind))
-                    new_data_dict = {**current_data, 'kind': new_kind}
-                    has_changes = True
-
-            if scope.search_in_metadata_name and current_data.get('metadata', {}).get('name'):
-                old_name = current_data['metadata']['name']
-                replaced_name = self._apply_replace_to_text(old_name, rule.search, rule.replace, rule.is_regex)
-                if replaced_name != old_name:
-                    changes.append(PreviewChange(field='metadata.name', old=old_name, new=replaced_name))
-                    new_metadata = {**current_data.get('metadata', {}), 'name': replaced_name}
-                    new_data_dict = {**current_data, 'metadata': new_metadata}
-                    has_changes = True
+        for ext in extensions:
+            if dense:
+                yield ext, self._apply_to_extension(ext, rules, scope, counters)
+                continue
+            value_start, structural_start = len(values), len(structural)
+            try:
+                self._collect_leaves(ext, scope, values, structural)
+            except _UnsupportedLeaf:
+                del values[value_start:], structural[structural_start:]
+                chunk.append((ext, -1, -1))
+                continue
+            chunk.append((ext, value_start, structural_start))
+            chars += sum(map(len, values[value_start:]))
+            if chars >= batch_chars:
+                outcomes = self._run_batch(chunk, values, structural, rules, scope, rule_index, executor, counters)
+                dense = outcomes is None
+                yield from outcomes or (
+                    (ext, self._apply_to_extension(ext, rules, scope, counters)) for ext, _, _ in chunk
+                )
+                chunk, values, structural, chars = [], [], [], 0
+                batch_chars = min(batch_chars * 4, self.BATCH_CHARS)
+
+        if chunk:
+            outcomes = self._run_batch(chunk, values, structural, rules, scope, rule_index, executor, counters)
+            yield from outcomes or ((ext, self._apply_to_extension(ext, rules, scope, counters)) for ext, _, _ in chunk)
+
+    def _run_batch(
+        self,
+        chunk: list[tuple[Extension, int, int]],
+        values: list[str],
+        structural: list[str],
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        rule_index: int,
+        executor: BatchedRegexExecutor,
+        counters: _ReplaceCounters
+    ) -> Optional[list[tuple[Extension, Optional[ReplaceResult]]]]:
+        counters.regex_calls += 2
+        value_run = executor.run(values, int(len(values) * self.DENSE_LEAF_RATIO))
+        structural_run = value_run and executor.run(structural, int(len(structural) * self.DENSE_LEAF_RATIO))
+        if not structural_run:
+            return None
+        replaced, value_matches = value_run
+        structural_replaced, structural_matches = structural_run
+        counters.leaves += len(values) + len(structural)
+        counters.matches += value_matches + structural_matches
+
+        supported = [i for i, (_, value_start, _) in enumerate(chunk) if value_start >= 0]
+        value_starts = [chunk[i][1] for i in supported]
+        structural_starts = [chunk[i][2] for i in supported]
+        fallback_exts = {supported[bisect_right(structural_starts, index) - 1] for index in structural_replaced}
+        changed_exts = {supported[bisect_right(value_starts, index) - 1] for index in replaced}
+
+        outcomes = []
+        for ext_index, (ext, value_start, _) in enumerate(chunk):
+            if value_start < 0 or ext_index in fallback_exts:
+                outcomes.append((ext, self._apply_to_extension(ext, rules, scope, counters)))
+            elif ext_index in changed_exts:
+                outcomes.append((ext, self._build_batched_result(ext, scope, value_start, replaced, rule_index)))
+            else:
+                outcomes.append((ext, None))
+        return outcomes
+
+    def _collect_leaves(self, ext: Extension, scope: ReplaceScope, values: list[str], structural: list[str]) -> None:
+        data = ext.data
+        top_level = []
+        if scope.search_in_name:
+            top_level.append(ext.name)
+        if scope.search_in_kind and data.kind:
+            top_level.append(data.kind)
+        if scope.search_in_metadata_name and data.metadata and data.metadata.name:
+            top_level.append(data.metadata.name)
+        if scope.search_in_api_version and data.api_version:
+            top_level.append(data.api_version)
+        if not all(isinstance(text, str) for text in top_level):
+            raise _UnsupportedLeaf()
+        structural.extend(top_level)
+
+        if scope.search_in_data and data.data:
+            if not all(isinstance(value, str) for value in data.data.values()):
+                raise _UnsupportedLeaf()
+            structural.extend(data.data)
+            values.extend(data.data.values())
+        if scope.search_in_spec and data.spec:
+            if not isinstance(data.spec, dict):
+                raise _UnsupportedLeaf()
+            self._collect_object_leaves(data.spec, values, structural)
+
+    def _collect_object_leaves(self, obj: dict, values: list[str], structural: list[str]) -> None:
+        structural.extend(obj)
+        for value in obj.values():
+            if isinstance(value, str):
+                values.append(value)
+            elif isinstance(value, (int, float)):
+                structural.append(str(value))
+            elif isinstance(value, list):
+                self._collect_array_leaves(value, values, structural)
+            elif isinstance(value, dict):
+                self._collect_object_leaves(value, values, structural)
 
-            if scope.search_in_api_version and current_data.get('apiVersion'):
-                new_api_version = self._apply_replace_to_text(current_data['apiVersion'], rule.search, rule.replace, rule.is_regex)
-                if new_api_version != current_data['apiVersion']:
-                    changes.append(PreviewChange(field='apiVersion', old=current_data['apiVersion'], new=new_api_version))
-                    new_data_dict = {**current_data, 'apiVersion': new_api_version}
-                    has_changes = True
+    def _collect_array_leaves(self, arr: list, values: list[str], structural: list[str]) -> None:
+        for item in arr:
+            if isinstance(item, str):
+                values.append(item)
+            elif isinstance(item, dict):
+                self._collect_object_leaves(item, values, structural)
 
-            if scope.search_in_data and current_data.get('data'):
-                data_result = self._replace_in_data(current_data['data'], rule.search, rule.replace, rule.is_regex)
-                if data_result['has_changes']:
-                    changes.extend(data_result['changes'])
-                    new_data_dict = {**current_data, 'data': data_result['new_data']}
-                    has_changes = True
+    def _value_leaf_paths(self, ext: Extension, scope: ReplaceScope) -> Iterator[tuple]:
+        data = ext.data
+        if scope.search_in_data and data.data:
+            for key in data.data:
+                yield 'data', key
+        if scope.search_in_spec and data.spec:
+            yield from self._object_leaf_paths(data.spec, ('spec',))
 
-            if scope.search_in_spec and current_data.get('spec'):
-                spec_result = self._replace_in_object(current_data['spec'], rule.search, rule.replace, rule.is_regex, 'spec')
-                if spec_result['has_changes']:
-                    changes.extend(spec_result['changes'])
-                    new_data_dict = {**current_data, 'spec': spec_result['new_obj']}
-                    has_changes = True
+    def _object_leaf_paths(self, obj: dict, container: tuple) -> Iterator[tuple]:
+        for key, value in obj.items():
+            if isinstance(value, str):
+                yield container + (key,)
+            elif isinstance(value, list):
+                yield from self._array_leaf_paths(value, container + (key,))
+            elif isinstance(value, dict):
+                yield from self._object_leaf_paths(value, container + (key,))
 
-        return ReplaceResult(
-            extension_name=new_name,
-            changes=changes,
-            updated_data=new_data_dict,
-            has_changes=has_changes
-        )
+    def _array_leaf_paths(self, arr: list, container: tuple) -> Iterator[tuple]:
+        for i, item in enumerate(arr):
+            if isinstance(item, str):
+                yield container + (i,)
+            elif isinstance(item, dict):
+                yield from self._object_leaf_paths(item, container + (i,))
+
+    def _build_batched_result(
+        self,
+        ext: Extension,
+        scope: ReplaceScope,
+        value_start: int,
+        replaced: dict[int, str],
+        rule_index: int
+    ) -> ReplaceResult:
+        changes: list[PreviewChange] = []
+        updates: dict = {}
+        data = ext.data
 
-    def _apply_replace_to_text(self, text: str, search: str, replace: str, is_regex: bool) -> str:
+        for index, path in enumerate(self._value_leaf_paths(ext, scope), value_start):
+            new = replaced.get(index)
+            if new is None:
+                continue
+            old = self._get_path(data, path)
+            field_path = path[0] + ''.join(f'[{part}]' if isinstance(part, int) else f'.{part}' for part in path[1:])
+            label = path[-1]
+            if isinstance(label, int):
+                changes.append(PreviewChange(field=field_path, old=old, new=new, rule_index=rule_index))
+            else:
+                changes.append(PreviewChange(
+                    field=field_path, old=f'{label}: {old}', new=f'{label}: {new}', rule_index=rule_index
+                ))
+            node = updates
+            for part in path[:-1]:
+                node = node.setdefault(part, {})
+            node[path[-1]] = _NewText(new)
+
+        rebuilt = {root: self._rebuild(data[root], node) for root, node in updates.items()}
+        return _result(ext, ext.name, data.with_fields(**rebuilt), changes)
+
+    def _get_path(self, obj: Any, path: tuple) -> Any:
+        for part in path:
+            obj = obj[part]
+        return obj
+
+    def _rebuild(self, obj: Any, node: dict) -> Any:
+        copy = dict(obj) if isinstance(obj, dict) else list(obj)
+        for key, child in node.items():
+            copy[key] = child.value if isinstance(child, _NewText) else self._rebuild(obj[key], child)
+        return copy
+
+    def _apply_to_extension(
+        self,
+        ext: Extension,
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        counters: _ReplaceCounters
+    ) -> ReplaceResult:
+        state = _RuleState(ext.name, ext.data)
+        for rule_index, rule in enumerate(rules):
+            self._apply_rule(state, rule_index, rule, scope, counters)
+        return state.to_result(ext)
+
+    def _apply_rule(
+        self,
+        state: '_RuleState',
+        rule_index: int,
+        rule: ReplaceRule,
+        scope: ReplaceScope,
+        counters: _ReplaceCounters
+    ) -> bool:
+        if not rule.search.strip():
+            return False
+
+        changes = state.changes
+        rule_start = len(changes)
+        current_data = state.data
+        updates: dict[str, Any] = {}
+
+        if scope.search_in_name:
+            replaced_name = self._apply_replace_to_text(state.name, rule.search, rule.replace, rule.is_regex, counters)
+            if replaced_name != state.name:
+                changes.append(PreviewChange(field='name', old=state.name, new=replaced_name))
+                state.name = replaced_name
+
+        if scope.search_in_kind and current_data.kind:
+            new_kind = self._apply_replace_to_text(
+                current_data.kind, rule.search, rule.replace, rule.is_regex, counters
+            )
+            if new_kind != current_data.kind:
+                changes.append(PreviewChange(field='kind', old=current_data.kind, new=new_kind))
+                updates['kind'] = new_kind
+
+        metadata = current_data.metadata
+        if scope.search_in_metadata_name and metadata and metadata.name:
+            old_name = metadata.name
+            replaced_name = self._apply_replace_to_text(old_name, rule.search, rule.replace, rule.is_regex, counters)
+            if replaced_name != old_name:
+                changes.append(PreviewChange(field='metadata.name', old=old_name, new=replaced_name))
+                updates['metadata'] = metadata.with_fields(name=replaced_name)
+
+        if scope.search_in_api_version and current_data.api_version:
+            new_api_version = self._apply_replace_to_text(
+                current_data.api_version, rule.search, rule.replace, rule.is_regex, counters
+            )
+            if new_api_version != current_data.api_version:
+                changes.append(PreviewChange(field='apiVersion', old=current_data.api_version, new=new_api_version))
+                updates['api_version'] = new_api_version
+
+        if scope.search_in_data and current_data.data:
+            data_result = self._replace_in_data(current_data.data, rule.search, rule.replace, rule.is_regex, counters)
+            if data_result['has_changes']:
+                changes.extend(data_result['changes'])
+                updates['data'] = data_result['new_data']
+
+        if scope.search_in_spec and current_data.spec:
+            spec_result = self._replace_in_object(
+                current_data.spec, rule.search, rule.replace, rule.is_regex, 'spec', counters
+            )
+            if spec_result['has_changes']:
+                changes.extend(spec_result['changes'])
+                updates['spec'] = spec_result['new_obj']
+
+        for change in changes[rule_start:]:
+            change.rule_index = rule_index
+        if updates:
+            state.data = current_data.with_fields(**updates)
+        return len(changes) > rule_start
+
+    def _apply_replace_to_text(
+        self,
+        text: str,
+        search: str,
+        replace: str,
+        is_regex: bool,
+        counters: _ReplaceCounters
+    ) -> str:
+        counters.leaves += 1
         if is_regex:
+            counters.regex_calls += 1
             try:
-                return re.sub(search, replace, text)
+                replaced, count = re.subn(search, replace, text)
             except re.error:
                 return text
-        return text.replace(search, replace)
-
-    def _replace_in_data(self, data: dict[str, str], search: str, replace: str, is_regex: bool) -> dict:
+            counters.matches += count
+            return replaced
+        replaced = text.replace(search, replace)
+        if replaced != text:
+            counters.matches += text.count(search)
+        return replaced
+
+    def _replace_in_data(
+        self,
+        data: dict[str, str],
+        search: str,
+        replace: str,
+        is_regex: bool,
+        counters: _ReplaceCounters
+    ) -> dict:
         changes: list[PreviewChange] = []
         new_data: dict[str, str] = {}
         has_changes = False
 
         for key, value in data.items():
-            new_key = self._apply_replace_to_text(key, search, replace, is_regex)
-            new_value = self._apply_replace_to_text(value, search, replace, is_regex)
+            new_key = self._apply_replace_to_text(key, search, replace, is_regex, counters)
+            new_value = self._apply_replace_to_text(value, search, replace, is_regex, counters)
 
             if new_key != key or new_value != value:
                 changes.append(PreviewChange(field=f'data.{key}', old=f'{key}: {value}', new=f'{new_key}: {new_value}'))
@@ -122,17 +607,25 @@ class DefaultReplaceEngine(IReplaceEngine):
 
         return {'new_data': new_data, 'changes': changes, 'has_changes': has_changes}
 
-    def _replace_in_object(self, obj: dict, search: str, replace: str, is_regex: bool, path: str) -> dict:
+    def _replace_in_object(
+        self,
+        obj: dict,
+        search: str,
+        replace: str,
+        is_regex: bool,
+        path: str,
+        counters: _ReplaceCounters
+    ) -> dict:
         changes: list[PreviewChange] = []
         has_changes = False
         new_obj: dict[str, Any] = {}
 
         for key, value in obj.items():
             current_path = f'{path}.{key}'
-            new_key = self._apply_replace_to_text(key, search, replace, is_regex)
+            new_key = self._apply_replace_to_text(key, search, replace, is_regex, counters)
 
             if isinstance(value, str):
-                new_value = self._apply_replace_to_text(value, search, replace, is_regex)
+                new_value = self._apply_replace_to_text(value, search, replace, is_regex, counters)
                 if new_key != key or new_value != value:
                     changes.append(PreviewChange(field=current_path, old=f'{key}: {value}', new=f'{new_key}: {new_value}'))
                     new_obj[new_key] = new_value
@@ -141,7 +634,7 @@ class DefaultReplaceEngine(IReplaceEngine):
                     new_obj[key] = value
             elif isinstance(value, (int, float)):
                 str_value = str(value)
-                new_str_value = self._apply_replace_to_text(str_value, search, replace, is_regex)
+                new_str_value = self._apply_replace_to_text(str_value, search, replace, is_regex, counters)
                 if new_str_value != str_value:
                     try:
                         new_num = float(new_str_value) if '.' in new_str_value else int(new_str_value)
@@ -156,7 +649,7 @@ class DefaultReplaceEngine(IReplaceEngine):
                 else:
                     new_obj[key] = value
             elif isinstance(value, list):
-                array_result = self._replace_in_array(value, search, replace, is_regex, current_path)
+                array_result = self._replace_in_array(value, search, replace, is_regex, current_path, counters)
                 if array_result['has_changes'] or new_key != key:
                     changes.extend(array_result['changes'])
                     new_obj[new_key] = array_result['new_array']
@@ -164,7 +657,7 @@ class DefaultReplaceEngine(IReplaceEngine):
                 else:
                     new_obj[key] = value
             elif isinstance(value, dict):
-                nested_result = self._replace_in_object(value, search, replace, is_regex, current_path)
+                nested_result = self._replace_in_object(value, search, replace, is_regex, current_path, counters)
                 if nested_result['has_changes'] or new_key != key:
                     changes.extend(nested_result['changes'])
                     new_obj[new_key] = nested_result['new_obj']
@@ -178,7 +671,15 @@ class DefaultReplaceEngine(IReplaceEngine):
 
         return {'new_obj': new_obj, 'changes': changes, 'has_changes': has_changes}
 
-    def _replace_in_array(self, arr: list, search: str, replace: str, is_regex: bool, path: str) -> dict:
+    def _replace_in_array(
+        self,
+        arr: list,
+        search: str,
+        replace: str,
+        is_regex: bool,
+        path: str,
+        counters: _ReplaceCounters
+    ) -> dict:
         changes: list[PreviewChange] = []
         new_array: list = []
         has_changes = False
@@ -187,7 +688,7 @@ class DefaultReplaceEngine(IReplaceEngine):
             current_path = f'{path}[{i}]'
 
             if isinstance(item, str):
-                new_item = self._apply_replace_to_text(item, search, replace, is_regex)
+                new_item = self._apply_replace_to_text(item, search, replace, is_regex, counters)
                 if new_item != item:
                     changes.append(PreviewChange(field=current_path, old=item, new=new_item))
                     new_array.append(new_item)
@@ -195,7 +696,7 @@ class DefaultReplaceEngine(IReplaceEngine):
                 else:
                     new_array.append(item)
             elif isinstance(item, dict):
-                nested_result = self._replace_in_object(item, search, replace, is_regex, current_path)
+                nested_result = self._replace_in_object(item, search, replace, is_regex, current_path, counters)
                 if nested_result['has_changes']:
                     changes.extend(nested_result['changes'])
                     new_array.append(nested_result['new_obj'])
@@ -207,33 +708,5 @@ class DefaultReplaceEngine(IReplaceEngine):
 
         return {'new_array': new_array, 'changes': changes, 'has_changes': has_changes}
 
-    def _extension_data_to_dict(self, data: ExtensionData) -> dict:
-        result = {}
-        if data.api_version is not None:
-            result['apiVersion'] = data.api_version
-        if data.kind is not None:
-            result['kind'] = data.kind
-        if data.metadata is not None:
-            m = data.metadata
-            metadata = {}
-            if m.name is not None:
-                metadata['name'] = m.name
-            if m.annotations is not None:
-                metadata['annotations'] = m.annotations
-            if m.labels is not None:
-                metadata['labels'] = m.labels
-            if m.resource_version is not None:
-                metadata['resourceVersion'] = m.resource_version
-            if m.creation_timestamp is not None:
-                metadata['creationTimestamp'] = m.creation_timestamp
-            if m.version is not None:
-                metadata['version'] = m.version
-            result['metadata'] = metadata
-        if data.spec is not None:
-            result['spec'] = data.spec
-        if data.data is not None:
-            result['data'] = data.data
-        return result
-
 
 default_replace_engine = DefaultReplaceEngine()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import fields
+from threading import Lock
+from typing import Optional
+
+from modules.domain.entities.extension import Extension
+from modules.domain.entities.extension_data import ExtensionData
+from modules.domain.value_objects.raw_data_ref import raw_digest
+from modules.infrastructure.types.replace_types import PreviewChange, ReplaceRule, ReplaceScope
+
+ContentKey = tuple[str, bytes]
+RuleKey = tuple
+_SELECTION_FIELDS = frozenset({'selected_kinds', 'label_selector', 'created'})
+
+
+class CachedReplaceState:
+    __slots__ = ('name', 'data', 'changes')
+
+    def __init__(self, name: Optional[str], data: Optional[ExtensionData], changes: tuple[PreviewChange, ...]):
+        self.name = name
+        self.data = data
+        self.changes = changes
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.changes
+
+
+class ReplaceResultCache:
+    DEFAULT_MAX_ENTRIES = 100_000
+    DEFAULT_MAX_RULES = 256
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_rules: int = DEFAULT_MAX_RULES):
+        self._max_entries = max_entries
+        self._max_rules = max_rules
+        self._states: OrderedDict[tuple[ContentKey, RuleKey], CachedReplaceState] = OrderedDict()
+        self._no_match: OrderedDict[RuleKey, set[ContentKey]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @staticmethod
+    def content_key(extension: Extension) -> Optional[ContentKey]:
+        if extension.modified or not extension.raw_data:
+            return None
+        return extension.name, raw_digest(extension.raw_data)
+
+    @staticmethod
+    def rule_key(rule: ReplaceRule, scope: ReplaceScope) -> RuleKey:
+        scope_fields = tuple(getattr(scope, f.name) for f in fields(scope) if f.name not in _SELECTION_FIELDS)
+        return rule.search, rule.replace, rule.is_regex, scope_fields
+
+    def prefix_keys(self, rules: list[ReplaceRule], scope: ReplaceScope) -> list[RuleKey]:
+        keys = [self.rule_key(rule, scope) for rule in rules]
+        return [tuple(keys[:end]) for end in range(1, len(keys) + 1)]
+
+    def get(self, content: ContentKey, prefix: RuleKey) -> Optional[CachedReplaceState]:
+        key = (content, prefix)
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                self._states.move_to_end(key)
+            return state
+
+    def put(self, content: ContentKey, prefix: RuleKey, state: CachedReplaceState) -> None:
+        key = (content, prefix)
+        with self._lock:
+            self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self._max_entries:
+                self._states.popitem(last=False)
+
+    def has_no_match(self, content: ContentKey, rule: RuleKey) -> bool:
+        contents = self._no_match.get(rule)
+        return contents is not None and content in contents
+
+    def add_no_match(self, content: ContentKey, rule: RuleKey) -> None:
+        with self._lock:
+            contents = self._no_match.get(rule)
+            if contents is None:
+                contents = self._no_match[rule] = set()
+                while len(self._no_match) > self._max_rules:
+                    self._no_match.popitem(last=False)
+            else:
+                self._no_match.move_to_end(rule)
+            contents.add(content)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._no_match.clear()
@@ -0,0 +1 @@
+from modules.infrastructure.services.report.jsonl_change_report_writer import JsonlChangeReportWriter
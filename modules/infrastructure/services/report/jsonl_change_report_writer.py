@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import IO, Optional
+
+from modules.infrastructure.types.replace_types import PreviewChange
+
+
+class JsonlChangeReportWriter:
+    SNIPPET_CONTEXT = 40
+    SNIPPET_MAX_LENGTH = 200
+
+    def __init__(self, filepath: str, resume_at: Optional[int] = None):
+        self._filepath = filepath
+        self._resume_at = resume_at
+        self._file: Optional[IO[str]] = None
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def open(self) -> 'JsonlChangeReportWriter':
+        if self._resume_at is None:
+            self._file = open(self._filepath, 'w', encoding='utf-8')
+        else:
+            os.truncate(self._filepath, self._resume_at)
+            self._file = open(self._filepath, 'a', encoding='utf-8')
+        return self
+
+    def commit(self) -> int:
+        if not self._file:
+            raise ValueError('Report writer is not open')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return os.fstat(self._file.fileno()).st_size
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def write(self, extension_name: str, change: PreviewChange) -> None:
+        if not self._file:
+            raise ValueError('Report writer is not open')
+        old_snippet, new_snippet = self._snippets(change.old, change.new)
+        record = {
+            'extension': extension_name,
+            'field': change.field,
+            'rule_index': change.rule_index,
+            'old': old_snippet,
+            'new': new_snippet,
+        }
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write('\n')
+        self._count += 1
+
+    def _snippets(self, old: str, new: str) -> tuple[str, str]:
+        if len(old) <= self.SNIPPET_MAX_LENGTH and len(new) <= self.SNIPPET_MAX_LENGTH:
+            return old, new
+
+        prefix = 0
+        limit = min(len(old), len(new))
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        start = max(0, prefix - self.SNIPPET_CONTEXT)
+        return self._clip(old, start), self._clip(new, start)
+
+    def _clip(self, text: str, start: int) -> str:
+        end = start + self.SNIPPET_MAX_LENGTH
+        snippet = text[start:end]
+        if start > 0:
+            snippet = '…' + snippet
+        if end < len(text):
+            snippet = snippet + '…'
+        return snippet
+
+    def __enter__(self) -> 'JsonlChangeReportWriter':
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
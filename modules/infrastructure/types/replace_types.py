@@ -1,6 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Optional
+
+from modules.core.tasks.task_control import TaskControl
+from modules.domain.entities.extension import Extension
+from modules.domain.entities.extension_data import ExtensionData
+from modules.domain.value_objects.label_selector import LabelSelector
+from modules.domain.value_objects.time_range import TimeRange
 
 
 @dataclass
@@ -19,6 +26,18 @@ class ReplaceScope:
     search_in_data: bool = True
     search_in_spec: bool = True
     selected_kinds: list[str] = field(default_factory=list)
+    label_selector: Optional[LabelSelector] = None
+    created: Optional[TimeRange] = None
+
+    def selects(self, data: ExtensionData) -> bool:
+        if self.selected_kinds and data.kind and data.kind not in self.selected_kinds:
+            return False
+        metadata = data.metadata
+        if self.label_selector is not None and not self.label_selector.matches(metadata.labels if metadata else None):
+            return False
+        if self.created is not None and not self.created.is_unbounded():
+            return self.created.contains(metadata.creation_timestamp if metadata else None)
+        return True
 
 
 @dataclass
@@ -26,24 +45,52 @@ class PreviewChange:
     field: str
     old: str
     new: str
+    rule_index: int = 0
 
 
 @dataclass
 class ReplaceResult:
     extension_name: str
     changes: list[PreviewChange] = field(default_factory=list)
-    updated_data: dict = field(default_factory=dict)
     has_changes: bool = False
+    source_name: Optional[str] = None
+    original: Optional[Extension] = None
+    updated: Optional[Extension] = None
+
+    @property
+    def updated_data(self) -> Optional[ExtensionData]:
+        return self.updated.data if self.updated is not None else None
 
 
 @dataclass
 class BatchReplaceResult:
     results: list[ReplaceResult] = field(default_factory=list)
     total_changes: int = 0
+    updated_count: int = 0
+
+
+ChangeSink = Callable[[str, PreviewChange], None]
 
 
 class IReplaceEngine:
-    def apply(self, extensions: list, rules: list[ReplaceRule], scope: ReplaceScope) -> BatchReplaceResult:
+    def apply(
+        self,
+        extensions: list,
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        on_change: Optional[ChangeSink] = None,
+        control: Optional[TaskControl] = None,
+        collect: bool = True
+    ) -> BatchReplaceResult:
+        raise NotImplementedError
+
+    def iter_apply(
+        self,
+        extensions: Iterable,
+        rules: list[ReplaceRule],
+        scope: ReplaceScope,
+        on_change: Optional[ChangeSink] = None
+    ) -> Iterator[tuple]:
         raise NotImplementedError
 
     def preview(self, extensions: list, rules: list[ReplaceRule], scope: ReplaceScope) -> BatchReplaceResult:
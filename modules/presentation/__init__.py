@@ -1 +1,2 @@
 from modules.presentation.cli_app import run_cli
+from modules.presentation.server_app import run_server
@@ -2,13 +2,23 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
+import time
 
-from di.container import configure_container, get_use_cases
+from di.container import MEMORY_BACKEND, SQLITE_BACKEND, configure_container, get_use_cases
+from modules.application.services.load_planner import DISK_STRATEGY, LEAN_STRATEGY, load_planner
 from modules.application.use_cases.batch_replace_use_case import BatchReplaceInput
 from modules.application.use_cases.export_extensions_use_case import ExportExtensionsInput
 from modules.application.use_cases.load_extensions_use_case import LoadExtensionsInput
+from modules.application.use_cases.stream_replace_use_case import StreamReplaceInput
 from modules.core.logging.logger import setup_logging
+from modules.core.memory.memory_guard import format_size, parse_size
+from modules.core.metrics.metrics_registry import MetricsSnapshot
+from modules.domain.value_objects.label_selector import LabelSelector
+from modules.domain.value_objects.time_range import TimeRange
+from modules.infrastructure.services.checkpoint.checkpoint_store import CheckpointError, CheckpointStore, fingerprint_rules
 from modules.infrastructure.types.replace_types import ReplaceRule, ReplaceScope
+from modules.presentation.cli_batch import find_inputs, log_summary, merge_metrics, plan_jobs, run_jobs
 
 
 def run_cli():
@@ -19,55 +29,255 @@ def run_cli():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
 
-    parser.add_argument('-i', '--input', required=True, help='输入JSON文件路径')
-    parser.add_argument('-o', '--output', required=True, help='输出JSON文件路径')
+    parser.add_argument('-i', '--input', required=True, help='输入JSON文件路径；为目录时进入批量模式，按 --glob 匹配其中的文件并发处理')
+    parser.add_argument('-o', '--output', help='输出JSON文件路径，批量模式下为输出目录（--dry-run 时可省略）')
+    parser.add_argument('--glob', default='*.data', help='批量模式下在输入目录中匹配文件的模式，支持 ** 递归匹配子目录')
+    parser.add_argument('-j', '--jobs', type=int, help='批量模式下的并发进程数，默认取 CPU 核数与文件数的较小值')
     parser.add_argument('-s', '--search', default='', help='搜索内容(正则表达式)，默认为空字符串')
     parser.add_argument('-r', '--replace', default='', help='替换内容')
+    parser.add_argument('-l', '--selector', help='标签选择器，仅替换匹配的扩展，例如 "app=halo,tier in (web,api),!legacy"')
+    parser.add_argument('--created', metavar='START..END', help='按创建时间筛选，仅替换 metadata.creationTimestamp 落在 [START, END) 内的扩展，任一端可省略，例如 "2024-03-01.."')
     parser.add_argument('--reencode', help='重新加密解码副本文件路径')
+    parser.add_argument('--report', help='以 JSONL 格式逐行写出每处替换的变更报告文件路径，批量模式下为报告目录')
+    parser.add_argument('--lean', action='store_true', help='精简加载：解码后不保留原始 Base64 字符串，仅保存摘要与文件偏移，需要时按偏移回读')
+    parser.add_argument('--backend', choices=[MEMORY_BACKEND, SQLITE_BACKEND], default=MEMORY_BACKEND, help='扩展存储后端：memory（默认，全部驻留内存）或 sqlite（磁盘数据库，适合超出内存的数据集）')
+    parser.add_argument('--db', metavar='FILE', help='sqlite 后端的数据库文件路径，省略时使用临时文件')
+    parser.add_argument('--stream', action='store_true', help='流式处理：逐条读取、解码、替换、编码并写出，内存占用只取决于单条扩展大小（不支持 --lean/--backend sqlite/--db）')
+    parser.add_argument('--memory-budget', metavar='SIZE', help='加载时允许使用的内存上限，例如 512M、2G；省略时取可用内存的 60%%。超出预算时依次降级为精简加载、流式处理或磁盘后端')
+    parser.add_argument('--dry-run', action='store_true', help='仅执行替换预览，不写出输出文件')
+    parser.add_argument('--checkpoint', metavar='FILE', help='断点文件路径，启用后定期保存替换与导出进度，中断后可用 --resume 继续；指定 --resume 时默认为 <输出文件>.checkpoint')
+    parser.add_argument('--resume', action='store_true', help='从断点文件继续上次中断的处理，输入文件与替换规则须与断点记录一致')
+    parser.add_argument('--checkpoint-interval', type=float, default=CheckpointStore.DEFAULT_INTERVAL, metavar='SECONDS', help='保存断点的最短间隔秒数')
+    parser.add_argument('--metrics', metavar='FILE', help='运行结束后导出指标快照（.prom 为 Prometheus 文本格式，否则为 JSON）')
+    parser.add_argument('--profile', metavar='DIR', help='对各阶段进行 cProfile/tracemalloc 剖析并将结果写入该目录')
 
     args = parser.parse_args()
+    if not args.output and not args.dry_run:
+        parser.error('the following arguments are required: -o/--output')
+    if args.stream and (args.lean or args.backend != MEMORY_BACKEND or args.db):
+        parser.error('--stream 不能与 --lean、--backend sqlite 或 --db 同时使用')
+    label_selector = None
+    if args.selector:
+        try:
+            label_selector = LabelSelector.parse(args.selector)
+        except ValueError as e:
+            parser.error(f'无效的标签选择器: {e}')
+    created = None
+    if args.created:
+        try:
+            created = TimeRange.parse(args.created)
+        except ValueError as e:
+            parser.error(f'无效的时间范围: {e}')
+    memory_budget = None
+    if args.memory_budget:
+        try:
+            memory_budget = parse_size(args.memory_budget)
+        except ValueError as e:
+            parser.error(f'无效的内存预算: {e}')
+    if args.resume and not args.checkpoint and args.output:
+        args.checkpoint = f'{args.output}.checkpoint'
+    if args.checkpoint and (args.dry_run or args.stream or os.path.isdir(args.input)):
+        parser.error('--checkpoint/--resume 不能与 --dry-run、--stream 或批量模式同时使用')
 
-    container = configure_container()
+    if os.path.isdir(args.input):
+        _run_batch(parser, args, label_selector, created, memory_budget)
+        return
+
+    container = configure_container(profile_dir=args.profile, backend=args.backend, sqlite_path=args.db)
     use_cases = get_use_cases(container)
+    if args.profile:
+        logging.info(f"性能剖析已启用, 结果目录: {args.profile}")
 
     try:
-        if args.reencode:
+        if not args.stream and args.backend == MEMORY_BACKEND and not args.db:
+            plan = use_cases['load_planner'].plan(args.reencode or args.input, memory_budget, args.lean)
+            if not plan.fits:
+                logging.warning(
+                    f"预计内存占用 {format_size(plan.estimated_bytes)} 超出预算 {format_size(plan.budget)}, "
+                    f"自动切换为流式处理"
+                )
+                if args.checkpoint:
+                    logging.warning("流式处理不支持断点续传, 已忽略 --checkpoint")
+                args.checkpoint = None
+                args.stream = True
+        rules = []
+        if args.search and not args.reencode:
+            rules.append(ReplaceRule(search=args.search, replace=args.replace, is_regex=True))
+        scope = ReplaceScope(label_selector=label_selector, created=created) if rules else ReplaceScope()
+        checkpoint = None
+        if args.checkpoint:
+            checkpoint = CheckpointStore(
+                args.checkpoint, args.reencode or args.input, fingerprint_rules(rules, scope), args.checkpoint_interval
+            )
+            try:
+                checkpoint.open(args.resume)
+            except CheckpointError as e:
+                logging.error(f"无法使用断点文件: {e}")
+                return
+            _log_checkpoint(checkpoint)
+        if args.stream:
+            _run_stream(args, use_cases, label_selector, created)
+        elif args.reencode:
             logging.info(f"开始重新加密文件: {args.reencode}")
-            load_result = use_cases['load'].execute(LoadExtensionsInput(filepath=args.reencode))
+            load_result = use_cases['load'].execute(LoadExtensionsInput(
+                filepath=args.reencode, lean=args.lean, memory_budget=memory_budget
+            ))
             if not load_result.success:
                 logging.error(f"加载文件失败: {load_result.error}")
                 return
+            _log_strategy(load_result.strategy, args.lean)
 
-            export_result = use_cases['export'].execute(ExportExtensionsInput(filepath=args.output))
+            export_result = use_cases['export'].execute(ExportExtensionsInput(filepath=args.output, checkpoint=checkpoint))
             if export_result.success:
+                if checkpoint:
+                    checkpoint.discard()
                 logging.info(f"重新加密完成!")
                 logging.info(f"输出文件: {args.output}")
             else:
                 logging.error(f"导出失败: {export_result.error}")
         else:
             logging.info(f"开始处理文件: {args.input}")
-            load_result = use_cases['load'].execute(LoadExtensionsInput(filepath=args.input))
+            load_result = use_cases['load'].execute(LoadExtensionsInput(
+                filepath=args.input, lean=args.lean, memory_budget=memory_budget
+            ))
             if not load_result.success:
                 logging.error(f"加载文件失败: {load_result.error}")
                 return
+            _log_strategy(load_result.strategy, args.lean)
 
-            if args.search:
+            if rules:
                 logging.info(f"执行替换: 搜索 '{args.search}', 替换为 '{args.replace}'")
                 replace_result = use_cases['batch_replace'].execute(BatchReplaceInput(
-                    rules=[ReplaceRule(search=args.search, replace=args.replace, is_regex=True)],
-                    scope=ReplaceScope()
+                    rules=rules,
+                    scope=scope,
+                    report_path=args.report,
+                    dry_run=args.dry_run,
+                    checkpoint=checkpoint
                 ))
                 if not replace_result.success:
                     logging.error(f"替换失败: {replace_result.error}")
+                    if checkpoint:
+                        logging.info(f"断点已保存, 可使用 --resume 继续: {checkpoint.path}")
                     return
-                logging.info(f"替换完成, 更新了 {replace_result.updated_count} 条记录")
+                logging.info(
+                    f"替换完成, 更新了 {replace_result.updated_count} 条记录, "
+                    f"共 {replace_result.change_count} 处变更"
+                )
+                if args.report:
+                    logging.info(f"变更报告: {args.report}")
 
-            export_result = use_cases['export'].execute(ExportExtensionsInput(filepath=args.output))
+            if args.dry_run:
+                logging.info("预览模式, 未写出输出文件")
+                return
+
+            export_result = use_cases['export'].execute(ExportExtensionsInput(filepath=args.output, checkpoint=checkpoint))
             if export_result.success:
+                if checkpoint:
+                    checkpoint.discard()
                 logging.info(f"处理完成!")
                 logging.info(f"输出文件: {args.output}")
             else:
                 logging.error(f"导出失败: {export_result.error}")
+                if checkpoint:
+                    logging.info(f"断点已保存, 可使用 --resume 继续: {checkpoint.path}")
     except Exception as e:
         logging.error(f"处理失败: {str(e)}", exc_info=True)
         raise
+    finally:
+        if args.metrics:
+            _write_metrics(use_cases['metrics'].snapshot(), args.metrics)
+
+
+def _run_stream(args: argparse.Namespace, use_cases: dict, label_selector, created) -> None:
+    input_path = args.reencode or args.input
+    rules = []
+    if args.search and not args.reencode:
+        rules.append(ReplaceRule(search=args.search, replace=args.replace, is_regex=True))
+    logging.info(f"开始流式处理文件: {input_path}")
+    if rules:
+        logging.info(f"执行替换: 搜索 '{args.search}', 替换为 '{args.replace}'")
+    result = use_cases['stream_replace'].execute(StreamReplaceInput(
+        input_path=input_path,
+        output_path=args.output,
+        rules=rules,
+        scope=ReplaceScope(label_selector=label_selector, created=created),
+        report_path=args.report,
+        dry_run=args.dry_run
+    ))
+    if not result.success:
+        logging.error(f"流式处理失败: {result.error}")
+        return
+    logging.info(f"替换完成, 更新了 {result.updated_count} 条记录, 共 {result.change_count} 处变更")
+    if args.report and rules:
+        logging.info(f"变更报告: {args.report}")
+    if args.dry_run:
+        logging.info("预览模式, 未写出输出文件")
+        return
+    logging.info(f"处理完成!")
+    logging.info(f"输出文件: {args.output}")
+
+
+def _run_batch(parser: argparse.ArgumentParser, args: argparse.Namespace, label_selector, created, memory_budget) -> None:
+    if args.reencode or args.db:
+        parser.error('批量模式不支持 --reencode 与 --db')
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs 必须为正整数')
+    if args.output and os.path.realpath(args.output) == os.path.realpath(args.input):
+        parser.error('批量模式下输出目录不能与输入目录相同')
+    if args.output and os.path.isfile(args.output):
+        parser.error(f'批量模式下输出路径必须为目录: {args.output}')
+    inputs = find_inputs(args.input, args.glob)
+    if not inputs:
+        parser.error(f'输入目录中没有匹配 {args.glob} 的文件: {args.input}')
+
+    workers = min(args.jobs or os.cpu_count() or 1, len(inputs))
+    total_budget = load_planner.budget(memory_budget)
+    rules = [ReplaceRule(search=args.search, replace=args.replace, is_regex=True)] if args.search else []
+    jobs = plan_jobs(
+        inputs, args.input, None if args.dry_run else args.output, args.report, args.profile,
+        rules=rules,
+        scope=ReplaceScope(label_selector=label_selector, created=created),
+        backend=args.backend,
+        lean=args.lean,
+        stream=args.stream,
+        memory_budget=total_budget // workers if total_budget is not None else None,
+        dry_run=args.dry_run
+    )
+    logging.info(f"开始批量处理: {len(jobs)} 个文件, {workers} 个进程")
+    if rules:
+        logging.info(f"执行替换: 搜索 '{args.search}', 替换为 '{args.replace}'")
+
+    started = time.perf_counter()
+    results = run_jobs(jobs, workers)
+    log_summary(results, args.input, time.perf_counter() - started, workers)
+    if args.dry_run:
+        logging.info("预览模式, 未写出输出文件")
+    elif args.output:
+        logging.info(f"输出目录: {args.output}")
+    if args.metrics:
+        _write_metrics(merge_metrics(results), args.metrics)
+
+
+def _log_checkpoint(checkpoint: CheckpointStore) -> None:
+    if not checkpoint.resumed:
+        logging.info(f"断点续传已启用, 断点文件: {checkpoint.path}")
+        return
+    state = checkpoint.checkpoint
+    logging.info(
+        f"从断点继续: 已替换 {state.replace.index} 条"
+        f"{'(已完成)' if state.replace.done else ''}, 已导出 {state.export.index} 条"
+    )
+
+
+def _log_strategy(strategy: str, lean: bool) -> None:
+    if strategy == LEAN_STRATEGY and not lean:
+        logging.info("内存预算不足以完整加载, 已改用精简流式加载")
+    elif strategy == DISK_STRATEGY:
+        logging.info("已使用流式加载直接写入磁盘后端")
+
+
+def _write_metrics(snapshot: MetricsSnapshot, filepath: str) -> None:
+    content = snapshot.to_prometheus() if filepath.endswith('.prom') else snapshot.to_json()
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
+    logging.info(f"指标快照: {filepath}")
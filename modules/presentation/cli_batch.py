@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional
+
+from di.container import MEMORY_BACKEND, configure_container, get_use_cases
+from modules.application.use_cases.batch_replace_use_case import BatchReplaceInput
+from modules.application.use_cases.export_extensions_use_case import ExportExtensionsInput
+from modules.application.use_cases.load_extensions_use_case import LoadExtensionsInput
+from modules.application.use_cases.stream_replace_use_case import StreamReplaceInput
+from modules.core.metrics.metrics_registry import MetricsSnapshot
+from modules.infrastructure.types.replace_types import ReplaceRule, ReplaceScope
+
+STREAM_MODE = 'stream'
+
+
+@dataclass
+class FileJob:
+    input_path: str
+    output_path: Optional[str]
+    rules: list[ReplaceRule]
+    scope: ReplaceScope
+    backend: str = MEMORY_BACKEND
+    lean: bool = False
+    stream: bool = False
+    memory_budget: Optional[int] = None
+    report_path: Optional[str] = None
+    profile_dir: Optional[str] = None
+    dry_run: bool = False
+
+
+@dataclass
+class FileJobResult:
+    input_path: str
+    success: bool
+    error: Optional[str] = None
+    mode: Optional[str] = None
+    item_count: int = 0
+    updated_count: int = 0
+    change_count: int = 0
+    duration: float = 0.0
+    metrics: Optional[MetricsSnapshot] = None
+
+
+def find_inputs(directory: str, pattern: str) -> list[str]:
+    paths = glob.glob(os.path.join(glob.escape(directory), pattern), recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def plan_jobs(
+    inputs: list[str],
+    input_dir: str,
+    output_dir: Optional[str],
+    report_dir: Optional[str],
+    profile_dir: Optional[str],
+    **options
+) -> list[FileJob]:
+    jobs = []
+    for path in inputs:
+        relative = os.path.relpath(path, input_dir)
+        stem = os.path.splitext(relative)[0]
+        jobs.append(FileJob(
+            input_path=path,
+            output_path=os.path.join(output_dir, relative) if output_dir else None,
+            report_path=os.path.join(report_dir, f'{stem}.jsonl') if report_dir else None,
+            profile_dir=os.path.join(profile_dir, stem) if profile_dir else None,
+            **options
+        ))
+    return jobs
+
+
+def run_file_job(job: FileJob) -> FileJobResult:
+    started = time.perf_counter()
+    use_cases = None
+    try:
+        for path in (None if job.dry_run else job.output_path, job.report_path):
+            if path:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        use_cases = get_use_cases(configure_container(profile_dir=job.profile_dir, backend=job.backend))
+        stream = job.stream
+        if not stream and job.backend == MEMORY_BACKEND:
+            plan = use_cases['load_planner'].plan(job.input_path, job.memory_budget, job.lean)
+            if not plan.fits:
+                logging.warning(f"{job.input_path}: 预计内存占用超出预算, 自动切换为流式处理")
+                stream = True
+        result = _run_streamed(job, use_cases) if stream else _run_loaded(job, use_cases)
+    except Exception as e:
+        result = FileJobResult(job.input_path, success=False, error=str(e))
+    finally:
+        if use_cases is not None:
+            use_cases['extension_repo'].close()
+    result.duration = time.perf_counter() - started
+    if use_cases is not None:
+        result.metrics = use_cases['metrics'].snapshot()
+    return result
+
+
+def run_jobs(jobs: list[FileJob], workers: int) -> list[FileJobResult]:
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {executor.submit(run_file_job, job): job for job in jobs}
+        results: dict[str, FileJobResult] = {}
+        try:
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = FileJobResult(job.input_path, success=False, error=str(e) or type(e).__name__)
+                results[job.input_path] = result
+                _log_progress(result, len(results), len(jobs))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return [results[job.input_path] for job in jobs]
+
+
+def log_summary(results: list[FileJobResult], input_dir: str, elapsed: float, workers: int) -> None:
+    names = [os.path.relpath(result.input_path, input_dir) for result in results]
+    width = max(len(name) for name in names)
+    for name, result in zip(names, results):
+        if result.success:
+            logging.info(
+                f"  ✓ {name:<{width}}  {result.mode:<6}  {result.item_count:>6} 条  "
+                f"更新 {result.updated_count:>5}  变更 {result.change_count:>6}  {result.duration:>7.2f}s"
+            )
+        else:
+            logging.error(f"  ✗ {name:<{width}}  {result.error}  {result.duration:>7.2f}s")
+    succeeded = [result for result in results if result.success]
+    logging.info(
+        f"批量处理完成: {len(results)} 个文件, 成功 {len(succeeded)}, 失败 {len(results) - len(succeeded)}, "
+        f"更新 {sum(r.updated_count for r in succeeded)} 条记录, 共 {sum(r.change_count for r in succeeded)} 处变更"
+    )
+    logging.info(
+        f"总耗时 {elapsed:.2f}s (各文件累计 {sum(r.duration for r in results):.2f}s, {workers} 个进程)"
+    )
+
+
+def merge_metrics(results: list[FileJobResult]) -> MetricsSnapshot:
+    merged = MetricsSnapshot()
+    for result in results:
+        if result.metrics is not None:
+            merged = merged.merge(result.metrics)
+    return merged
+
+
+def _run_loaded(job: FileJob, use_cases: dict) -> FileJobResult:
+    load_result = use_cases['load'].execute(LoadExtensionsInput(
+        filepath=job.input_path, lean=job.lean, memory_budget=job.memory_budget
+    ))
+    if not load_result.success:
+        return FileJobResult(job.input_path, success=False, error=f"加载文件失败: {load_result.error}")
+
+    result = FileJobResult(job.input_path, success=True, mode=load_result.strategy, item_count=load_result.count)
+    if job.rules:
+        replace_result = use_cases['batch_replace'].execute(BatchReplaceInput(
+            rules=job.rules, scope=job.scope, report_path=job.report_path, dry_run=job.dry_run
+        ))
+        if not replace_result.success:
+            return FileJobResult(job.input_path, success=False, error=f"替换失败: {replace_result.error}")
+        result.updated_count = replace_result.updated_count
+        result.change_count = replace_result.change_count
+
+    if not job.dry_run:
+        export_result = use_cases['export'].execute(ExportExtensionsInput(filepath=job.output_path))
+        if not export_result.success:
+            return FileJobResult(job.input_path, success=False, error=f"导出失败: {export_result.error}")
+    return result
+
+
+def _run_streamed(job: FileJob, use_cases: dict) -> FileJobResult:
+    tally = {}
+    use_cases['event_bus'].on('extensions:stream-replaced', tally.update)
+    stream_result = use_cases['stream_replace'].execute(StreamReplaceInput(
+        input_path=job.input_path,
+        output_path=job.output_path,
+        rules=job.rules,
+        scope=job.scope,
+        report_path=job.report_path,
+        dry_run=job.dry_run
+    ))
+    if not stream_result.success:
+        return FileJobResult(job.input_path, success=False, error=f"流式处理失败: {stream_result.error}")
+    return FileJobResult(
+        job.input_path,
+        success=True,
+        mode=STREAM_MODE,
+        item_count=tally.get('item_count', 0),
+        updated_count=stream_result.updated_count,
+        change_count=stream_result.change_count
+    )
+
+
+def _init_worker() -> None:
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _log_progress(result: FileJobResult, done: int, total: int) -> None:
+    status = '完成' if result.success else '失败'
+    logging.info(f"[{done}/{total}] {status}: {result.input_path} ({result.duration:.2f}s)")
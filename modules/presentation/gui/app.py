@@ -9,17 +9,24 @@ from tkinter import filedialog, messagebox
 import customtkinter as ctk
 from tkinterdnd2 import TkinterDnD, DND_FILES
 
-from di.container import configure_container, get_use_cases
+from di.container import (
+    COLUMNAR_INDEX_ENV, LEAN_LOAD_ENV, MEMORY_BACKEND, MEMORY_BUDGET_ENV, PROFILE_DIR_ENV, REPLACE_CACHE_ENV,
+    REPOSITORY_BACKEND_ENV, SQLITE_PATH_ENV, TRIGRAM_INDEX_ENV, configure_container, get_use_cases
+)
 from modules.application.use_cases.batch_replace_use_case import BatchReplaceInput
 from modules.application.use_cases.export_extensions_use_case import ExportExtensionsInput
 from modules.application.use_cases.load_extensions_use_case import LoadExtensionsInput
 from modules.core.logging.logger import setup_logging
+from modules.core.memory.memory_guard import parse_size
+from modules.core.tasks.cancellation_token import CancellationToken
+from modules.core.tasks.progress_reporter import PROGRESS_EVENT
 from modules.infrastructure.types.replace_types import ReplaceRule, ReplaceScope
 from modules.presentation.gui.theme import ThemeManager
 from modules.presentation.gui.components.header import HeaderFrame
 from modules.presentation.gui.components.warning_banner import WarningBannerFrame
 from modules.presentation.gui.components.drop_zone import DropZoneFrame
 from modules.presentation.gui.components.params_actions import ParamsActionsFrame
+from modules.presentation.gui.components.progress_panel import ProgressPanelFrame
 from modules.presentation.gui.components.search_scope import SearchScopeFrame
 from modules.presentation.gui.components.log_panel import LogPanelFrame
 
@@ -32,8 +39,18 @@ ctk.set_default_color_theme("blue")
 class ModernGUI(TkinterDnD.Tk):
     def __init__(self):
         super().__init__()
-        self._container = configure_container()
+        self._container = configure_container(
+            profile_dir=os.environ.get(PROFILE_DIR_ENV),
+            trigram_index=os.environ.get(TRIGRAM_INDEX_ENV) == '1',
+            columnar_index=os.environ.get(COLUMNAR_INDEX_ENV) == '1',
+            backend=os.environ.get(REPOSITORY_BACKEND_ENV) or MEMORY_BACKEND,
+            sqlite_path=os.environ.get(SQLITE_PATH_ENV),
+            async_events=True,
+            replace_cache=os.environ.get(REPLACE_CACHE_ENV) == '1',
+        )
         self._use_cases = get_use_cases(self._container)
+        self._lean_load = os.environ.get(LEAN_LOAD_ENV) == '1'
+        self._memory_budget = self._read_memory_budget()
         self._theme = ThemeManager()
         self._init_variables()
         self._setup_window()
@@ -58,6 +75,9 @@ class ModernGUI(TkinterDnD.Tk):
     def _init_threads_and_queue(self):
         self.process_thread = None
         self.message_queue = queue.Queue()
+        self._task_token = None
+        self._use_cases["event_bus"].on(PROGRESS_EVENT, self._on_progress)
+        self._use_cases["event_bus"].on("extensions:load-degraded", self._on_load_degraded)
 
     def _init_ui(self):
         self._header = HeaderFrame(self, self._theme, on_toggle_appearance=self._toggle_appearance)
@@ -86,9 +106,14 @@ class ModernGUI(TkinterDnD.Tk):
             on_replace=self.start_replacing,
             on_reencode=self.start_reencoding,
             on_save=self.save_processed_data,
+            on_undo=self.undo_replacing,
+            on_redo=self.redo_replacing,
         )
         self._theme.add_listener(self._params_actions)
 
+        self._progress_panel = ProgressPanelFrame(self._scrollable, self._theme, on_cancel=self._cancel_task)
+        self._theme.add_listener(self._progress_panel)
+
         self._search_scope = SearchScopeFrame(self._scrollable, self._theme)
         self._theme.add_listener(self._search_scope)
 
@@ -101,14 +126,57 @@ class ModernGUI(TkinterDnD.Tk):
         self._theme.refresh_all()
 
     def process_messages(self):
+        self._use_cases["event_bus"].drain()
         while not self.message_queue.empty():
             try:
                 msg, level = self.message_queue.get_nowait()
-                self._log_panel.log_message(msg, level)
+                if callable(msg):
+                    msg()
+                else:
+                    self._log_panel.log_message(msg, level)
             except queue.Empty:
                 break
         self.after(100, self.process_messages)
 
+    def _post(self, callback):
+        self.message_queue.put((callback, None))
+
+    def _on_progress(self, payload: dict):
+        self._progress_panel.update_progress(payload)
+
+    def _on_load_degraded(self, payload: dict):
+        self._log_panel.log_message(
+            f"{payload['error']}，加载方式由 {payload['from']} 降级为 {payload['to']}", "warning"
+        )
+
+    @staticmethod
+    def _read_memory_budget():
+        try:
+            return parse_size(os.environ[MEMORY_BUDGET_ENV])
+        except (KeyError, ValueError):
+            return None
+
+    def _load_input(self, filepath: str) -> LoadExtensionsInput:
+        return LoadExtensionsInput(filepath=filepath, lean=self._lean_load, memory_budget=self._memory_budget)
+
+    def _begin_task(self, message: str) -> CancellationToken:
+        self._task_token = CancellationToken()
+        self._progress_panel.start(message)
+        return self._task_token
+
+    def _end_task(self, token: CancellationToken):
+        if self._task_token is not token:
+            return
+        self._task_token = None
+        self._progress_panel.finish()
+
+    def _cancel_task(self):
+        if self._task_token is None or self._task_token.cancelled:
+            return
+        self._task_token.cancel()
+        self._progress_panel.set_cancelling()
+        self._log_panel.log_message("正在取消当前任务...", "warning")
+
     def _on_file_drop(self, event):
         files = [f.strip("{}") for f in self.tk.splitlist(event.data)]
         if files:
@@ -127,27 +195,32 @@ class ModernGUI(TkinterDnD.Tk):
 
     def _auto_load_file(self):
         self._log_panel.log_message("正在加载文件...", "info")
-        self.process_thread = threading.Thread(
-            target=self._run_auto_load, args=(self.file_path,), daemon=True
+        self._params_actions.set_history_state(False, False)
+        token = self._begin_task("正在加载文件...")
+        task = self._use_cases["load"].execute_async(
+            self._load_input(self.file_path), token
         )
-        self.process_thread.start()
+        task.add_done_callback(self._on_auto_loaded)
 
-    def _run_auto_load(self, input_path: str):
+    def _on_auto_loaded(self, task):
         try:
-            load_result = self._use_cases["load"].execute(
-                LoadExtensionsInput(filepath=input_path)
-            )
+            load_result = task.result()
             if load_result.success:
                 repo = self._use_cases["extension_repo"]
                 kinds = repo.get_kinds()
-                self.after(0, lambda: self._search_scope.update_kinds(kinds))
+                self._post(lambda: self._search_scope.update_kinds(kinds))
                 self.message_queue.put(
                     (f"文件加载完成！共 {load_result.count} 条记录，{len(kinds)} 种类型", "success")
                 )
+            elif load_result.cancelled:
+                self.message_queue.put(("文件加载已取消", "warning"))
             else:
                 self.message_queue.put((f"文件加载失败: {load_result.error}", "error"))
         except Exception as e:
             self.message_queue.put((f"文件加载失败: {str(e)}", "error"))
+        finally:
+            self._post(self._refresh_history_buttons)
+            self._post(lambda: self._end_task(task.token))
 
     def _select_output_dir(self):
         directory = filedialog.askdirectory()
@@ -172,6 +245,8 @@ class ModernGUI(TkinterDnD.Tk):
             return False
         elif answer:
             self.save_processed_data()
+            self._log_panel.log_message("保存完成后请重新执行该操作", "info")
+            return False
         else:
             self.processed_data = None
             self.reencoded_data = None
@@ -186,10 +261,11 @@ class ModernGUI(TkinterDnD.Tk):
             return
         self._params_actions.disable_buttons()
         self._log_panel.log_message("开始解码文件...", "info")
-        self.process_thread = threading.Thread(
-            target=self._run_decoding, args=(self.file_path,), daemon=True
+        token = self._begin_task("开始解码文件...")
+        task = self._use_cases["load"].execute_async(
+            self._load_input(self.file_path), token
         )
-        self.process_thread.start()
+        task.add_done_callback(self._on_decoded)
 
     def start_replacing(self):
         if not self.file_path:
@@ -206,13 +282,49 @@ class ModernGUI(TkinterDnD.Tk):
         scope = self._search_scope.get_scope()
         self._params_actions.disable_buttons()
         self._log_panel.log_message("开始替换文件内容...", "info")
+        token = self._begin_task("开始替换文件内容...")
         self.process_thread = threading.Thread(
             target=self._run_replacing,
-            args=(self.file_path, search_str, replace_str, is_regex, scope),
+            args=(self.file_path, search_str, replace_str, is_regex, scope, token),
             daemon=True,
         )
         self.process_thread.start()
 
+    def undo_replacing(self):
+        self._run_history("undo", "撤销")
+
+    def redo_replacing(self):
+        self._run_history("redo", "重做")
+
+    def _run_history(self, action: str, label: str):
+        self._params_actions.disable_buttons()
+        token = self._begin_task(f"正在{label}替换...")
+        task = self._use_cases[action].execute_async(None, token)
+        task.add_done_callback(lambda done: self._on_history_done(done, label))
+
+    def _on_history_done(self, task, label: str):
+        try:
+            result = task.result()
+            if result.success:
+                self.processed_data = True
+                self.message_queue.put(
+                    (f"已{label}替换：{result.updated_count} 条记录，{result.change_count} 处变更", "success")
+                )
+            elif result.cancelled:
+                self.message_queue.put((f"{label}已取消", "warning"))
+            else:
+                self.message_queue.put((f"{label}失败: {result.error}", "error"))
+        except Exception as e:
+            self.message_queue.put((f"{label}失败: {str(e)}", "error"))
+        finally:
+            self._post(self._params_actions.enable_buttons)
+            self._post(self._refresh_history_buttons)
+            self._post(lambda: self._end_task(task.token))
+
+    def _refresh_history_buttons(self):
+        journal = self._use_cases["journal"]
+        self._params_actions.set_history_state(journal.can_undo(), journal.can_redo())
+
     def start_reencoding(self):
         if not self.file_path:
             self.show_error("请先选择解码副本文件")
@@ -221,73 +333,91 @@ class ModernGUI(TkinterDnD.Tk):
             return
         self._params_actions.disable_buttons(reencode_only=True)
         self._log_panel.log_message("开始重新编码文件...", "info")
-        self.process_thread = threading.Thread(
-            target=self._run_reencoding, args=(self.file_path,), daemon=True
+        token = self._begin_task("开始重新编码文件...")
+        task = self._use_cases["load"].execute_async(
+            self._load_input(self.file_path), token
         )
-        self.process_thread.start()
+        task.add_done_callback(self._on_reencoded)
 
     def save_processed_data(self):
         if not (self.processed_data or self.reencoded_data):
             self.show_error("没有可保存的数据，请先解码或编码文件")
             return
         output_dir = self._params_actions.get_output_dir() or os.path.dirname(self.file_path)
+        if self.reencoded_data:
+            output_name = f"reencoded_{os.path.basename(self.file_path)}"
+            base_path, _ = os.path.splitext(os.path.join(output_dir, output_name))
+            output_path = f"{base_path}.data"
+            success_message = f"编码数据保存成功！\n输出文件: {output_path}"
+        else:
+            output_name = f"processed_{os.path.basename(self.file_path)}"
+            output_path = os.path.join(output_dir, output_name)
+            success_message = f"保存成功！\n输出文件: {output_path}"
+        self._params_actions.disable_buttons()
+        self._log_panel.log_message("正在保存文件...", "info")
+        token = self._begin_task("正在保存文件...")
+        task = self._use_cases["export"].execute_async(
+            ExportExtensionsInput(filepath=output_path), token
+        )
+        task.add_done_callback(lambda done: self._on_saved(done, success_message))
+
+    def _on_saved(self, task, success_message: str):
+        saved = False
         try:
-            if self.reencoded_data:
-                output_name = f"reencoded_{os.path.basename(self.file_path)}"
-                base_path, _ = os.path.splitext(os.path.join(output_dir, output_name))
-                data_path = f"{base_path}.data"
-                export_result = self._use_cases["export"].execute(
-                    ExportExtensionsInput(filepath=data_path)
-                )
-                if export_result.success:
-                    self.message_queue.put(
-                        (f"编码数据保存成功！\n输出文件: {data_path}", "success")
-                    )
-                else:
-                    self.message_queue.put((f"保存失败: {export_result.error}", "error"))
+            export_result = task.result()
+            if export_result.success:
+                saved = True
+                self.message_queue.put((success_message, "success"))
+            elif export_result.cancelled:
+                self.message_queue.put(("保存已取消，原输出文件保持不变", "warning"))
             else:
-                output_name = f"processed_{os.path.basename(self.file_path)}"
-                output_path = os.path.join(output_dir, output_name)
-                export_result = self._use_cases["export"].execute(
-                    ExportExtensionsInput(filepath=output_path)
-                )
-                if export_result.success:
-                    self.message_queue.put(
-                        (f"保存成功！\n输出文件: {output_path}", "success")
-                    )
-                else:
-                    self.message_queue.put((f"保存失败: {export_result.error}", "error"))
-            self._params_actions.disable_save_button()
+                self.message_queue.put((f"保存失败: {export_result.error}", "error"))
         except Exception as e:
             self.message_queue.put((f"保存失败: {str(e)}", "error"))
+        finally:
+            self._post(lambda: self._finish_saving(task.token, saved))
+
+    def _finish_saving(self, token: CancellationToken, saved: bool):
+        self._params_actions.enable_buttons()
+        if saved:
+            self._params_actions.disable_save_button()
+        self._refresh_history_buttons()
+        self._end_task(token)
 
-    def _run_decoding(self, input_path: str):
+    def _on_decoded(self, task):
         try:
-            load_result = self._use_cases["load"].execute(
-                LoadExtensionsInput(filepath=input_path)
-            )
+            load_result = task.result()
             if load_result.success:
                 self.original_data = True
                 self.processed_data = True
                 repo = self._use_cases["extension_repo"]
                 kinds = repo.get_kinds()
-                self.after(0, lambda: self._search_scope.update_kinds(kinds))
+                self._post(lambda: self._search_scope.update_kinds(kinds))
                 self.message_queue.put(
                     (f"解码完成！共 {load_result.count} 条记录。请点击保存按钮保存结果", "success")
                 )
-                self._params_actions.enable_save_button()
+                self._post(self._params_actions.enable_save_button)
+            elif load_result.cancelled:
+                self.message_queue.put(("解码已取消", "warning"))
             else:
                 self.message_queue.put((f"解码失败: {load_result.error}", "error"))
         except Exception as e:
             self.message_queue.put((f"解码失败: {str(e)}", "error"))
         finally:
-            self._params_actions.enable_buttons()
+            self._post(self._params_actions.enable_buttons)
+            self._post(self._refresh_history_buttons)
+            self._post(lambda: self._end_task(task.token))
 
-    def _run_replacing(self, input_path: str, search: str, replace: str, is_regex: bool, scope: ReplaceScope):
+    def _run_replacing(
+        self, input_path: str, search: str, replace: str, is_regex: bool, scope: ReplaceScope, token: CancellationToken
+    ):
         try:
             load_result = self._use_cases["load"].execute(
-                LoadExtensionsInput(filepath=input_path)
+                self._load_input(input_path), token
             )
+            if load_result.cancelled:
+                self.message_queue.put(("替换已取消", "warning"))
+                return
             if not load_result.success:
                 self.message_queue.put((f"加载文件失败: {load_result.error}", "error"))
                 return
@@ -296,7 +426,8 @@ class ModernGUI(TkinterDnD.Tk):
                 BatchReplaceInput(
                     rules=[ReplaceRule(search=search, replace=replace, is_regex=is_regex)],
                     scope=scope,
-                )
+                ),
+                token,
             )
             if replace_result.success:
                 self.original_data = True
@@ -307,29 +438,37 @@ class ModernGUI(TkinterDnD.Tk):
                         "success",
                     )
                 )
-                self._params_actions.enable_save_button()
+                self._post(self._params_actions.enable_save_button)
+            elif replace_result.cancelled:
+                self.message_queue.put(("替换已取消，数据未改动", "warning"))
             else:
                 self.message_queue.put((f"替换失败: {replace_result.error}", "error"))
         except Exception as e:
             self.message_queue.put((f"替换失败: {str(e)}", "error"))
         finally:
-            self._params_actions.enable_buttons()
-    def _run_reencoding(self, input_path: str):
+            self._post(self._params_actions.enable_buttons)
+            self._post(self._refresh_history_buttons)
+            self._post(lambda: self._end_task(token))
+
+    def _on_reencoded(self, task):
         try:
-            load_result = self._use_cases["load"].execute(
-                LoadExtensionsInput(filepath=input_path)
-            )
+            load_result = task.result()
+            if load_result.cancelled:
+                self.message_queue.put(("编码已取消", "warning"))
+                return
             if not load_result.success:
                 self.message_queue.put((f"加载文件失败: {load_result.error}", "error"))
                 return
 
             self.reencoded_data = True
             self.message_queue.put(("编码完成！请点击保存按钮保存结果", "success"))
-            self._params_actions.enable_save_button()
+            self._post(self._params_actions.enable_save_button)
         except Exception as e:
             self.message_queue.put((f"编码失败: {str(e)}", "error"))
         finally:
-            self._params_actions.enable_buttons(reencode_only=True)
+            self._post(lambda: self._params_actions.enable_buttons(reencode_only=True))
+            self._post(self._refresh_history_buttons)
+            self._post(lambda: self._end_task(task.token))
 
     def show_error(self, message: str):
         messagebox.showerror("错误", message)
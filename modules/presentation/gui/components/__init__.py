@@ -4,6 +4,7 @@ from modules.presentation.gui.components.drop_zone import DropZoneFrame
 from modules.presentation.gui.components.params_actions import ParamsActionsFrame
 from modules.presentation.gui.components.search_scope import SearchScopeFrame
 from modules.presentation.gui.components.log_panel import LogPanelFrame
+from modules.presentation.gui.components.progress_panel import ProgressPanelFrame
 
 __all__ = [
     "HeaderFrame",
@@ -12,4 +13,5 @@ __all__ = [
     "ParamsActionsFrame",
     "SearchScopeFrame",
     "LogPanelFrame",
+    "ProgressPanelFrame",
 ]
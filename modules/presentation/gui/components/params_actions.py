@@ -8,7 +8,7 @@ from modules.presentation.gui.theme import ThemeManager
 
 
 class ParamsActionsFrame(ctk.CTkFrame):
-    def __init__(self, master, theme: ThemeManager, on_select_output_dir, on_decode, on_replace, on_reencode, on_save, **kwargs):
+    def __init__(self, master, theme: ThemeManager, on_select_output_dir, on_decode, on_replace, on_reencode, on_save, on_undo, on_redo, **kwargs):
         super().__init__(master, fg_color=theme.bg(), **kwargs)
         self.pack(fill=ctk.X, padx=20, pady=(12, 0))
 
@@ -16,7 +16,7 @@ class ParamsActionsFrame(ctk.CTkFrame):
         self.output_path = tk.StringVar()
 
         self._build_params_card(theme)
-        self._build_actions_card(theme, on_select_output_dir, on_decode, on_replace, on_reencode, on_save)
+        self._build_actions_card(theme, on_select_output_dir, on_decode, on_replace, on_reencode, on_save, on_undo, on_redo)
 
     def _build_params_card(self, theme: ThemeManager):
         params_card = ctk.CTkFrame(self, fg_color=theme.card(), corner_radius=12)
@@ -85,7 +85,7 @@ class ParamsActionsFrame(ctk.CTkFrame):
         )
         self.regex_checkbox.pack(side=tk.LEFT)
 
-    def _build_actions_card(self, theme: ThemeManager, on_select_output_dir, on_decode, on_replace, on_reencode, on_save):
+    def _build_actions_card(self, theme: ThemeManager, on_select_output_dir, on_decode, on_replace, on_reencode, on_save, on_undo, on_redo):
         actions_card = ctk.CTkFrame(self, fg_color=theme.card(), corner_radius=12, width=320)
         actions_card._card_type = True
         actions_card.pack(side=ctk.RIGHT, fill=tk.Y, padx=(8, 0))
@@ -129,7 +129,7 @@ class ParamsActionsFrame(ctk.CTkFrame):
         self.process_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(4, 0))
 
         btn_row2 = ctk.CTkFrame(actions_card, fg_color="transparent")
-        btn_row2.pack(fill=tk.X, padx=16, pady=(0, 16))
+        btn_row2.pack(fill=tk.X, padx=16, pady=(0, 6))
 
         self.replace_btn = ctk.CTkButton(
             btn_row2,
@@ -168,6 +168,39 @@ class ParamsActionsFrame(ctk.CTkFrame):
         )
         self.save_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(4, 0))
 
+        btn_row3 = ctk.CTkFrame(actions_card, fg_color="transparent")
+        btn_row3.pack(fill=tk.X, padx=16, pady=(0, 16))
+
+        self.undo_btn = ctk.CTkButton(
+            btn_row3,
+            text="↶ 撤销替换",
+            height=38,
+            font=ctk.CTkFont(family="Microsoft YaHei", size=13),
+            fg_color=("#e9ecef", "#2a2a4a"),
+            text_color=theme.text(),
+            hover_color=("#dee2e6", "#3a3a5a"),
+            corner_radius=8,
+            state=tk.DISABLED,
+            command=on_undo,
+        )
+        self.undo_btn._is_outline = True
+        self.undo_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 4))
+
+        self.redo_btn = ctk.CTkButton(
+            btn_row3,
+            text="↷ 重做替换",
+            height=38,
+            font=ctk.CTkFont(family="Microsoft YaHei", size=13),
+            fg_color=("#e9ecef", "#2a2a4a"),
+            text_color=theme.text(),
+            hover_color=("#dee2e6", "#3a3a5a"),
+            corner_radius=8,
+            state=tk.DISABLED,
+            command=on_redo,
+        )
+        self.redo_btn._is_outline = True
+        self.redo_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(4, 0))
+
     def get_search_text(self) -> str:
         return self.search_entry.get()
 
@@ -187,6 +220,8 @@ class ParamsActionsFrame(ctk.CTkFrame):
         self.process_btn.configure(state=tk.DISABLED)
         self.replace_btn.configure(state=tk.DISABLED)
         self.reencode_btn.configure(state=tk.DISABLED)
+        self.undo_btn.configure(state=tk.DISABLED)
+        self.redo_btn.configure(state=tk.DISABLED)
         if not reencode_only:
             self.save_btn.configure(state=tk.DISABLED)
 
@@ -203,5 +238,9 @@ class ParamsActionsFrame(ctk.CTkFrame):
     def disable_save_button(self):
         self.save_btn.configure(state=tk.DISABLED)
 
+    def set_history_state(self, can_undo: bool, can_redo: bool):
+        self.undo_btn.configure(state=tk.NORMAL if can_undo else tk.DISABLED)
+        self.redo_btn.configure(state=tk.NORMAL if can_redo else tk.DISABLED)
+
     def refresh_theme(self, theme: ThemeManager):
         pass
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import tkinter as tk
+
+import customtkinter as ctk
+
+from modules.presentation.gui.theme import ThemeManager
+
+STAGE_LABELS = {
+    "decode": "解码",
+    "replace": "替换",
+    "encode": "编码",
+}
+
+
+class ProgressPanelFrame(ctk.CTkFrame):
+    def __init__(self, master, theme: ThemeManager, on_cancel, **kwargs):
+        super().__init__(master, fg_color=theme.card(), corner_radius=12, **kwargs)
+        self._card_type = True
+        self.pack(fill=ctk.X, padx=20, pady=(12, 0))
+
+        self._theme = theme
+        self._indeterminate = False
+
+        inner = ctk.CTkFrame(self, fg_color="transparent")
+        inner.pack(fill=ctk.X, padx=20, pady=12)
+
+        self._status_label = ctk.CTkLabel(
+            inner,
+            text="空闲",
+            font=ctk.CTkFont(family="Microsoft YaHei", size=12),
+            text_color=theme.sub_text(),
+            width=220,
+            anchor=tk.W,
+        )
+        self._status_label._is_sub_text = True
+        self._status_label.pack(side=tk.LEFT, padx=(0, 12))
+
+        self._progress_bar = ctk.CTkProgressBar(inner, height=12, corner_radius=6)
+        self._progress_bar.set(0)
+        self._progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 12))
+
+        self.cancel_btn = ctk.CTkButton(
+            inner,
+            text="✖ 取消",
+            width=90,
+            height=32,
+            font=ctk.CTkFont(family="Microsoft YaHei", size=13),
+            fg_color="#dc3545",
+            hover_color="#bb2d3b",
+            corner_radius=8,
+            state=tk.DISABLED,
+            command=on_cancel,
+        )
+        self.cancel_btn.pack(side=tk.RIGHT)
+
+    def start(self, message: str):
+        self._stop_indeterminate()
+        self._progress_bar.set(0)
+        self._status_label.configure(text=message)
+        self.cancel_btn.configure(state=tk.NORMAL)
+
+    def update_progress(self, payload: dict):
+        stage = STAGE_LABELS.get(payload["stage"], payload["stage"])
+        done = payload["items_done"]
+        total = payload["items_total"]
+        size = f"{payload['bytes'] / (1 << 20):.1f} MiB" if payload["bytes"] else ""
+        if total:
+            self._stop_indeterminate()
+            self._progress_bar.set(min(done / total, 1.0))
+            text = f"{stage} {done}/{total} 条"
+        else:
+            if not self._indeterminate:
+                self._indeterminate = True
+                self._progress_bar.configure(mode="indeterminate")
+                self._progress_bar.start()
+            text = f"{stage} {done} 条"
+        self._status_label.configure(text=f"{text}  {size}".rstrip())
+
+    def set_cancelling(self):
+        self.cancel_btn.configure(state=tk.DISABLED)
+        self._status_label.configure(text="正在取消...")
+
+    def finish(self, message: str = "空闲"):
+        self._stop_indeterminate()
+        self._progress_bar.set(0)
+        self._status_label.configure(text=message)
+        self.cancel_btn.configure(state=tk.DISABLED)
+
+    def _stop_indeterminate(self):
+        if self._indeterminate:
+            self._indeterminate = False
+            self._progress_bar.stop()
+            self._progress_bar.configure(mode="determinate")
+
+    def refresh_theme(self, theme: ThemeManager):
+        self.configure(fg_color=theme.card())
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+
+from modules.core.logging.logger import setup_logging
+from modules.core.memory.memory_guard import parse_size
+from modules.presentation.service.job_service import JobError, JobService
+from modules.presentation.service.http_server import create_server
+
+
+def run_server():
+    setup_logging()
+
+    parser = argparse.ArgumentParser(
+        description='Base64编码JSON文件处理器 - 本地任务服务',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址，仅建议绑定本机地址')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口，0 表示随机端口')
+    parser.add_argument('--load', metavar='[NAME=]PATH', action='append', default=[], help='启动时预加载的数据文件，可重复指定；省略 NAME 时以文件名作为数据集名称')
+    parser.add_argument('--lean', action='store_true', help='预加载数据集时使用精简加载')
+    parser.add_argument('--memory-budget', metavar='SIZE', help='每个数据集加载时允许使用的内存上限，例如 512M、2G')
+    parser.add_argument('--token-file', metavar='FILE', help='将本次启动生成的访问令牌写入该文件（仅当前用户可读），便于脚本读取')
+    parser.add_argument('--trigram-index', action=argparse.BooleanOptionalAction, default=True, help='为常驻数据集建立三元组索引，加速反复执行的替换预览')
+    parser.add_argument('--replace-cache', action='store_true', help='缓存替换结果，调整规则后重新预览或替换时只重算受影响的扩展与规则')
+
+    args = parser.parse_args()
+    memory_budget = None
+    if args.memory_budget:
+        try:
+            memory_budget = parse_size(args.memory_budget)
+        except ValueError as e:
+            parser.error(f'无效的内存预算: {e}')
+
+    service = JobService(trigram_index=args.trigram_index, memory_budget=memory_budget, replace_cache=args.replace_cache)
+    for spec in args.load:
+        name, separator, path = spec.partition('=')
+        if not separator:
+            name, path = None, spec
+        try:
+            result = service.load({'name': name, 'path': path, 'lean': args.lean})
+        except JobError as e:
+            result = {'success': False, 'error': str(e)}
+        if not result['success']:
+            logging.error(f"预加载失败: {path}: {result['error']}")
+            return
+        dataset = result['dataset']
+        logging.info(f"已加载数据集 {dataset['name']}: {dataset['count']} 条记录, 耗时 {result['duration_ms']:.0f} ms")
+
+    server = create_server(service, args.host, args.port)
+    host, port = server.server_address[:2]
+    if args.token_file:
+        fd = os.open(args.token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(server.token)
+    logging.info(f"任务服务已启动: http://{host}:{port}")
+    logging.info(f"访问令牌: {server.token}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("正在停止任务服务...")
+    finally:
+        server.server_close()
+        service.close()
@@ -0,0 +1,2 @@
+from modules.presentation.service.job_service import JobService, JobError, Dataset
+from modules.presentation.service.http_server import JobHTTPServer, JobRequestHandler, create_server
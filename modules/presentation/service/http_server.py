@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hmac
+import json
+import logging
+import secrets
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+from modules.presentation.service.job_service import JobError, JobService
+
+MAX_BODY_BYTES = 1 << 20
+LOOPBACK_HOSTS = ('localhost', '127.0.0.1', '[::1]')
+
+
+class JobHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: JobService, token: str):
+        super().__init__(address, JobRequestHandler)
+        self.service = service
+        self.token = token
+        port = self.server_address[1]
+        bound = address[0] if ':' not in address[0] else f'[{address[0]}]'
+        self.allowed_hosts = {f'{host}:{port}' for host in (*LOOPBACK_HOSTS, bound)}
+        self.allowed_origins = {f'http://{host}' for host in self.allowed_hosts}
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: JobHTTPServer
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def log_message(self, format: str, *args) -> None:
+        logging.info(f"{self.address_string()} {format % args}")
+
+    def _dispatch(self, method: str) -> None:
+        try:
+            self._authorize()
+            parts = [unquote(part) for part in urlsplit(self.path).path.strip('/').split('/') if part]
+            payload = self._read_json() if method == 'POST' else {}
+            self._route(method, parts, payload)
+        except JobError as e:
+            self._send_json({'success': False, 'error': str(e)}, e.status)
+        except Exception as e:
+            logging.error(f"任务处理失败: {e}", exc_info=True)
+            self._send_json({'success': False, 'error': str(e)}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def _route(self, method: str, parts: list[str], payload: dict) -> None:
+        service = self.server.service
+        if parts == ['datasets'] and method == 'GET':
+            return self._send_json({'datasets': service.datasets()})
+        if parts == ['datasets'] and method == 'POST':
+            return self._send_result(service.load(payload))
+        if len(parts) == 2 and parts[0] == 'datasets' and method == 'DELETE':
+            return self._send_json(service.unload(parts[1]))
+        if len(parts) == 3 and parts[0] == 'datasets' and parts[2] == 'metrics' and method == 'GET':
+            return self._send_text(service.metrics(parts[1]))
+        if len(parts) == 3 and parts[0] == 'datasets' and method == 'POST':
+            return self._send_result(service.run(parts[1], parts[2], payload))
+        raise JobError(f'未知的请求: {method} {self.path}', HTTPStatus.NOT_FOUND)
+
+    def _authorize(self) -> None:
+        if (self.headers.get('Host') or '').lower() not in self.server.allowed_hosts:
+            raise self._reject('不允许的 Host 请求头', HTTPStatus.FORBIDDEN)
+        origin = self.headers.get('Origin')
+        if origin is not None and origin.lower() not in self.server.allowed_origins:
+            raise self._reject('不允许跨源请求', HTTPStatus.FORBIDDEN)
+        scheme, _, token = (self.headers.get('Authorization') or '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(token.strip().encode(), self.server.token.encode()):
+            raise self._reject('缺少或错误的访问令牌', HTTPStatus.UNAUTHORIZED)
+
+    def _read_json(self) -> dict:
+        if self.headers.get_content_type() != 'application/json':
+            raise self._reject('请求体必须为 application/json', HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise self._reject('请求体过大', HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = self.rfile.read(length) if length else b''
+        if not body.strip():
+            return {}
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise JobError(f'无效的 JSON 请求体: {e}')
+        if not isinstance(payload, dict):
+            raise JobError('请求体必须为 JSON 对象')
+        return payload
+
+    def _reject(self, message: str, status: int) -> JobError:
+        self.close_connection = True
+        return JobError(message, status)
+
+    def _send_result(self, result: dict) -> None:
+        status = HTTPStatus.OK if result.get('success') else HTTPStatus.UNPROCESSABLE_ENTITY
+        self._send_json(result, status)
+
+    def _send_json(self, data: dict, status: int = HTTPStatus.OK) -> None:
+        self._send(json.dumps(data, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8', status)
+
+    def _send_text(self, text: str) -> None:
+        self._send(text.encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8', HTTPStatus.OK)
+
+    def _send(self, body: bytes, content_type: str, status: int) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_server(
+    service: JobService,
+    host: str = '127.0.0.1',
+    port: int = 8765,
+    token: Optional[str] = None
+) -> JobHTTPServer:
+    return JobHTTPServer((host, port), service, token or secrets.token_urlsafe(32))
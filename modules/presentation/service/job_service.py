@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from di.container import MEMORY_BACKEND, SQLITE_BACKEND, configure_container, get_use_cases
+from modules.application.shared.results import BaseResult
+from modules.application.use_cases.batch_replace_use_case import BatchReplaceInput
+from modules.application.use_cases.export_extensions_use_case import ExportExtensionsInput
+from modules.application.use_cases.load_extensions_use_case import LoadExtensionsInput
+from modules.domain.repositories.i_extension_repository import IExtensionRepository
+from modules.domain.value_objects.label_selector import LabelSelector
+from modules.domain.value_objects.search_query import SearchQuery
+from modules.domain.value_objects.time_range import TimeRange
+from modules.infrastructure.types.replace_types import ReplaceRule, ReplaceScope
+
+_RULE_FIELDS = {f.name for f in dataclasses.fields(ReplaceRule)}
+_SCOPE_FLAGS = {f.name for f in dataclasses.fields(ReplaceScope) if f.name.startswith('search_in_')}
+
+
+class JobError(Exception):
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Dataset:
+    name: str
+    path: str
+    backend: str
+    use_cases: dict
+    strategy: Optional[str] = None
+    loaded_at: float = field(default_factory=time.time)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def describe(self) -> dict:
+        return {
+            'name': self.name,
+            'path': self.path,
+            'backend': self.backend,
+            'count': self.use_cases['extension_repo'].count(),
+            'strategy': self.strategy,
+            'loaded_at': self.loaded_at,
+            'can_undo': self.use_cases['journal'].can_undo(),
+            'can_redo': self.use_cases['journal'].can_redo(),
+        }
+
+
+class JobService:
+    JOBS = ('search', 'preview', 'replace', 'export', 'undo', 'redo')
+    DEFAULT_PAGE_SIZE = 50
+
+    def __init__(
+        self,
+        trigram_index: bool = True,
+        columnar_index: bool = False,
+        memory_budget: Optional[int] = None,
+        replace_cache: bool = False
+    ):
+        self._trigram_index = trigram_index
+        self._columnar_index = columnar_index
+        self._replace_cache = replace_cache
+        self._memory_budget = memory_budget
+        self._datasets: dict[str, Dataset] = {}
+        self._lock = threading.Lock()
+
+    def datasets(self) -> list[dict]:
+        with self._lock:
+            datasets = list(self._datasets.values())
+        return [dataset.describe() for dataset in datasets]
+
+    def load(self, payload: dict) -> dict:
+        path = _require(payload, 'path', str)
+        if not os.path.isfile(path):
+            raise JobError(f'文件不存在: {path}', 404)
+        name = payload.get('name') or os.path.splitext(os.path.basename(path))[0]
+        if not isinstance(name, str) or '/' in name:
+            raise JobError(f'无效的数据集名称: {name}')
+        backend = payload.get('backend', MEMORY_BACKEND)
+        if backend not in (MEMORY_BACKEND, SQLITE_BACKEND):
+            raise JobError(f'未知的存储后端: {backend}')
+
+        memory_budget = payload.get('memory_budget', self._memory_budget)
+        if memory_budget is not None and (
+            not isinstance(memory_budget, int) or isinstance(memory_budget, bool) or memory_budget <= 0
+        ):
+            raise JobError(f'无效的内存预算: {memory_budget}')
+
+        use_cases = get_use_cases(configure_container(
+            trigram_index=self._trigram_index,
+            columnar_index=self._columnar_index,
+            backend=backend,
+            sqlite_path=payload.get('db'),
+            replace_cache=self._replace_cache
+        ))
+        started = time.perf_counter()
+        result = use_cases['load'].execute(LoadExtensionsInput(
+            filepath=path,
+            lean=bool(payload.get('lean', False)),
+            memory_budget=memory_budget
+        ))
+        duration = time.perf_counter() - started
+        if not result.success:
+            use_cases['extension_repo'].close()
+            return _payload(result, duration)
+
+        dataset = Dataset(name, path, backend, use_cases, result.strategy)
+        with self._lock:
+            previous = self._datasets.get(name)
+            self._datasets[name] = dataset
+        if previous is not None:
+            with previous.lock:
+                previous.use_cases['extension_repo'].close()
+        return {**_payload(result, duration), 'dataset': dataset.describe()}
+
+    def unload(self, name: str) -> dict:
+        with self._lock:
+            dataset = self._datasets.pop(name, None)
+        if dataset is None:
+            raise JobError(f'数据集不存在: {name}', 404)
+        with dataset.lock:
+            dataset.use_cases['extension_repo'].close()
+        return {'success': True, 'name': name}
+
+    def run(self, name: str, job: str, payload: dict) -> dict:
+        if job not in self.JOBS:
+            raise JobError(f'未知的任务类型: {job}', 404)
+        dataset = self._get(name)
+        execute = self._prepare(job, dataset, payload)
+        with dataset.lock:
+            started = time.perf_counter()
+            result = execute()
+            duration = time.perf_counter() - started
+        if isinstance(result, dict):
+            return {**result, 'duration_ms': round(duration * 1000, 3)}
+        return _payload(result, duration)
+
+    def metrics(self, name: str) -> str:
+        return self._get(name).use_cases['metrics'].snapshot().to_prometheus()
+
+    def close(self) -> None:
+        with self._lock:
+            datasets = list(self._datasets.values())
+            self._datasets.clear()
+        for dataset in datasets:
+            with dataset.lock:
+                dataset.use_cases['extension_repo'].close()
+
+    def _get(self, name: str) -> Dataset:
+        with self._lock:
+            dataset = self._datasets.get(name)
+        if dataset is None:
+            raise JobError(f'数据集不存在: {name}', 404)
+        return dataset
+
+    def _prepare(self, job: str, dataset: Dataset, payload: dict) -> Callable[[], BaseResult | dict]:
+        use_cases = dataset.use_cases
+        if job == 'search':
+            query, cursor, limit = _parse_search(payload)
+            return lambda: _search_page(use_cases['extension_repo'], query, cursor, limit)
+        if job in ('preview', 'replace'):
+            replace_input = BatchReplaceInput(
+                rules=_parse_rules(payload),
+                scope=_parse_scope(payload),
+                report_path=payload.get('report'),
+                dry_run=job == 'preview'
+            )
+            return lambda: use_cases['batch_replace'].execute(replace_input)
+        if job == 'export':
+            export_input = ExportExtensionsInput(filepath=_require(payload, 'path', str))
+            return lambda: use_cases['export'].execute(export_input)
+        return lambda: use_cases[job].execute(None)
+
+
+def _require(payload: dict, key: str, kind: type) -> Any:
+    value = payload.get(key)
+    if not isinstance(value, kind) or not value:
+        raise JobError(f'缺少参数: {key}')
+    return value
+
+
+def _parse_rules(payload: dict) -> list[ReplaceRule]:
+    rules = _require(payload, 'rules', list)
+    parsed = []
+    for rule in rules:
+        if not isinstance(rule, dict) or 'search' not in rule or not set(rule) <= _RULE_FIELDS:
+            raise JobError(f'无效的替换规则: {rule}')
+        parsed.append(ReplaceRule(
+            search=str(rule['search']),
+            replace=str(rule.get('replace', '')),
+            is_regex=bool(rule.get('is_regex', False))
+        ))
+    return parsed
+
+
+def _parse_scope(payload: dict) -> ReplaceScope:
+    flags = payload.get('scope') or {}
+    if not isinstance(flags, dict) or not set(flags) <= _SCOPE_FLAGS:
+        raise JobError(f'无效的替换范围: {flags}')
+    kinds = payload.get('kinds') or []
+    if not isinstance(kinds, list):
+        raise JobError(f'无效的类型列表: {kinds}')
+    try:
+        selector = LabelSelector.parse(payload['selector']) if payload.get('selector') else None
+    except ValueError as e:
+        raise JobError(f'无效的标签选择器: {e}')
+    try:
+        created = TimeRange.parse(payload['created']) if payload.get('created') else None
+    except ValueError as e:
+        raise JobError(f'无效的时间范围: {e}')
+    return ReplaceScope(
+        **{key: bool(value) for key, value in flags.items()},
+        selected_kinds=[str(kind) for kind in kinds],
+        label_selector=selector,
+        created=created
+    )
+
+
+def _parse_search(payload: dict) -> tuple[SearchQuery, Optional[str], int]:
+    text = payload.get('query') or ''
+    if not isinstance(text, str):
+        raise JobError(f'无效的搜索表达式: {text}')
+    try:
+        query = SearchQuery.parse(text)
+    except ValueError as e:
+        raise JobError(f'无效的搜索表达式: {e}')
+    scope = _parse_scope({key: payload[key] for key in ('selector', 'created') if key in payload})
+    query = query.with_label_selector(scope.label_selector).with_created(scope.created)
+    cursor = payload.get('cursor')
+    if cursor is not None and not isinstance(cursor, str):
+        raise JobError(f'无效的游标: {cursor}')
+    limit = payload.get('limit', JobService.DEFAULT_PAGE_SIZE)
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit <= 0:
+        raise JobError(f'无效的分页大小: {limit}')
+    return query, cursor, limit
+
+
+def _search_page(repo: IExtensionRepository, query: SearchQuery, cursor: Optional[str], limit: int) -> dict:
+    page = repo.find_page_after(query, cursor, limit)
+    return {
+        'success': True,
+        'total': page.total,
+        'next_cursor': page.next_cursor,
+        'items': [{'name': ext.name, 'kind': ext.get_kind(), 'version': ext.version} for ext in page.items],
+    }
+
+
+def _payload(result: BaseResult, duration: float) -> dict:
+    data = {key: value for key, value in dataclasses.asdict(result).items() if key != 'metrics'}
+    data['duration_ms'] = round(duration * 1000, 3)
+    return data
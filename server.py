@@ -0,0 +1,4 @@
+from modules.presentation.server_app import run_server
+
+if __name__ == "__main__":
+    run_server()